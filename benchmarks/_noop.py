@@ -0,0 +1,15 @@
+"""
+Target module of the call overhead benchmark. Noop is tracked, Plain is not.
+"""
+
+
+class Noop:
+
+    def noop(self):
+        pass
+
+
+class Plain:
+
+    def noop(self):
+        pass
@@ -0,0 +1,41 @@
+"""
+===========================
+Sync of artifacts to a run
+===========================
+Writes call records into one artifact folder of a run in a local file store, like an injection logger does on every
+call. The time per written record is reported for growing numbers of records, immediately uploaded and deferred until
+the end of the run, and written straight into the local artifact folder of the run.
+"""
+import os
+import tempfile
+import time
+
+
+def measure(records, sync, direct=False):
+    from pypads.app.base import PyPads
+    from pypads.utils.logging_util import try_write_artifact, WriteFormats
+    with tempfile.TemporaryDirectory() as folder:
+        tracker = PyPads(uri=os.path.join(folder, "mlruns"), folder=folder,
+                         config={"include_default_mappings": False, "artifact_sync": sync,
+                                 "direct_artifact_writes": direct}, autostart=True)
+        start = time.perf_counter()
+        for i in range(records):
+            try_write_artifact(os.path.join("InjectionLoggers", "Bench", "Calls", str(i)), {"call": i},
+                               WriteFormats.json)
+        tracker.api.end_run()
+        total = time.perf_counter() - start
+        print("{:>9}: {:6} records, {:8.2f} ms per record".format("direct" if direct else sync, records,
+                                                                   total / records * 1000))
+        tracker.deactivate_tracking(run_atexits=False, reload_modules=False)
+
+
+def main():
+    for sync in ["immediate", "deferred"]:
+        for records in [100, 200, 400]:
+            measure(records, sync)
+    for records in [100, 200, 400]:
+        measure(records, "immediate", direct=True)
+
+
+if __name__ == "__main__":
+    main()
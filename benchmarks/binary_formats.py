@@ -0,0 +1,52 @@
+"""
+=============================
+Binary formats of artifacts
+=============================
+Writes a numpy array and a DataFrame as artifacts of a run in a local file store and reads them back. The write and
+read times and the file size are reported for the text format used for inputs by the default hooks, the pickle format
+and the binary formats chosen for arrays and DataFrames.
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def measure(tracker, name, value, write_format, extension):
+    from pypads.utils.logging_util import try_write_artifact
+    start = time.perf_counter()
+    try_write_artifact(name, value, write_format)
+    written = time.perf_counter() - start
+    path = os.path.join(tracker.api.active_run().info.artifact_uri.replace("file://", ""), name + "." + extension)
+    start = time.perf_counter()
+    tracker.api.artifact(name + "." + extension)
+    read = time.perf_counter() - start
+    print("{:>24}: write {:8.2f} ms, read {:8.2f} ms, {:10.2f} MB".format(
+        name + "." + extension, written * 1000, read * 1000, os.path.getsize(path) / 2 ** 20))
+
+
+def main():
+    from pypads.app.base import PyPads
+    from pypads.importext.package_metadata import package_metadata
+    from pypads.utils.logging_util import WriteFormats
+    array = np.random.rand(2000, 1000)
+    frame = pd.DataFrame({"a": np.arange(1000000), "b": np.random.rand(1000000), "c": np.random.rand(1000000)})
+    with tempfile.TemporaryDirectory() as folder:
+        tracker = PyPads(uri=os.path.join(folder, "mlruns"), folder=folder,
+                         config={"include_default_mappings": False}, autostart=True)
+        measure(tracker, "array", array, WriteFormats.text, "txt")
+        measure(tracker, "array", array, WriteFormats.pickle, "pickle")
+        measure(tracker, "array", array, WriteFormats.npy, "npy")
+        measure(tracker, "frame", frame, WriteFormats.text, "txt")
+        measure(tracker, "frame", frame, WriteFormats.pickle, "pickle")
+        # Without pyarrow the columnar format falls back to out-of-band pickling
+        measure(tracker, "frame_columnar", frame, WriteFormats.columnar,
+                "feather" if package_metadata.is_available("pyarrow") else "pickle")
+        tracker.api.end_run()
+        tracker.deactivate_tracking(run_atexits=False, reload_modules=False)
+
+
+if __name__ == "__main__":
+    main()
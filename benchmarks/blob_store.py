@@ -0,0 +1,48 @@
+"""
+==============================
+Deduplication of logged data
+==============================
+Logs the same training data on every fit of a simulated grid search, like the input logger does, with and without
+the blob store. The time per logged input and the bytes written to the artifacts of the run and the blob store are
+reported.
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+
+
+def folder_size(folder):
+    return sum(os.path.getsize(os.path.join(path, name)) for path, _, names in os.walk(folder) for name in names)
+
+
+def measure(fits, blobs):
+    from pypads.app.base import PyPads
+    from pypads.app.injections.base_logger import TrackedObject
+    from pypads.model.models import ArtifactMetaModel
+    from pypads.utils.logging_util import WriteFormats
+    data = np.random.rand(10000, 50)
+    with tempfile.TemporaryDirectory() as folder:
+        tracker = PyPads(uri=os.path.join(folder, "mlruns"), folder=folder,
+                         config={"include_default_mappings": False, "blob_store": blobs}, autostart=True)
+        start = time.perf_counter()
+        for i in range(fits):
+            TrackedObject._store_data_artifact(data, ArtifactMetaModel(
+                path=os.path.join("Inputs", str(i), "X"), description="Training data", format=WriteFormats.npy))
+        total = time.perf_counter() - start
+        tracker.api.end_run()
+        print("{:>10}: {:4} fits, {:8.2f} ms per input, {:8.2f} MB written".format(
+            "blob store" if blobs else "run", fits, total / fits * 1000,
+            (folder_size(os.path.join(folder, "mlruns")) + folder_size(os.path.join(folder, "blob_store"))) / 2 ** 20))
+        tracker.deactivate_tracking(run_atexits=False, reload_modules=False)
+
+
+def main():
+    for blobs in [False, True]:
+        for fits in [10, 50]:
+            measure(fits, blobs)
+
+
+if __name__ == "__main__":
+    main()
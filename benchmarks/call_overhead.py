@@ -0,0 +1,72 @@
+"""
+===============================
+Per call overhead of a tracking
+===============================
+Measures a call of a tracked no-op method. The method is hooked with a single pass-through logger which only calls the
+next callback, so the measured time is the dispatching done by the function wrapper itself. The call is also measured
+while the tracking is paused and while no run is active. Allocations are the memory blocks still held after the calls.
+"""
+import os
+import tempfile
+import timeit
+import tracemalloc
+
+from pypads.importext.mappings import SerializedMapping
+from pypads.importext.versioning import LibSelector
+
+noop_mapping = """
+metadata:
+  author: "PyPads"
+  version: "0.0.1"
+  library:
+    name: "benchmarks"
+    version: "0.0.1"
+
+mappings:
+    :benchmarks._noop.Noop.noop:
+            hooks: "pypads_bench"
+"""
+
+
+class PassThrough:
+    """ Logger only calling the next callback. """
+    order = 0
+    uid = None
+    supported_libraries = {LibSelector(name=".*", constraint="*")}
+
+    def __call__(self, ctx, *args, _pypads_env, **kwargs):
+        return _pypads_env.callback(*args, **kwargs)
+
+
+def main(number=20000, repeat=5):
+    from pypads.app.base import PyPads
+    with tempfile.TemporaryDirectory() as folder:
+        tracker = PyPads(uri=os.path.join(folder, "mlruns"), folder=folder, mappings=[SerializedMapping("bench", noop_mapping)],
+                         hooks={"bench": {"on": ["pypads_bench"]}}, events={"bench": PassThrough()},
+                         config={"include_default_mappings": False, "recursion_identity": False,
+                                 "recursion_depth": -1}, autostart=True)
+        from benchmarks._noop import Noop, Plain
+        assert hasattr(Noop, "_pypads_original_noop")
+        tracked, plain = Noop(), Plain()
+
+        def measure(name, fn):
+            best = min(timeit.repeat(fn, number=number, repeat=repeat))
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            for _ in range(number):
+                fn()
+            blocks = sum(stat.count_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+            tracemalloc.stop()
+            print("{:>8}: {:8.2f} us per call, {:6.2f} blocks per call".format(name, best / number * 1e6,
+                                                                               max(blocks, 0) / number))
+
+        measure("plain", plain.noop)
+        measure("tracked", tracked.noop)
+        with tracker.api.paused():
+            measure("paused", tracked.noop)
+        tracker.api.end_run()
+        measure("no run", tracked.noop)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+===============================
+Memory of long running tracking
+===============================
+Calls a tracked no-op method many times and reports the time per call and the memory held by the tracking at
+checkpoints. The memory should stay flat over the run. Pass the number of calls as argument.
+"""
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.call_overhead import noop_mapping, PassThrough
+from pypads.importext.mappings import SerializedMapping
+
+
+def main(calls=1000000, checkpoints=10):
+    from pypads.app.base import PyPads
+    with tempfile.TemporaryDirectory() as folder:
+        tracker = PyPads(uri=os.path.join(folder, "mlruns"), folder=folder,
+                         mappings=[SerializedMapping("bench", noop_mapping)],
+                         hooks={"bench": {"on": ["pypads_bench"]}}, events={"bench": PassThrough()},
+                         config={"include_default_mappings": False, "recursion_identity": False,
+                                 "recursion_depth": -1}, autostart=True)
+        from benchmarks._noop import Noop
+        instances = [Noop() for _ in range(10)]
+
+        tracemalloc.start()
+        gc.collect()
+        baseline = tracemalloc.get_traced_memory()[0]
+        step = calls // checkpoints
+        start = time.perf_counter()
+        for i in range(1, calls + 1):
+            instances[i % len(instances)].noop()
+            if i % step == 0:
+                gc.collect()
+                held = tracemalloc.get_traced_memory()[0] - baseline
+                print("{:>9} calls: {:8.2f} us per call, {:10.1f} KiB held".format(
+                    i, (time.perf_counter() - start) / i * 1e6, held / 1024))
+        tracemalloc.stop()
+        tracker.api.end_run()
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
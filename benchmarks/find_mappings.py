@@ -0,0 +1,86 @@
+"""
+=====================================
+Mapping lookup on the sklearn mapping
+=====================================
+Compares the compiled lookup of MappingCollection.find_mappings with the former recursive trie walk. The queried paths
+are derived from the shipped sklearn mapping itself and the members of typical estimator classes.
+"""
+import os
+import timeit
+
+from pypads.importext.mappings import MappingFile, default_mapping_file_paths
+from pypads.importext.package_path import RegexMatcher, PackagePath, StaticMatcher
+
+MEMBERS = ["__init__", "fit", "predict", "score", "transform", "fit_transform", "fit_predict", "get_params",
+           "set_params", "decision_function", "predict_proba", "_validate_data", "n_features_in_", "foo"]
+
+
+def recursive_find_mappings(segments, current_path):
+    """ Lookup as done before compiling the mapping trie. """
+    mappings = []
+    if len(segments) > 0:
+        if segments[0] in current_path:
+            mappings = mappings + recursive_find_mappings(segments[1:], current_path[segments[0]])
+        for s, v in current_path.items():
+            if isinstance(s, RegexMatcher) and s.matches(segments[0]):
+                mappings = mappings + recursive_find_mappings(segments[1:], v)
+    else:
+        mappings = mappings + all_mappings(current_path)
+    return mappings
+
+
+def all_mappings(current_path):
+    mappings = []
+    for k, v in current_path.items():
+        if isinstance(k, str) and ":mapping" == k:
+            mappings = mappings + v
+        elif isinstance(v, dict):
+            mappings = mappings + all_mappings(v)
+    return mappings
+
+
+def sample_paths(collection):
+    paths = set()
+    for mapping in collection.find_mappings([]):
+        static = []
+        for matcher in mapping.matcher.matchers:
+            if not isinstance(matcher, StaticMatcher):
+                break
+            static.append(matcher.content)
+        for i in range(1, len(static) + 1):
+            paths.add(".".join(static[:i]))
+        for member in MEMBERS:
+            paths.add(".".join(static + [member]))
+    return [PackagePath(p) for p in sorted(paths)]
+
+
+def main(repeat=5):
+    path = [p for p in default_mapping_file_paths if os.path.basename(p).startswith("sklearn")][0]
+    collection = MappingFile(path)
+    paths = sample_paths(collection)
+
+    for p in paths:
+        assert set(collection.find_mappings(p.segments)) == set(recursive_find_mappings(p.segments,
+                                                                                        collection.mappings))
+
+    def legacy():
+        for p in paths:
+            recursive_find_mappings(p.segments, collection.mappings)
+
+    def cold():
+        collection._lookup_cache = {}
+        for p in paths:
+            collection.find_mappings(p.segments)
+
+    def memoized():
+        for p in paths:
+            collection.find_mappings(p.segments)
+
+    print("{} lookups over {}".format(len(paths), os.path.basename(path)))
+    for name, fn in [("recursive", legacy), ("compiled", cold), ("compiled + memo", memoized)]:
+        best = min(timeit.repeat(fn, number=1, repeat=repeat))
+        print("{:>16}: {:8.2f} ms total, {:6.2f} us per lookup".format(name, best * 1000, best / len(paths) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+===================================
+Import time with active import hook
+===================================
+Measures the import of libraries which are not mapped by PyPads after its import hook got activated. Each measurement
+runs in a fresh interpreter. "unscoped" intercepts every import as done before MappingRegistry.import_filter existed,
+"scoped" only intercepts imports of mapped libraries and "no hook" doesn't activate tracking at all.
+"""
+import subprocess
+import sys
+import tempfile
+
+LIBRARIES = ["pandas", "scipy.stats"]
+
+SCRIPT = """
+import time
+from pypads.app.base import PyPads
+from pypads.importext.mappings import MappingRegistry
+if {mode!r} == "unscoped":
+    MappingRegistry.import_filter = lambda self: None
+tracker = PyPads(uri={folder!r}, folder={folder!r}, autostart=False)
+if {mode!r} != "no hook":
+    tracker.activate_tracking()
+start = time.perf_counter()
+for lib in {libraries!r}:
+    __import__(lib)
+print(time.perf_counter() - start)
+"""
+
+
+def measure(mode, folder):
+    script = SCRIPT.format(mode=mode, folder=folder, libraries=LIBRARIES)
+    out = subprocess.run([sys.executable, "-c", script], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                         check=True).stdout
+    return float(out.decode().strip().splitlines()[-1])
+
+
+def main(repeat=7):
+    with tempfile.TemporaryDirectory() as folder:
+        print("Importing {}".format(", ".join(LIBRARIES)))
+        for mode in ["no hook", "unscoped", "scoped"]:
+            best = min(measure(mode, folder) for _ in range(repeat))
+            print("{:>10}: {:8.1f} ms".format(mode, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+============================================
+Allocations of a logger call on a tracked call
+============================================
+Measures a call of a tracked no-op method hooked with an injection logger which has an empty __pre__ and __post__.
+The logger calls are either aggregated into call statistics or stored as call and output records. For each mode the
+time per call, the peak of the memory temporarily allocated by a call and the memory blocks still held after the calls
+are reported, as traced by tracemalloc.
+"""
+import os
+import tempfile
+import timeit
+import tracemalloc
+
+from pypads.app.injections.call_statistics import AGGREGATE_PARAM
+from pypads.app.injections.injection import InjectionLogger
+from pypads.importext.mappings import SerializedMapping
+
+noop_mapping = """
+metadata:
+  author: "PyPads"
+  version: "0.0.1"
+  library:
+    name: "benchmarks"
+    version: "0.0.1"
+
+mappings:
+    :benchmarks._noop.Noop.noop:
+            hooks: "pypads_bench"
+"""
+
+
+class EmptyLogger(InjectionLogger):
+    """ Logger doing nothing before and after the call. """
+
+    def __pre__(self, ctx, *args, **kwargs):
+        pass
+
+    def __post__(self, ctx, *args, **kwargs):
+        pass
+
+
+def measure(name, fn, number):
+    best = timeit.timeit(fn, number=number)
+    tracemalloc.start()
+    peaks = 0
+    for _ in range(number):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        fn()
+        peaks += tracemalloc.get_traced_memory()[1] - current
+    before = tracemalloc.take_snapshot()
+    for _ in range(number):
+        fn()
+    blocks = sum(stat.count_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+    tracemalloc.stop()
+    print("{:>10}: {:8.1f} us per call, {:8.1f} KiB peak per call, {:6.2f} blocks held per call".format(
+        name, best / number * 1e6, peaks / number / 1024, max(blocks, 0) / number))
+
+
+def main(number=200):
+    from pypads.app.base import PyPads
+    with tempfile.TemporaryDirectory() as folder:
+        empty_logger = EmptyLogger()
+        tracker = PyPads(uri=os.path.join(folder, "mlruns"), folder=folder,
+                         mappings=[SerializedMapping("bench", noop_mapping)],
+                         hooks={"bench": {"on": ["pypads_bench"]}}, events={"bench": empty_logger},
+                         config={"include_default_mappings": False, "recursion_identity": False,
+                                 "recursion_depth": -1}, autostart=True)
+        from benchmarks._noop import Noop
+        tracked = Noop()
+        # Storing writes a call and an output record per call, fewer calls are measured
+        for name, aggregate, calls in [("aggregated", True, number), ("stored", False, number // 10)]:
+            empty_logger.static_parameters[AGGREGATE_PARAM] = aggregate
+            tracked.noop()
+            measure(name, tracked.noop, calls)
+        tracker.api.end_run()
+
+if __name__ == "__main__":
+    main()
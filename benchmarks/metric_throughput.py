@@ -0,0 +1,40 @@
+"""
+=========================
+Throughput of metric logs
+=========================
+Logs metric points through the api of a tracker into a local file store, once written by the background batch writer
+and once written synchronously one by one. The time the logging thread is blocked and the time until all points are
+written are reported.
+"""
+import os
+import tempfile
+import time
+
+
+def measure(name, points, batch_writes):
+    from pypads.app.base import PyPads
+    with tempfile.TemporaryDirectory() as folder:
+        tracker = PyPads(uri=os.path.join(folder, "mlruns"), folder=folder,
+                         config={"include_default_mappings": False, "batch_writes": batch_writes}, autostart=True)
+        run_id = tracker.api.active_run().info.run_id
+        start = time.perf_counter()
+        for i in range(points):
+            tracker.api.log_metric("metric", i, step=i)
+        logged = time.perf_counter() - start
+        tracker.api.flush()
+        written = time.perf_counter() - start
+        tracker.api.end_run()
+        history = tracker.backend.mlf.get_metric_history(run_id, "metric")
+        assert len(history) == points
+        print("{:>12}: {:8} points, logged in {:7.2f} s, written in {:7.2f} s, {:9.0f} points per s".format(
+            name, points, logged, written, points / written))
+        tracker.deactivate_tracking(run_atexits=False, reload_modules=False)
+
+
+def main(points=100000):
+    measure("batched", points, True)
+    measure("synchronous", points, False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+=======================================
+Tracking store constructions per call
+=======================================
+Calls a tracked no-op method hooked with a logger logging a metric, a parameter and a tag on each call. Reports the
+number of mlflow tracking stores and HTTP connections constructed and the time per call. Pass a tracking uri, e.g. the one of a local
+``mlflow server``, as argument to measure a REST store instead of a file store in a temporary folder.
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.call_overhead import noop_mapping
+from pypads.importext.mappings import SerializedMapping
+from pypads.importext.versioning import LibSelector
+
+
+class MetricLogger:
+    """ Logger logging a metric, a parameter and a tag on each call. """
+    order = 0
+    uid = None
+    supported_libraries = {LibSelector(name=".*", constraint="*")}
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, ctx, *args, _pypads_env, **kwargs):
+        api = _pypads_env.pypads.api
+        api.log_metric("calls", self.calls, step=self.calls)
+        api.log_param("param_" + str(self.calls), self.calls)
+        api.set_tag("last_call", self.calls)
+        self.calls += 1
+        return _pypads_env.callback(*args, **kwargs)
+
+
+class ConnectionCounter(logging.Handler):
+    """ Handler counting the new connections opened by urllib3. """
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.connections = 0
+
+    def emit(self, record):
+        if record.getMessage().startswith("Starting new HTTP"):
+            self.connections += 1
+
+
+def main(uri=None, calls=200):
+    connection_counter = ConnectionCounter()
+    urllib3_logger = logging.getLogger("urllib3.connectionpool")
+    urllib3_logger.setLevel(logging.DEBUG)
+    urllib3_logger.addHandler(connection_counter)
+
+    from mlflow.tracking._tracking_service import utils
+    constructions = []
+    get_store = utils._get_store
+
+    def counting_get_store(*args, **kwargs):
+        constructions.append(args)
+        return get_store(*args, **kwargs)
+
+    utils._get_store = counting_get_store
+
+    from pypads.app.base import PyPads
+    with tempfile.TemporaryDirectory() as folder:
+        tracker = PyPads(uri=uri or os.path.join(folder, "mlruns"), folder=folder,
+                         mappings=[SerializedMapping("bench", noop_mapping)],
+                         hooks={"bench": {"on": ["pypads_bench"]}}, events={"bench": MetricLogger()},
+                         config={"include_default_mappings": False, "recursion_identity": False,
+                                 "recursion_depth": -1}, autostart=True)
+        from benchmarks._noop import Noop
+        tracked = Noop()
+        tracked.noop()
+
+        before = len(constructions)
+        connections = connection_counter.connections
+        start = time.perf_counter()
+        for _ in range(calls):
+            tracked.noop()
+        elapsed = time.perf_counter() - start
+        print("{:>6} calls: {:6.2f} store constructions per call, {:6.2f} new connections per call, {:8.2f} ms per "
+              "call".format(calls, (len(constructions) - before) / calls,
+                            (connection_counter.connections - connections) / calls, elapsed / calls * 1e3))
+        tracker.api.end_run()
+    utils._get_store = get_store
+    urllib3_logger.removeHandler(connection_counter)
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2], *[int(arg) for arg in sys.argv[2:]])
@@ -0,0 +1,44 @@
+"""
+=====================================
+Warm start with a persisted wrap plan
+=====================================
+Measures the import of sklearn estimators after PyPads activated its import hook. Each measurement runs in a fresh
+interpreter. "discovery" doesn't use a wrap plan, "replay" uses the plan recorded by an earlier start.
+"""
+import subprocess
+import sys
+import tempfile
+
+LIBRARIES = ["sklearn.ensemble", "sklearn.linear_model", "sklearn.tree", "sklearn.svm"]
+
+SCRIPT = """
+import time
+from pypads.app.base import PyPads
+tracker = PyPads(uri={folder!r}, folder={folder!r}, config={{"wrap_plan": {plan}}}, autostart=False)
+tracker.activate_tracking()
+start = time.perf_counter()
+for lib in {libraries!r}:
+    __import__(lib)
+print(time.perf_counter() - start)
+"""
+
+
+def measure(plan, folder):
+    script = SCRIPT.format(plan=plan, folder=folder, libraries=LIBRARIES)
+    out = subprocess.run([sys.executable, "-c", script], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                         check=True).stdout
+    return float(out.decode().strip().splitlines()[-1])
+
+
+def main(repeat=5):
+    with tempfile.TemporaryDirectory() as folder:
+        # Warm the mapping cache and record the plan
+        measure(True, folder)
+        print("Importing {}".format(", ".join(LIBRARIES)))
+        for name, plan in [("discovery", False), ("replay", True)]:
+            best = min(measure(plan, folder) for _ in range(repeat))
+            print("{:>10}: {:8.1f} ms".format(name, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
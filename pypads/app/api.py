@@ -1,18 +1,17 @@
 import os
+import sys
 from abc import ABCMeta
 from contextlib import contextmanager
 from functools import wraps
 from typing import List, Iterable
 
-import mlflow
-from mlflow.entities import ViewType
-
 from pypads.app.env import LoggerEnv
 from pypads import logger
 from pypads.app.injections.run_loggers import RunSetup, RunTeardown
-from pypads.app.misc.caches import Cache
+from pypads.app.misc.caches import Cache, RunState
 from pypads.app.misc.extensions import ExtendableMixin, Plugin
 from pypads.app.misc.mixins import FunctionHolderMixin
+from pypads.app.misc.switch import tracking
 from pypads.bindings.anchors import get_anchor, Anchor
 from pypads.importext.mappings import Mapping, MatchedMapping, make_run_time_mapping_collection
 from pypads.importext.package_path import PackagePathMatcher, PackagePath
@@ -21,9 +20,13 @@ from pypads.utils.files_util import get_artifacts
 from pypads.utils.logging_util import WriteFormats, try_write_artifact, try_read_artifact, get_temp_folder, \
     _to_artifact_meta_name, _to_metric_meta_name, _to_param_meta_name
 from pypads.utils.util import inheritors
+from pypads.utils.lazy_mlflow import mlflow
 
 api_plugins = set()
 
+# Run cache key of the metrics whose generated meta information was written
+METRIC_METAS = "metric_metas"
+
 
 class Cmd(FunctionHolderMixin, metaclass=ABCMeta):
 
@@ -147,8 +150,14 @@ class PyPadsApi(IApi):
         :return: The newly spawned run
         """
         out = mlflow.start_run(run_id=run_id, experiment_id=experiment_id, run_name=run_name, nested=nested)
+
+        # Keep the state of the run in memory. The parent tag is set by mlflow on the creation of a nested run.
+        self.pypads.cache.run_state_add(
+            RunState(out.info.run_id, experiment_id=out.info.experiment_id,
+                     nested="mlflow.parentRunId" in out.data.tags))
         self.run_setups(
             _pypads_env=_pypads_env or LoggerEnv(parameter=dict(), experiment_id=experiment_id, run_id=run_id))
+        self.pypads.cache.run_state(out.info.run_id).config = self.pypads.cache.get("config", None)
         return out
 
     # ---- logging ----
@@ -219,10 +228,28 @@ class PyPadsApi(IApi):
         json containing some meta information.
         :return:
         """
-        if not meta:
+        default_meta = not meta
+        if default_meta:
             meta = MetricMetaModel(name=key, step=step, description="Metric meta information")
         self.pypads.backend.log_metric(value, meta=meta)
-        self.log_metric_meta(meta.name, meta)
+
+        # A generated meta information only differs by the step, it is written once per metric and run
+        if not default_meta or self._first_metric_meta(meta.name):
+            self.log_metric_meta(meta.name, meta)
+
+    def _first_metric_meta(self, key):
+        """
+        Check if the meta information of a metric is written for the first time in the active run.
+        :param key: Metric key
+        :return:
+        """
+        written = self.pypads.cache.run_get(METRIC_METAS)
+        if written is None:
+            written = self.pypads.cache.run_cache().cache.setdefault(METRIC_METAS, set())
+        if key in written:
+            return False
+        written.add(key)
+        return True
 
     @cmd
     def log_metric_meta(self, key, meta=None):
@@ -304,6 +331,28 @@ class PyPadsApi(IApi):
     def artifact(self, name):
         return try_read_artifact(name)
 
+    @cmd
+    def blob(self, digest):
+        """
+        Load a payload of the blob store by its digest. The digests of logged data are found in the meta information
+        of its artifacts.
+        :param digest: Digest of the payload
+        :return:
+        """
+        from pypads.utils.blob_store import blob_store
+        return blob_store().get(digest)
+
+    @cmd
+    def collect_blobs(self, dry_run=False):
+        """
+        Garbage collect the blob store. References of deleted runs are released and payloads without references
+        are removed.
+        :param dry_run: Only report the payloads which would be removed
+        :return: Digests of the removed payloads
+        """
+        from pypads.utils.blob_store import blob_store
+        return blob_store().collect(dry_run=dry_run)
+
     @cmd
     def metric_meta(self, name):
         """
@@ -347,6 +396,7 @@ class PyPadsApi(IApi):
         try:
             run = self.pypads.api.start_run(**kwargs, nested=True)
             self.pypads.cache.run_add("enclosing_run", enclosing_run)
+            self.pypads.cache.run_state(run.info.run_id).intermediate = True
             yield run
         finally:
             if not mlflow.active_run() is enclosing_run:
@@ -356,6 +406,33 @@ class PyPadsApi(IApi):
             else:
                 mlflow.start_run(run_id=enclosing_run.info.run_id)
 
+    @cmd
+    def pause_tracking(self):
+        """
+        Switch off the tracking for the whole process. Wrapped functions call their original function right away until
+        the tracking is resumed.
+        :return:
+        """
+        tracking.disable()
+
+    @cmd
+    def resume_tracking(self):
+        """
+        Switch the tracking back on after pause_tracking().
+        :return:
+        """
+        tracking.enable()
+
+    @contextmanager
+    @cmd
+    def paused(self):
+        """
+        Pause the tracking for the whole process in the "with" block.
+        :return:
+        """
+        with tracking.paused():
+            yield
+
     def _get_setup_cache(self):
         """
         Get registered pre_run functions.
@@ -487,6 +564,9 @@ class PyPadsApi(IApi):
         Check if the current run is an intermediate run.
         :return:
         """
+        run_state = self.pypads.cache.run_state()
+        if run_state is not None:
+            return run_state.intermediate
         enclosing_run = self.pypads.cache.run_get("enclosing_run")
         return enclosing_run is not None
 
@@ -504,6 +584,9 @@ class PyPadsApi(IApi):
             try_write_artifact("consolidated_log", consolidated_dict, write_format=WriteFormats.json)
             # self.log_mem_artifact("consolidated_log", consolidated_dict, write_format=WriteFormats.json)
 
+        # Write everything held back before the last teardown functions, e.g. the commit of managed results
+        self.register_teardown_fn("flush", lambda pads, *args, **kwargs: pads.api.flush(), order=sys.maxsize - 2)
+
         chached_fns = self._get_teardown_cache()
         fn_list = [v for i, v in chached_fns.items()]
         fn_list.sort(key=lambda t: t.order)
@@ -514,7 +597,10 @@ class PyPadsApi(IApi):
             except (KeyboardInterrupt, Exception) as e:
                 logger.warning("Failed running post run function " + fn.__name__ + " because of exception: " + str(e))
 
+        # Everything logged to the run has to be written before it is closed
+        self.flush()
         mlflow.end_run()
+        self.pypads.cache.run_state_remove(run.info.run_id)
 
         # --- Clean tmp files in disk cache after run ---
         folder = get_temp_folder(run)
@@ -524,8 +610,17 @@ class PyPadsApi(IApi):
         # !-- Clean tmp files in disk cache after run ---
 
     # !--- run management ----
+    @cmd
+    def flush(self):
+        """
+        Write all queued metrics, parameters, tags and artifacts.
+        :return:
+        """
+        self.pypads.backend.flush()
+
     @cmd
     def get_run(self, run_id=None):
+        self.flush()
         run_id = run_id or self.active_run().info.run_id
         return self.pypads.backend.mlf.get_run(run_id=run_id)
 
@@ -534,11 +629,17 @@ class PyPadsApi(IApi):
         return {key: self.pypads.backend.mlf.get_metric_history(run.info.run_id, key) for key in run.data.metrics}
 
     @cmd
-    def list_experiments(self, view_type: ViewType = ViewType.ALL):
+    def list_experiments(self, view_type=None):
+        if view_type is None:
+            from mlflow.entities import ViewType
+            view_type = ViewType.ALL
         return self.pypads.backend.mlf.list_experiments(view_type)
 
     @cmd
-    def list_run_infos(self, experiment_id, run_view_type: ViewType = ViewType.ALL):
+    def list_run_infos(self, experiment_id, run_view_type=None):
+        if run_view_type is None:
+            from mlflow.entities import ViewType
+            run_view_type = ViewType.ALL
         return self.pypads.backend.mlf.list_run_infos(experiment_id=experiment_id, run_view_type=run_view_type)
 
     @cmd
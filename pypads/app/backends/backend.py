@@ -1,17 +1,62 @@
 import os
 import sys
+import time
 from abc import abstractmethod
+from functools import wraps
 from typing import Union
 
-import mlflow
-from mlflow.tracking import MlflowClient
-from mlflow.utils.autologging_utils import try_mlflow_log
 
 from pypads import logger
+from pypads.app.backends.batch_writer import BatchWriter, METRIC, PARAM, TAG
 from pypads.app.injections.base_logger import TrackedObject, LoggerOutput
 from pypads.model.models import ArtifactMetaModel, MetricMetaModel, ParameterMetaModel, TagMetaModel, MetadataModel
-from pypads.utils.logging_util import try_write_artifact, WriteFormats
+from pypads.utils.logging_util import try_write_artifact, WriteFormats, flush_artifacts
 from pypads.utils.util import string_to_int
+from pypads.utils.lazy_mlflow import mlflow, try_mlflow_log, client
+
+
+# Methods of the mlflow client reading the records of the run given as first argument
+_RUN_READS = {"get_run", "get_metric_history"}
+
+# Methods of the mlflow client reading the artifacts of the run given as first argument
+_ARTIFACT_READS = {"list_artifacts", "download_artifacts"}
+
+# Methods of the mlflow client reading the records of multiple runs
+_SEARCH_READS = {"search_runs"}
+
+
+class ConsistentClient:
+    """
+    Mlflow client proxy writing the records and artifacts held back for a run before they are read. Everything
+    else is passed on to the client unchanged.
+    """
+
+    def __init__(self, backend):
+        """
+        :param backend: Backend holding back the writes
+        """
+        self._backend = backend
+
+    def __getattr__(self, name):
+        attr = getattr(self._backend.mlf, name)
+        if name in _RUN_READS or name in _ARTIFACT_READS:
+            artifacts = name in _ARTIFACT_READS
+
+            @wraps(attr)
+            def read_run(*args, **kwargs):
+                self._backend.flush_run(kwargs.get("run_id", args[0] if args else None), artifacts=artifacts)
+                return attr(*args, **kwargs)
+
+            return read_run
+        if name in _SEARCH_READS:
+
+            @wraps(attr)
+            def read_runs(*args, **kwargs):
+                self._backend.flush_run(None)
+                return attr(*args, **kwargs)
+
+            return read_runs
+        return attr
 
 
 class BackendInterface:
@@ -93,6 +138,22 @@ class BackendInterface:
     def set_tag(self, tag, meta: TagMetaModel):
         raise NotImplementedError("")
 
+    def flush(self):
+        """
+        Write everything the backend still holds back.
+        :return:
+        """
+        pass
+
+    def flush_run(self, run_id, artifacts=False):
+        """
+        Write the records the backend still holds back for a run.
+        :param run_id: Id of the run or None for all runs
+        :param artifacts: Also upload the held back artifacts of the run
+        :return:
+        """
+        pass
+
 
 class MLFlowBackend(BackendInterface):
     """
@@ -106,8 +167,9 @@ class MLFlowBackend(BackendInterface):
         :return:
         """
         super().__init__(uri, pypads)
-        # Set the tracking uri
+        # Set the tracking uri. This is deferred until mlflow gets loaded.
         mlflow.set_tracking_uri(self._uri)
+        self._writer = None
 
     def manage_results(self, result_path):
         self._managed_result_git = self.pypads.managed_git_factory(result_path)
@@ -160,8 +222,61 @@ class MLFlowBackend(BackendInterface):
             logger.warning("Failed to add remote due to exception: " + str(e))
 
     @property
-    def mlf(self) -> MlflowClient:
-        return MlflowClient(self.uri)
+    def mlf(self):  # type: () -> MlflowClient
+        """
+        Get the mlflow client of the backend. The client is shared for the uri of the backend.
+        :return:
+        """
+        return client(self.uri)
+
+    @property
+    def consistent_mlf(self):  # type: () -> MlflowClient
+        """
+        Get the mlflow client of the backend, which writes the records held back for a run before reading it.
+        :return: ConsistentClient
+        """
+        return ConsistentClient(self)
+
+    @staticmethod
+    def _run_id():
+        """
+        Get the id of the active run. The fluent mlflow api creates a new client and store on each call, logging
+        functions therefore log with the client of the backend to the active run.
+        :return: Id of the active run or None if no run is active
+        """
+        run = mlflow.active_run()
+        return run.info.run_id if run else None
+
+    @property
+    def writer(self):
+        """
+        Get the background writer of metrics, parameters and tags. None if batched writes are disabled.
+        :return: BatchWriter or None
+        """
+        if self._writer is None:
+            config = self.pypads.config
+            if not config.get("batch_writes", True):
+                return None
+            self._writer = BatchWriter(lambda: self.mlf, flush_interval=config.get("batch_flush_interval", 1.0),
+                                       queue_size=config.get("batch_queue_size", 10000))
+        return self._writer
+
+    def flush(self):
+        self._flush_writer()
+        flush_artifacts()
+
+    def flush_run(self, run_id, artifacts=False):
+        if self._writer is not None and (run_id is None or self._writer.pending_for(run_id)):
+            self._flush_writer()
+        if artifacts and run_id == self._run_id():
+            flush_artifacts()
+
+    def _flush_writer(self):
+        if self._writer is not None:
+            timeout = self.pypads.config.get("batch_flush_timeout", 30.0)
+            if not self._writer.flush(timeout):
+                logger.warning("Couldn't write all queued metrics, parameters and tags within " + str(timeout) +
+                               " seconds. " + str(self._writer.pending) + " records are left undelivered.")
 
     def store_tracked_object(self, to: TrackedObject, path=""):
         path += "{}#{}".format(to.__class__.__name__, id(to))
@@ -177,16 +292,41 @@ class MLFlowBackend(BackendInterface):
         if artifact_path is None:
             if meta:
                 artifact_path = meta.path
-        try_mlflow_log(mlflow.log_artifact, local_path, artifact_path)
+        run_id = self._run_id()
+        if run_id is None:
+            try_mlflow_log(mlflow.log_artifact, local_path, artifact_path)
+        else:
+            try_mlflow_log(self.mlf.log_artifact, run_id, local_path, artifact_path)
 
     def log_mem_artifact(self, artifact, meta: Union[MetadataModel, ArtifactMetaModel], preserve_folder=True):
         try_write_artifact(meta.path, artifact, write_format=meta.format, preserve_folder=preserve_folder)
 
     def log_metric(self, metric, meta: MetricMetaModel):
-        mlflow.log_metric(meta.name, metric, meta.step)
+        run_id = self._run_id()
+        if run_id is None:
+            mlflow.log_metric(meta.name, metric, meta.step)
+        elif self.writer is not None:
+            from mlflow.entities import Metric
+            self.writer.add(METRIC, run_id, Metric(meta.name, metric, int(time.time() * 1000), meta.step or 0))
+        else:
+            self.mlf.log_metric(run_id, meta.name, metric, int(time.time() * 1000), meta.step or 0)
 
     def log_parameter(self, parameter, meta: ParameterMetaModel):
-        mlflow.log_param(meta.name, parameter)
+        run_id = self._run_id()
+        if run_id is None:
+            mlflow.log_param(meta.name, parameter)
+        elif self.writer is not None:
+            from mlflow.entities import Param
+            self.writer.add(PARAM, run_id, Param(meta.name, str(parameter)))
+        else:
+            self.mlf.log_param(run_id, meta.name, parameter)
 
     def set_tag(self, tag, meta: TagMetaModel):
-        mlflow.set_tag(meta.name, tag)
+        run_id = self._run_id()
+        if run_id is None:
+            mlflow.set_tag(meta.name, tag)
+        elif self.writer is not None:
+            from mlflow.entities import RunTag
+            self.writer.add(TAG, run_id, RunTag(meta.name, str(tag)))
+        else:
+            self.mlf.set_tag(run_id, meta.name, tag)
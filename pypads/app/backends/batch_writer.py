@@ -0,0 +1,216 @@
+import queue
+import threading
+import time
+
+from pypads import logger
+
+# Limits of a single log_batch request of mlflow
+MAX_METRICS_PER_BATCH = 1000
+MAX_PARAMS_TAGS_PER_BATCH = 100
+MAX_ENTITIES_PER_BATCH = 1000
+
+METRIC = "metric"
+PARAM = "param"
+TAG = "tag"
+
+
+class _Flush:
+    """
+    Marker put into the queue by a flush. It is set as soon as everything queued before it was written.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class _Batch:
+    """
+    Pending records of a run.
+    """
+
+    def __init__(self):
+        self.metrics = []
+        self.params = {}
+        self.tags = {}
+        # Number of queued records merged into the batch
+        self.records = 0
+
+    def add(self, kind, entity):
+        if kind == METRIC:
+            self.metrics.append(entity)
+        elif kind == PARAM:
+            # Params can't change, an already pending value is kept and a conflict is reported by the store
+            if entity.key in self.params and self.params[entity.key].value != entity.value:
+                return False
+            self.params[entity.key] = entity
+        else:
+            # Only the last value of a tag is visible, earlier ones don't have to be written
+            self.tags[entity.key] = entity
+        self.records += 1
+        return True
+
+    def requests(self):
+        """
+        Split the records into requests within the limits of log_batch.
+        :return: Generator of metrics, params and tags of each request
+        """
+        metrics, params_tags = self.metrics, list(self.params.values()) + list(self.tags.values())
+        param_count = len(self.params)
+        m, p = 0, 0
+        while m < len(metrics) or p < len(params_tags):
+            chunk = params_tags[p:p + MAX_PARAMS_TAGS_PER_BATCH]
+            metric_count = min(MAX_METRICS_PER_BATCH, MAX_ENTITIES_PER_BATCH - len(chunk))
+            params = [entity for i, entity in enumerate(chunk, p) if i < param_count]
+            tags = [entity for i, entity in enumerate(chunk, p) if i >= param_count]
+            yield metrics[m:m + metric_count], params, tags
+            m += metric_count
+            p += len(chunk)
+
+
+class BatchWriter:
+    """
+    Background writer of metrics, parameters and tags. Records are queued by the logging thread and written by a
+    daemon thread with as few log_batch calls as possible. Pending records are written as soon as a full batch is
+    pending, flush_interval seconds passed or a flush is requested. The queue is bounded, logging blocks if the writer
+    falls behind by more than queue_size records.
+    """
+
+    def __init__(self, client_fn, flush_interval=1.0, queue_size=10000):
+        """
+        :param client_fn: Function returning the mlflow client to write with
+        :param flush_interval: Seconds after which pending records are written
+        :param queue_size: Maximal number of queued records
+        """
+        self._client_fn = client_fn
+        self._flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.requests = 0
+        self.failed = 0
+        # Records taken from the queue by the writer thread but not written yet
+        self._taken = 0
+        # Number of queued records by run which aren't written yet
+        self._unwritten = {}
+        self._unwritten_lock = threading.Lock()
+
+    @property
+    def pending(self):
+        """
+        Number of queued records which aren't written yet.
+        :return:
+        """
+        return self._queue.qsize() + self._taken
+
+    def pending_for(self, run_id):
+        """
+        Check if records of a run are queued which aren't written yet.
+        :param run_id: Id of the run
+        :return: True if records of the run are pending
+        """
+        return self._unwritten.get(run_id, 0) > 0
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="pypads-batch-writer", daemon=True)
+                    self._thread.start()
+
+    def add(self, kind, run_id, entity):
+        """
+        Queue a record. Blocks while the queue is full.
+        :param kind: One of METRIC, PARAM and TAG
+        :param run_id: Id of the run to write to
+        :param entity: mlflow Metric, Param or RunTag
+        :return:
+        """
+        self._ensure_thread()
+        with self._unwritten_lock:
+            self._unwritten[run_id] = self._unwritten.get(run_id, 0) + 1
+        self._queue.put((kind, run_id, entity))
+
+    def flush(self, timeout=None):
+        """
+        Wait until all records queued before are written.
+        :param timeout: Seconds to wait at most
+        :return: True if everything was written in time
+        """
+        if self._queue.empty() and (self._thread is None or not self._thread.is_alive()):
+            return True
+        # Records left behind by a writer thread which died are written by a new one
+        self._ensure_thread()
+        marker = _Flush()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def _run(self):
+        batches = {}
+        pending = 0
+        deadline = None
+        while True:
+            try:
+                item = self._queue.get(timeout=None if deadline is None else max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                item = None
+            markers = []
+            while item is not None:
+                if isinstance(item, _Flush):
+                    markers.append(item)
+                else:
+                    kind, run_id, entity = item
+                    batch = batches.setdefault(run_id, _Batch())
+                    if not batch.add(kind, entity):
+                        # Write what is pending to let the store decide about the conflicting value
+                        self._write(batches)
+                        batches, pending = {run_id: _Batch()}, 0
+                        self._taken = 0
+                        batches[run_id].add(kind, entity)
+                    pending += 1
+                    self._taken = pending
+                    if deadline is None:
+                        deadline = time.monotonic() + self._flush_interval
+                if markers or pending >= MAX_METRICS_PER_BATCH:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+            if markers or pending >= MAX_METRICS_PER_BATCH or (deadline is not None and time.monotonic() >= deadline):
+                self._write(batches)
+                batches, pending, deadline = {}, 0, None
+                self._taken = 0
+            for marker in markers:
+                marker.done.set()
+
+    def _write(self, batches):
+        for run_id, batch in batches.items():
+            try:
+                for metrics, params, tags in batch.requests():
+                    try:
+                        self._client_fn().log_batch(run_id, metrics=metrics, params=params, tags=tags)
+                        self.requests += 1
+                        self.written += len(metrics) + len(params) + len(tags)
+                    except Exception as e:
+                        logger.warning("Couldn't write batch of " + str(len(metrics) + len(params) + len(tags)) +
+                                       " records to run " + str(run_id) + ". Writing them one by one. " + str(e))
+                        self._write_each(run_id, metrics, params, tags)
+            finally:
+                with self._unwritten_lock:
+                    left = self._unwritten.get(run_id, 0) - batch.records
+                    if left > 0:
+                        self._unwritten[run_id] = left
+                    else:
+                        self._unwritten.pop(run_id, None)
+
+    def _write_each(self, run_id, metrics, params, tags):
+        for argument, entities in (("params", params), ("metrics", metrics), ("tags", tags)):
+            for entity in entities:
+                try:
+                    self._client_fn().log_batch(run_id, **{argument: [entity]})
+                    self.requests += 1
+                    self.written += 1
+                except Exception as e:
+                    self.failed += 1
+                    logger.warning("Couldn't write " + str(entity.key) + " to run " + str(run_id) + ". " + str(e))
@@ -1,18 +1,16 @@
 import ast
 import atexit
-import importlib
 import os
-import pkgutil
 from os.path import expanduser
 from typing import List
 
-import mlflow
-
 from pypads import logger
+from pypads.app.config import PyPadsConfig, DEFAULT_CONFIG
 from pypads.app.actuators import ActuatorPluginManager
 from pypads.app.api import ApiPluginManager
 from pypads.app.backends.backend import MLFlowBackend
 from pypads.app.decorators import DecoratorPluginManager
+from pypads.app.plugins import activate_plugins
 from pypads.app.misc.caches import PypadsCache
 from pypads.app.validators import ValidatorPluginManager, validators
 from pypads.bindings.events import FunctionRegistry
@@ -25,6 +23,7 @@ from pypads.injections.setup.git import IGitRSF
 from pypads.injections.setup.hardware import ISystemRSF, IRamRSF, ICpuRSF, IDiskRSF, IPidRSF, ISocketInfoRSF, \
     IMacAddressRSF
 from pypads.injections.setup.misc_setup import DependencyRSF, LoguruRSF
+from pypads.utils.lazy_mlflow import mlflow
 
 tracking_active = None
 
@@ -51,22 +50,6 @@ Logs loss and any other metrics specified in the fit
     excluding ``mode`` and ``verbose``.
 """
 
-# Default config.
-# Pypads mapping files shouldn't interact directly with the logging functions,
-# but define events on which different logging functions can listen.
-# This config defines such a listening structure.
-# {"recursive": track functions recursively. Otherwise check the callstack to only track the top level function.}
-DEFAULT_CONFIG = {
-    "track_sub_processes": False,
-    # Activate to track spawned subprocesses by extending the joblib. This is currently experimental.
-    "recursion_identity": False,
-    # Activate to ignore tracking on recursive calls of the same function with the same mapping
-    "recursion_depth": -1,  # Limit the tracking of recursive calls
-    "log_on_failure": True,  # Log the stdout / stderr output when the execution of the experiment failed
-    "include_default_mappings": True  # Include the default mappings additionally to the passed mapping if a mapping
-    # is passed
-}
-
 DEFAULT_SETUP_FNS = {DependencyRSF(), LoguruRSF(), IGitRSF(_pypads_timeout=3), ISystemRSF(), IRamRSF(), ICpuRSF(),
                      IDiskRSF(), IPidRSF(), ISocketInfoRSF(), IMacAddressRSF()}
 
@@ -90,11 +73,7 @@ class PyPads:
                  disable_plugins=None, autostart=None, consolidate_outputs=True):
         # Set the singleton instance
 
-        if disable_plugins is None:
-            disable_plugins = []
-        for name, plugin in discovered_plugins.items():
-            if name not in disable_plugins:
-                plugin.activate()
+        activate_plugins(folder or os.path.join(expanduser("~"), ".pypads"), disable_plugins)
 
         from pypads.app.pypads import set_current_pads
         set_current_pads(self)
@@ -298,42 +277,55 @@ class PyPads:
         return self._cache.get("folder")
 
     @property
-    def config(self):
+    def config(self) -> PyPadsConfig:
         """
         Return the configuration of pypads.
-        :return: Configuration dict
-        """
-        if self._cache.exists("config"):
-            return self._cache.get("config")
-        if self.api.active_run() is not None:
+        :return: Frozen configuration snapshot
+        """
+        config = self._cache.get("config")
+        if config is not None:
+            return config
+        if mlflow.active_run() is not None:
+            run_state = self.cache.run_state()
+            if run_state is not None and run_state.config is not None:
+                return run_state.config
             tags = self.mlf.get_run(mlflow.active_run().info.run_id).data.tags
             if CONFIG_NAME not in tags:
                 raise Exception("Config for pypads is not defined.")
             try:
-                return ast.literal_eval(tags[CONFIG_NAME])
+                config = PyPadsConfig(ast.literal_eval(tags[CONFIG_NAME]))
             except Exception as e:
                 raise Exception("Config for pypads is malformed. " + str(e))
+            if run_state is not None:
+                run_state.config = config
+            return config
         else:
-            return {}
+            return PyPadsConfig()
 
     @config.setter
     def config(self, value: dict):
         """
-        Set the configuration of pypads.
+        Set the configuration of pypads. The configuration is frozen into a snapshot which is persisted as tag of the
+        run.
         :param value: Dict containing config key, values
         :return:
         """
+        config = value if isinstance(value, PyPadsConfig) else PyPadsConfig(value)
+
         # Set the config as tag
-        if self.api.active_run() is not None:
-            mlflow.set_tag(CONFIG_NAME, value)
+        if mlflow.active_run() is not None:
+            mlflow.set_tag(CONFIG_NAME, config)
+            run_state = self.cache.run_state()
+            if run_state is not None:
+                run_state.config = config
         else:
             # Set the config as soon as the run is started as tag
             def set_config(*args, **kwargs):
-                mlflow.set_tag(CONFIG_NAME, value)
+                mlflow.set_tag(CONFIG_NAME, self.config)
 
             self.api.register_setup_fn("config_persist", "Function persisting the current pypads configuration.",
                                        set_config, nested=False, intermediate=False)
-        self._cache.add("config", value)
+        self._cache.add("config", config)
 
     @property
     def mapping_registry(self):
@@ -450,10 +442,11 @@ class PyPads:
     @property
     def mlf(self):
         """
-        Return a mlflow client to interact with stored data.
+        Return a mlflow client to interact with stored data. Metrics, parameters and tags held back by the batch writer
+        and artifacts held back by a deferred artifact sync are written before the run holding them is read.
         :return: MlflowClient
         """
-        return self._backend.mlf
+        return self._backend.consistent_mlf
 
     def add_atexit_fn(self, fn):
         """
@@ -612,15 +605,8 @@ class PyPads:
             try:
                 self.api.start_run(experiment_id=experiment_name, nested=True)
             except Exception:
+                self.backend.flush()
                 mlflow.end_run()
                 self.api.start_run(experiment_id=experiment_name)
         return self
 
-
-# --- Pypads Plugins ---
-discovered_plugins = {
-    name: importlib.import_module(name)
-    for finder, name, ispkg
-    in pkgutil.iter_modules()
-    if name.startswith('pypads_')
-}
@@ -1,5 +1,7 @@
 import os
 import threading
+from enum import Enum
+from functools import lru_cache
 from typing import Type
 
 from pydantic import BaseModel
@@ -10,20 +12,48 @@ from pypads.model.metadata import ModelObject
 from pypads.model.models import FunctionReferenceModel, CallAccessorModel, CallIdModel, CallModel
 
 
+class FunctionKind(Enum):
+    """
+    Kind of a tracked function. The kind defines how the function has to be bound on a call.
+    """
+    static_method = "staticmethod"
+    function = "function"
+    class_method = "classmethod"
+    wrapped = "wrapped"
+
+
+@lru_cache(maxsize=None)
+def _function_kind(function_type):
+    function_type = str(function_type)
+    for kind in FunctionKind:
+        if kind.value in function_type:
+            return kind
+    return None
+
+
 class FunctionReference(ModelObject):
 
     @classmethod
     def get_model_cls(cls) -> Type[BaseModel]:
         return FunctionReferenceModel
 
-    def __init__(self, _pypads_context: Context, _pypads_wrappee, *args, **kwargs):
+    def __init__(self, _pypads_context: Context, _pypads_wrappee, *args, _pypads_function_type=None,
+                 _pypads_real_context=None, **kwargs):
+        """
+        :param _pypads_context: Context on which the function is accessed
+        :param _pypads_wrappee: The function itself
+        :param _pypads_function_type: Already known function type. Deriving it is expensive.
+        :param _pypads_real_context: Already known defining context of the function.
+        """
         self.wrappee = _pypads_wrappee
         super().__init__(*args, context=_pypads_context, fn_name=_pypads_wrappee.__name__,
                          **kwargs)
-        self._real_context = None
-        self._function_type = None
+        self._real_context = _pypads_real_context
+        self._function_type = _pypads_function_type
+        self._function_kind = None
 
-        if self.is_wrapped():
+        # A known function type was derived on the already resolved wrappee
+        if _pypads_function_type is None and self.is_wrapped():
             self.wrappee = self.context.container.__dict__[self.wrappee.__name__]
 
     def real_context(self):
@@ -75,20 +105,29 @@ class FunctionReference(ModelObject):
             self._function_type = function_type
         return function_type
 
+    def function_kind(self):
+        """
+        Get the kind of the function.
+        :return: FunctionKind or None if the kind is unknown
+        """
+        if self._function_kind is None:
+            self._function_kind = _function_kind(self.function_type())
+        return self._function_kind
+
     def is_static_method(self):
-        return "staticmethod" in str(self.function_type())
+        return self.function_kind() is FunctionKind.static_method
 
     def is_function(self):
-        return "function" in str(self.function_type())
+        return self.function_kind() is FunctionKind.function
 
     def function_name(self):
         return self.wrappee.__name__
 
     def is_class_method(self):
-        return "classmethod" in str(self.function_type())
+        return self.function_kind() is FunctionKind.class_method
 
     def is_wrapped(self):
-        return "wrapped" in str(self.function_type())
+        return self.function_kind() is FunctionKind.wrapped
 
     @property
     def function_id(self):
@@ -119,7 +158,9 @@ class CallAccessor(FunctionReference):
     @classmethod
     def from_function_reference(cls, function_reference: FunctionReference, instance):
         return CallAccessor(instance=instance, _pypads_context=function_reference.context,
-                            _pypads_wrappee=function_reference.wrappee)
+                            _pypads_wrappee=function_reference.wrappee,
+                            _pypads_function_type=function_reference.function_type(),
+                            _pypads_real_context=function_reference.real_context())
 
     def is_call_identity(self, other):
         if other.is_class_method() or other.is_static_method() or other.is_wrapped():
@@ -147,7 +188,8 @@ class CallId(CallAccessor):
 
     @classmethod
     def from_accessor(cls, accessor: CallAccessor, instance_number, call_number):
-        return CallId(accessor.instance, accessor.context, accessor.wrappee, instance_number, call_number)
+        return CallId(accessor.instance, accessor.context, accessor.wrappee, instance_number, call_number,
+                      _pypads_function_type=accessor.function_type(), _pypads_real_context=accessor.real_context())
 
     def to_parent_folder(self):
         return os.path.join("process_" + str(self.process) + str(self.thread))
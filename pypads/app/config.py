@@ -0,0 +1,93 @@
+from collections.abc import Mapping
+
+# Default config.
+# Pypads mapping files shouldn't interact directly with the logging functions,
+# but define events on which different logging functions can listen.
+# This config defines such a listening structure.
+# {"recursive": track functions recursively. Otherwise check the callstack to only track the top level function.}
+
+DEFAULT_CONFIG = {
+    "track_sub_processes": False,
+    # Activate to track spawned subprocesses by extending the joblib. This is currently experimental.
+    "recursion_identity": False,
+    # Activate to ignore tracking on recursive calls of the same function with the same mapping
+    "recursion_depth": -1,  # Limit the tracking of recursive calls
+    "log_on_failure": True,  # Log the stdout / stderr output when the execution of the experiment failed
+    "include_default_mappings": True,  # Include the default mappings additionally to the passed mapping if a mapping
+    # is passed
+    "mapping_cache": True,  # Store compiled mapping files in the pypads folder to skip parsing them on later starts
+    "inheritance_watch": [],  # Top level packages which are searched for classes inheriting from tracked classes
+    # additionally to the mapped libraries. Imports of other packages are not intercepted.
+    "wrap_plan": True,  # Store the resolved wrapping of modules in the pypads folder and replay it on later starts
+    "aggregate_flush_interval": None,  # Seconds after which aggregated call statistics of loggers are flushed
+    # additionally to the flush at the end of the run
+    "overhead_budget": None,  # Fraction of the execution time of a tracked function its loggers may add, e.g. 0.05.
+    # Loggers exceeding it on a function are sampled, aggregated and finally disabled on it.
+    "batch_writes": True,  # Write metrics, parameters and tags in batches from a background thread
+    "batch_flush_interval": 1.0,  # Seconds after which queued metrics, parameters and tags are written
+    "batch_flush_timeout": 30.0,  # Seconds a flush waits at most for queued values to be written, None waits forever
+    "batch_queue_size": 10000,  # Maximal number of queued metrics, parameters and tags before logging blocks
+    "artifact_sync": "immediate",  # Upload written artifacts "immediate" or "deferred" until the run ends or is flushed
+    "direct_artifact_writes": True,  # Write artifacts straight into local artifact stores instead of the temp folder
+    "binary_artifacts": True,  # Write logged numpy arrays as npy and pandas DataFrames as columnar instead of text or
+    # pickle
+    "blob_store": None  # Store binary inputs and outputs once in the blob store of the pypads folder shared by all
+    # runs. None enables it only for runs with local artifact stores.
+}
+
+
+class PyPadsConfig(Mapping):
+    """
+    Frozen snapshot of the pypads configuration. The snapshot is built once when the configuration is set. Often read
+    settings are typed attributes, so hot paths don't have to look them up. The snapshot can still be read like the
+    dict it was built from. Typed attributes missing in the values take the value of DEFAULT_CONFIG.
+    """
+    __slots__ = ("track_sub_processes", "recursion_identity", "recursion_depth", "log_on_failure",
+                 "include_default_mappings", "mapping_cache", "inheritance_watch", "wrap_plan", "overhead_budget", "_values")
+
+    def __init__(self, values=None):
+        """
+        :param values: Dict of config keys and values
+        """
+        values = dict(values or {})
+
+        def setting(key):
+            return values.get(key, DEFAULT_CONFIG[key])
+
+        init = object.__setattr__
+        init(self, "_values", values)
+        init(self, "track_sub_processes", bool(setting("track_sub_processes")))
+        init(self, "recursion_identity", bool(setting("recursion_identity")))
+        init(self, "recursion_depth", int(setting("recursion_depth")))
+        init(self, "log_on_failure", bool(setting("log_on_failure")))
+        init(self, "include_default_mappings", bool(setting("include_default_mappings")))
+        init(self, "mapping_cache", bool(setting("mapping_cache")))
+        init(self, "inheritance_watch", tuple(setting("inheritance_watch") or ()))
+        init(self, "wrap_plan", bool(setting("wrap_plan")))
+        budget = setting("overhead_budget")
+        init(self, "overhead_budget", None if budget is None else float(budget))
+
+    def __setattr__(self, key, value):
+        raise AttributeError("The pypads config is immutable. Set a new config instead of changing '" + key + "'.")
+
+    def __delattr__(self, key):
+        raise AttributeError("The pypads config is immutable. Set a new config instead of deleting '" + key + "'.")
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __reduce__(self):
+        return PyPadsConfig, (self._values,)
+
+    def __repr__(self):
+        # The representation is persisted as tag and read again with ast.literal_eval
+        return repr(self._values)
+
+    def __str__(self):
+        return str(self._values)
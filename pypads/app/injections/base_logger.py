@@ -1,9 +1,9 @@
+import inspect
 import os
 import traceback
 from abc import abstractmethod, ABCMeta
 from typing import Type, Set, List, Callable
 
-import mlflow
 from pydantic import HttpUrl, BaseModel
 
 from pypads.app.env import LoggerEnv
@@ -16,6 +16,7 @@ from pypads.injections.analysis.time_keeper import TimingDefined
 from pypads.model.models import MetricMetaModel, \
     ParameterMetaModel, ArtifactMetaModel, TrackedObjectModel, LoggerCallModel, OutputModel, EmptyOutput, TagMetaModel
 from pypads.utils.logging_util import WriteFormats
+from pypads.utils.lazy_mlflow import mlflow
 
 
 class PassThroughException(Exception):
@@ -46,6 +47,14 @@ class LoggerExecutor(DefensiveCallableMixin, FunctionHolderMixin, TimedCallableM
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+    def __real_call__(self, *args, **kwargs):
+        out = super().__real_call__(*args, **kwargs)
+        if inspect.iscoroutine(out):
+            # Async functionality on a synchronous call is run to completion
+            from pypads.utils.util import run_coroutine
+            out = run_coroutine(out)
+        return out
+
     def _handle_error(self, *args, ctx, _pypads_env, error, **kwargs):
         """
         Function to handle an error executing the logging functionality. In general this should add a failure tag and
@@ -148,6 +157,25 @@ class TrackedObject(ProvenanceMixin):
         from pypads.app.pypads import get_current_pads
         get_current_pads().api.log_mem_artifact(meta.path, val, meta=meta, write_format=meta.format)
 
+    @staticmethod
+    def _store_data_artifact(val, meta: ArtifactMetaModel):
+        """
+        Store logged data like inputs and outputs. Binary payloads are stored once in the blob store. The run only holds
+        a pointer artifact with the digest, which is also added to the meta information of the artifact.
+        :param val: Data to store
+        :param meta: Meta information of the artifact
+        :return:
+        """
+        from pypads.app.pypads import get_current_pads
+        from pypads.utils.blob_store import store_blob
+        meta.digest = store_blob(val, meta.format)
+        if meta.digest is None:
+            TrackedObject._store_artifact(val, meta)
+        else:
+            pads = get_current_pads()
+            pads.backend.log_mem_artifact(meta.digest, meta.copy(update={"format": WriteFormats.blob}))
+            pads.api.log_artifact_meta(meta.path, meta)
+
     @staticmethod
     def _store_tag(val, meta: TagMetaModel):
         from pypads.app.pypads import get_current_pads
@@ -223,15 +251,26 @@ class Logger(BaseDefensiveCallableMixin, IntermediateCallableMixin, DependencyMi
 
     @classmethod
     def build_output(cls, **kwargs):
-        schema_class = cls.output_schema_class()
+        return cls.output_holder_class()(**kwargs)
+
+    @classmethod
+    def output_holder_class(cls) -> Type[LoggerOutput]:
+        """
+        Get the output class holding the output schema of the logger. The class is created once per logger class.
+        :return:
+        """
+        holder_class = cls.__dict__.get("_output_holder_class")
+        if holder_class is None:
+            schema_class = cls.output_schema_class()
 
-        class OutputModelHolder(LoggerOutput):
+            class OutputModelHolder(LoggerOutput):
 
-            @classmethod
-            def get_model_cls(cls) -> Type[BaseModel]:
-                return schema_class
+                @classmethod
+                def get_model_cls(cls) -> Type[BaseModel]:
+                    return schema_class
 
-        return OutputModelHolder(**kwargs)
+            holder_class = cls._output_holder_class = OutputModelHolder
+        return holder_class
 
     @classmethod
     def output_schema_class(cls) -> Type[OutputModel]:
@@ -0,0 +1,168 @@
+import bisect
+import threading
+import time
+
+from pypads import logger
+from pypads.utils.logging_util import WriteFormats
+
+# Parameter of a logger or hook to aggregate the calls of the logger instead of storing each one of them
+AGGREGATE_PARAM = "_pypads_aggregate"
+
+# Upper bounds in seconds of the buckets of the latency histogram
+LATENCY_BUCKETS = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+
+# Run cache key of the collector
+STATISTICS_CACHE = "call_statistics"
+
+# Name of the summary artifact written per logger
+STATISTICS_ARTIFACT = "call_statistics"
+
+
+class TimeStatistics:
+    """
+    Total, min and max of a measured time.
+    """
+
+    def __init__(self):
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        if value is None:
+            return
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def to_dict(self):
+        return {"total": self.total, "min": self.min, "max": self.max}
+
+
+class CallStatistics:
+    """
+    Aggregated calls of a logger on a tracked function. Calls of multiple threads are added one after another.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.pre_time = TimeStatistics()
+        self.child_time = TimeStatistics()
+        self.post_time = TimeStatistics()
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._lock = threading.Lock()
+
+    def add(self, logger_call):
+        """
+        Add a logger call.
+        :param logger_call: InjectionLoggerCall holding the times of the call
+        :return:
+        """
+        with self._lock:
+            self.calls += 1
+            if logger_call.failed:
+                self.failures += 1
+            latency = 0.0
+            for statistics, value in [(self.pre_time, logger_call.pre_time),
+                                      (self.child_time, logger_call.child_time),
+                                      (self.post_time, logger_call.post_time)]:
+                statistics.add(value)
+                latency += value or 0.0
+            self.histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def to_dict(self):
+        with self._lock:
+            return {"calls": self.calls, "failures": self.failures, "pre_time": self.pre_time.to_dict(),
+                    "child_time": self.child_time.to_dict(), "post_time": self.post_time.to_dict(),
+                    "latency_histogram": list(self.histogram)}
+
+
+class CallStatisticsCollector:
+    """
+    Collector of the aggregated logger calls of a run. The statistics are flushed to one summary artifact per logger at
+    the end of the run and additionally every flush_interval seconds if given.
+    """
+
+    def __init__(self, flush_interval=None):
+        """
+        :param flush_interval: Seconds after which the statistics are flushed again. None to only flush at the end.
+        """
+        self._loggers = {}
+        self._flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, injection_logger, logger_call):
+        """
+        Add a call of a logger.
+        :param injection_logger: Logger which was called
+        :param logger_call: Call of the logger
+        :return:
+        """
+        call_id = logger_call.original_call.call_id
+        function = call_id.context.reference + "." + call_id.fn_name
+        key = (injection_logger.__class__.__name__, injection_logger._base_path())
+        functions = self._loggers.get(key)
+        if functions is None:
+            functions = self._loggers.setdefault(key, {})
+        statistics = functions.get(function)
+        if statistics is None:
+            # Concurrent first calls agree on the statistics stored first
+            statistics = functions.setdefault(function, CallStatistics())
+        statistics.add(logger_call)
+
+        if self._flush_interval is not None and time.monotonic() - self._last_flush > self._flush_interval:
+            with self._lock:
+                # Only one of the threads passing the interval at once flushes
+                due = time.monotonic() - self._last_flush > self._flush_interval
+                if due:
+                    self._last_flush = time.monotonic()
+            if due:
+                self.flush()
+
+    def summary(self):
+        """
+        Build the summaries of the loggers.
+        :return: Dict of logger names and base paths to summaries
+        """
+        return {key: {"latency_buckets": list(LATENCY_BUCKETS),
+                      "functions": {function: statistics.to_dict()
+                                    for function, statistics in list(functions.items())}}
+                for key, functions in list(self._loggers.items())}
+
+    def flush(self):
+        """
+        Write the summary artifact of each logger.
+        :return:
+        """
+        from pypads.app.pypads import get_current_pads
+        pads = get_current_pads()
+        self._last_flush = time.monotonic()
+        for (name, base_path), logger_summary in self.summary().items():
+            try:
+                pads.api.log_mem_artifact(STATISTICS_ARTIFACT, logger_summary, write_format=WriteFormats.json,
+                                          path=base_path)
+            except Exception as e:
+                logger.warning("Couldn't flush call statistics of " + name + ". " + str(e))
+
+
+def add_call_statistics(injection_logger, logger_call):
+    """
+    Aggregate a logger call into the statistics of the active run.
+    :param injection_logger: Logger which was called
+    :param logger_call: Call of the logger
+    :return:
+    """
+    from pypads.app.pypads import get_current_pads
+    pads = get_current_pads()
+    collector = pads.cache.run_get(STATISTICS_CACHE)
+    if collector is None:
+        collector = CallStatisticsCollector(flush_interval=pads.config.get("aggregate_flush_interval", None))
+        pads.cache.run_add(STATISTICS_CACHE, collector)
+
+        def flush_call_statistics(*args, collector=collector, **kwargs):
+            collector.flush()
+
+        pads.api.register_teardown_fn(STATISTICS_CACHE, flush_call_statistics)
+    collector.add(injection_logger, logger_call)
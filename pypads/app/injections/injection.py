@@ -1,5 +1,6 @@
 import traceback
 from abc import ABCMeta, abstractmethod
+from time import perf_counter
 from typing import Type
 
 from pydantic import BaseModel, HttpUrl
@@ -8,6 +9,9 @@ from pypads.app.env import InjectionLoggerEnv
 from pypads import logger
 from pypads.app.call import Call
 from pypads.app.injections.base_logger import LoggerCall, Logger, LoggerExecutor, OriginalExecutor
+from pypads.app.injections.call_statistics import AGGREGATE_PARAM, add_call_statistics
+from pypads.app.injections.overhead import overhead_budget
+from pypads.app.injections.streaming import STREAM_PARAM, stream_kind, tracked_stream, tracked_async_stream
 from pypads.app.misc.mixins import OrderMixin, NoCallAllowedError
 from pypads.model.models import InjectionLoggerCallModel, InjectionLoggerModel, MultiInjectionLoggerCallModel
 from pypads.utils.util import inheritors
@@ -33,6 +37,10 @@ class InjectionLogger(Logger, OrderMixin, metaclass=ABCMeta):
             self._pre = LoggerExecutor(fn=self.__pre__)
         if not hasattr(self, "_post"):
             self._post = LoggerExecutor(fn=self.__post__)
+        if not hasattr(self, "_item"):
+            self._item = LoggerExecutor(fn=self.__item__)
+        # Items of streams are only passed to loggers implementing __item__
+        self._receives_items = type(self).__item__ is not InjectionLogger.__item__
 
     @classmethod
     def get_model_cls(cls) -> Type[BaseModel]:
@@ -64,13 +72,162 @@ class InjectionLogger(Logger, OrderMixin, metaclass=ABCMeta):
         """
         pass
 
-    def __real_call__(self, ctx, *args, _pypads_env: InjectionLoggerEnv, **kwargs):
-        self.store_schema(self._base_path())
+    def __item__(self, ctx, *args, _logger_call, _pypads_pre_return, _pypads_item, _pypads_index, _pypads_item_time,
+                 _logger_output, _args, _kwargs, **kwargs):
+        """
+        The function to be called on each item of a stream returned by the log anchor. __post__ is called once the
+        stream is exhausted or closed and gets the StreamStatistics as **_pypads_result**.
+
+        :param _pypads_pre_return: the value returned by __pre__.
+        :param _pypads_item: the item produced by the stream.
+        :param _pypads_index: the index of the item.
+        :param _pypads_item_time: the time it took to produce the item.
+        """
+        pass
+
+    def _aggregates(self, _pypads_hook_params):
+        """
+        Check if the calls of the logger are aggregated into call statistics instead of storing each one of them. This
+        is activated by passing _pypads_aggregate=True to the logger or in the "with" section of a hook.
+        :param _pypads_hook_params: Parameters of the hook
+        :return:
+        """
+        return _pypads_hook_params.get(AGGREGATE_PARAM, self.static_parameters.get(AGGREGATE_PARAM, False))
+
+    def _parameters(self, _pypads_hook_params):
+        """
+        Get the parameters passed to the functions of the logger. Parameters of the hook overwrite the static
+        parameters of the logger. They are only merged into a new dict if both are given.
+        :param _pypads_hook_params: Parameters of the hook
+        :return:
+        """
+        static_parameters = self.static_parameters
+        if not _pypads_hook_params:
+            return static_parameters
+        if not static_parameters:
+            return _pypads_hook_params
+        return {**static_parameters, **_pypads_hook_params}
+
+    def _get_call(self, logging_env: InjectionLoggerEnv):
+        """
+        Get the logger call object of a call.
+        :param logging_env: Environment of the call
+        :return:
+        """
+        return InjectionLoggerCall(logging_env=logging_env, created_by=self.store_schema(self._base_path()))
+
+    def _get_output(self):
+        """
+        Get the output object of a call.
+        :return:
+        """
+        return self.build_output()
 
+    @staticmethod
+    def _add_time(logger_call, name, time):
+        """
+        Set a measured time of the call.
+        :param logger_call: Call of the logger
+        :param name: One of pre_time, child_time and post_time
+        :param time: Measured time
+        :return:
+        """
+        setattr(logger_call, name, time)
+
+    def _overhead_budget(self, _pypads_env: InjectionLoggerEnv):
+        """
+        Get the overhead budget of the logger on the called function if a budget is configured.
+        :param _pypads_env: Environment of the call
+        :return: OverheadBudget or None
+        """
+        budget = _pypads_env.pypads.config.overhead_budget
+        if budget is None:
+            return None
+        return overhead_budget(self, _pypads_env.call.call_id, budget)
+
+    def _finish_call(self, logger_call, output, _pypads_hook_params, budget=None):
+        """
+        Store the call and its output after the execution.
+        :param logger_call: Call of the logger
+        :param output: Output of the call
+        :param _pypads_hook_params: Parameters of the hook
+        :param budget: Overhead budget of the call
+        :return:
+        """
+        if self._aggregates(_pypads_hook_params) or (budget is not None and budget.aggregates):
+            add_call_statistics(self, logger_call)
+        else:
+            logger_call.output = output.store(self._base_path())
+            logger_call.store()
+
+    def _stream(self, ctx, stream, kind, creation_time, _pypads_env: InjectionLoggerEnv, logger_call, output,
+                _pre_result, args, kwargs, budget=None, start=None):
+        """
+        Proxy a stream returned by the log anchor. The call of the logger is finished when the stream ends.
+        :param stream: Returned stream
+        :param kind: Kind of the stream, "sync" or "async"
+        :param creation_time: Time the log anchor took to return the stream
+        :param budget: Overhead budget of the call
+        :param start: Start time of the call
+        :return: Proxy of the stream
+        """
         _pypads_hook_params = _pypads_env.parameter
+        parameters = self._parameters(_pypads_hook_params)
+        # Time the logger spent on the call before returning the stream and on its items. Time spent by the consumer
+        # in between items doesn't count as overhead.
+        logger_time = [perf_counter() - start if start is not None else creation_time]
+
+        def on_item(item, index, item_time):
+            if self._receives_items:
+                item_start = perf_counter()
+                self._item(ctx, _pypads_env=_pypads_env, _logger_output=output, _logger_call=logger_call,
+                           _pypads_pre_return=_pre_result, _pypads_item=item, _pypads_index=index,
+                           _pypads_item_time=item_time, _args=args, _kwargs=kwargs,
+                           **parameters)
+                logger_time[0] += perf_counter() - item_start
+
+        def on_end(statistics, error):
+            end_start = perf_counter()
+            try:
+                self._add_time(logger_call, "child_time", creation_time + statistics.total_time)
+                if error is not None:
+                    logger_call.failed = str(error)
+                    output.set_failure_state(error)
+                else:
+                    _post_result, post_time = self._post(ctx, _pypads_env=_pypads_env,
+                                                         _logger_output=output,
+                                                         _pypads_pre_return=_pre_result,
+                                                         _pypads_result=statistics,
+                                                         _logger_call=logger_call,
+                                                         _args=args,
+                                                         _kwargs=kwargs,
+                                                         **parameters)
+                    self._add_time(logger_call, "post_time", post_time)
+            finally:
+                for fn in self.cleanup_fns(logger_call):
+                    fn(self, logger_call)
+                self._finish_call(logger_call, output, _pypads_hook_params, budget)
+                if budget is not None:
+                    budget.observe(logger_time[0] + statistics.total_time + perf_counter() - end_start,
+                                   getattr(logger_call, "child_time", None))
+
+        if kind == "async":
+            return tracked_async_stream(stream, on_item, on_end)
+        return tracked_stream(stream, on_item, on_end)
 
-        logger_call = InjectionLoggerCall(logging_env=_pypads_env, created_by=self.store_schema())
-        output = self.build_output()
+    def __real_call__(self, ctx, *args, _pypads_env: InjectionLoggerEnv, **kwargs):
+        _pypads_hook_params = _pypads_env.parameter
+
+        budget = self._overhead_budget(_pypads_env)
+        if budget is not None and not budget.admit():
+            # Calls throttled by the overhead budget go straight to the next callback
+            return _pypads_env.callback(*args, **kwargs)
+        start = perf_counter()
+
+        logger_call = self._get_call(_pypads_env)
+        output = self._get_output()
+        parameters = self._parameters(_pypads_hook_params)
+        streaming = False
 
         try:
             # Trigger pre run functions
@@ -78,12 +235,19 @@ class InjectionLogger(Logger, OrderMixin, metaclass=ABCMeta):
                                               _logger_output=output,
                                               _logger_call=logger_call,
                                               _args=args,
-                                              _kwargs=kwargs, **{**self.static_parameters, **_pypads_hook_params})
-            logger_call.pre_time = pre_time
+                                              _kwargs=kwargs, **parameters)
+            self._add_time(logger_call, "pre_time", pre_time)
 
             # Trigger function itself
             _return, time = self.__call_wrapped__(ctx, _pypads_env=_pypads_env, _args=args, _kwargs=kwargs)
-            logger_call.child_time = time
+
+            # Returned streams are proxied and the call is finished with them
+            kind = stream_kind(_return, parameters.get(STREAM_PARAM))
+            if kind is not None:
+                streaming = True
+                return self._stream(ctx, _return, kind, time, _pypads_env, logger_call, output, _pre_result, args,
+                                    kwargs, budget=budget, start=start)
+            self._add_time(logger_call, "child_time", time)
 
             # Trigger post run functions
             _post_result, post_time = self._post(ctx, _pypads_env=_pypads_env,
@@ -92,8 +256,62 @@ class InjectionLogger(Logger, OrderMixin, metaclass=ABCMeta):
                                                  _pypads_result=_return,
                                                  _logger_call=logger_call,
                                                  _args=args,
-                                                 _kwargs=kwargs, **{**self.static_parameters, **_pypads_hook_params})
-            logger_call.post_time = post_time
+                                                 _kwargs=kwargs, **parameters)
+            self._add_time(logger_call, "post_time", post_time)
+        except Exception as e:
+            logger_call.failed = str(e)
+            output.set_failure_state(e)
+            raise e
+        finally:
+            if not streaming:
+                for fn in self.cleanup_fns(logger_call):
+                    fn(self, logger_call)
+                self._finish_call(logger_call, output, _pypads_hook_params, budget)
+                if budget is not None:
+                    budget.observe(perf_counter() - start, getattr(logger_call, "child_time", None))
+        return _return
+
+    async def __async_real_call__(self, ctx, *args, _pypads_env: InjectionLoggerEnv, **kwargs):
+        """
+        Call on a coroutine function. The wrapped coroutine is awaited in between __pre__ and __post__, which may be
+        coroutine functions themselves.
+        """
+        _pypads_hook_params = _pypads_env.parameter
+
+        budget = self._overhead_budget(_pypads_env)
+        if budget is not None and not budget.admit():
+            # Calls throttled by the overhead budget go straight to the next callback
+            return await _pypads_env.callback(*args, **kwargs)
+        start = perf_counter()
+
+        logger_call = self._get_call(_pypads_env)
+        output = self._get_output()
+        parameters = self._parameters(_pypads_hook_params)
+
+        try:
+            # Trigger pre run functions
+            _pre_result, pre_time = await self._pre.__acall__(ctx, _pypads_env=_pypads_env,
+                                                              _logger_output=output,
+                                                              _logger_call=logger_call,
+                                                              _args=args,
+                                                              _kwargs=kwargs,
+                                                              **parameters)
+            self._add_time(logger_call, "pre_time", pre_time)
+
+            # Trigger function itself
+            _return, time = await self.__acall_wrapped__(ctx, _pypads_env=_pypads_env, _args=args, _kwargs=kwargs)
+            self._add_time(logger_call, "child_time", time)
+
+            # Trigger post run functions
+            _post_result, post_time = await self._post.__acall__(ctx, _pypads_env=_pypads_env,
+                                                                 _logger_output=output,
+                                                                 _pypads_pre_return=_pre_result,
+                                                                 _pypads_result=_return,
+                                                                 _logger_call=logger_call,
+                                                                 _args=args,
+                                                                 _kwargs=kwargs,
+                                                                 **parameters)
+            self._add_time(logger_call, "post_time", post_time)
         except Exception as e:
             logger_call.failed = str(e)
             output.set_failure_state(e)
@@ -101,8 +319,9 @@ class InjectionLogger(Logger, OrderMixin, metaclass=ABCMeta):
         finally:
             for fn in self.cleanup_fns(logger_call):
                 fn(self, logger_call)
-            logger_call.output = output.store(self._base_path())
-            logger_call.store()
+            self._finish_call(logger_call, output, _pypads_hook_params, budget)
+            if budget is not None:
+                budget.observe(perf_counter() - start, getattr(logger_call, "child_time", None))
         return _return
 
     def __call_wrapped__(self, ctx, *args, _pypads_env: InjectionLoggerEnv, _args, _kwargs):
@@ -115,6 +334,15 @@ class InjectionLogger(Logger, OrderMixin, metaclass=ABCMeta):
         _return, time = OriginalExecutor(fn=_pypads_env.callback)(*_args, **_kwargs)
         return _return, time
 
+    async def __acall_wrapped__(self, ctx, *args, _pypads_env: InjectionLoggerEnv, _args, _kwargs):
+        """
+        The awaited call of a wrapped coroutine function. The time includes the awaiting of the coroutine.
+
+        :return: _pypads_result
+        """
+        _return, time = await OriginalExecutor(fn=_pypads_env.callback).__acall__(*_args, **_kwargs)
+        return _return, time
+
     def _handle_error(self, *args, ctx, _pypads_env, error, **kwargs):
         """
         Handle error for DefensiveCallableMixin
@@ -157,6 +385,22 @@ class InjectionLogger(Logger, OrderMixin, metaclass=ABCMeta):
                     _pypads_env.call.call_id.context.original_name(_pypads_env.callback)) + " on " + str(
                     _pypads_env.call.call_id.context) + ". Can't recover from " + str(error))
 
+    async def _handle_async_error(self, *args, ctx, _pypads_env, error, **kwargs):
+        """
+        Handle error of an awaited call for DefensiveCallableMixin
+        :param args:
+        :param ctx:
+        :param _pypads_env:
+        :param error:
+        :param kwargs:
+        :return:
+        """
+        if isinstance(error, NoCallAllowedError):
+            # Await next wrapped callback if no call was allowed due to the settings or environment
+            _return, _ = await self.__acall_wrapped__(ctx, _pypads_env=_pypads_env, _args=args, _kwargs=kwargs)
+            return _return
+        return await super()._handle_async_error(*args, ctx=ctx, _pypads_env=_pypads_env, error=error, **kwargs)
+
 
 class MultiInjectionLoggerCall(LoggerCall):
 
@@ -194,8 +438,7 @@ class MultiInjectionLogger(InjectionLogger):
             logger_call.add_call(logging_env.call)
             return logger_call
         else:
-            self.store_schema(self._base_path())
-            return MultiInjectionLoggerCall(logging_env=logging_env, created_by=self.store_schema())
+            return MultiInjectionLoggerCall(logging_env=logging_env, created_by=self.store_schema(self._base_path()))
 
     def _get_output(self, ):
         from pypads.app.pypads import get_current_pads
@@ -211,46 +454,15 @@ class MultiInjectionLogger(InjectionLogger):
     def store(pads, *args, **kwargs):
         pass
 
-    def __real_call__(self, ctx, *args, _pypads_env: InjectionLoggerEnv, **kwargs):
-        _pypads_hook_params = _pypads_env.parameter
-
-        logger_call = self._get_call(_pypads_env)
-        output = self._get_output()
-
-        try:
-            # Trigger pre run functions
-            _pre_result, pre_time = self._pre(ctx, _pypads_env=_pypads_env,
-                                              _logger_output=output,
-                                              _logger_call=logger_call,
-                                              _args=args,
-                                              _kwargs=kwargs, **{**self.static_parameters, **_pypads_hook_params})
-            logger_call.pre_time += pre_time
-
-            # Trigger function itself
-            _return, time = self.__call_wrapped__(ctx, _pypads_env=_pypads_env, _args=args, _kwargs=kwargs)
-            logger_call.child_time += time
+    @staticmethod
+    def _add_time(logger_call, name, time):
+        setattr(logger_call, name, getattr(logger_call, name) + time)
 
-            # Trigger post run functions
-            _post_result, post_time = self._post(ctx, _pypads_env=_pypads_env,
-                                                 _logger_output=output,
-                                                 _pypads_pre_return=_pre_result,
-                                                 _pypads_result=_return,
-                                                 _logger_call=logger_call,
-                                                 _args=args,
-                                                 _kwargs=kwargs, **{**self.static_parameters, **_pypads_hook_params})
-            logger_call.post_time += post_time
-        except Exception as e:
-            logger_call.failed = str(e)
-            output.set_failure_state(e)
-            raise e
-        finally:
-            for fn in self.cleanup_fns(logger_call):
-                fn(self, logger_call)
-            from pypads.app.pypads import get_current_pads
-            pads = get_current_pads()
-            pads.cache.run_add(id(self), {'call': logger_call, 'output': output, 'base_path': self._base_path()})
-            pads.api.register_teardown_fn('{}_clean_up'.format(self.__class__.__name__), self.store)
-        return _return
+    def _finish_call(self, logger_call, output, _pypads_hook_params, budget=None):
+        from pypads.app.pypads import get_current_pads
+        pads = get_current_pads()
+        pads.cache.run_add(id(self), {'call': logger_call, 'output': output, 'base_path': self._base_path()})
+        pads.api.register_teardown_fn('{}_clean_up'.format(self.__class__.__name__), self.store)
 
 
 def logging_functions():
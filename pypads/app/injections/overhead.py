@@ -0,0 +1,127 @@
+from pypads import logger
+
+# Weight of a new observation in the moving averages of the logger and function times
+BUDGET_ALPHA = 0.2
+
+# Observations needed after a decision before the budget is checked again
+BUDGET_MIN_CALLS = 20
+
+# Largest sampling interval before the calls of a logger are aggregated
+BUDGET_MAX_EVERY = 8
+
+# Run cache key of the budgets
+BUDGET_CACHE = "overhead_budgets"
+
+# Prefix of the tags holding the decisions
+BUDGET_TAG = "pypads.overhead"
+
+
+class OverheadBudget:
+    """
+    Overhead budget of a logger on a tracked function. The time the logger adds to a call is compared to the execution
+    time of the call by moving averages. If the ratio exceeds the budget the logger is progressively throttled: Its
+    calls are sampled with doubling intervals up to BUDGET_MAX_EVERY, then additionally aggregated into call statistics
+    and finally the logger is disabled on the function. Every decision is logged as tag.
+    """
+
+    def __init__(self, budget, logger_name, function_name):
+        """
+        :param budget: Allowed ratio of logger time to execution time
+        :param logger_name: Name of the logger
+        :param function_name: Name of the tracked function
+        """
+        self.budget = budget
+        self.logger_name = logger_name
+        self.function_name = function_name
+        self.every = 1
+        self.aggregates = False
+        self.disabled = False
+        self._calls = 0
+        self._observed = 0
+        self._overhead = None
+        self._child = None
+
+    def admit(self):
+        """
+        Check if the logger is executed on the current call.
+        :return:
+        """
+        if self.disabled:
+            return False
+        self._calls += 1
+        return self.every == 1 or self._calls % self.every == 0
+
+    def ratio(self):
+        """
+        Moving ratio of the time the logger adds per call to the execution time of the call. Sampled out calls don't
+        add any time.
+        :return:
+        """
+        if self._overhead is None:
+            return 0.0
+        if not self._child:
+            return float("inf") if self._overhead else 0.0
+        return self._overhead / self.every / self._child
+
+    def observe(self, total_time, child_time):
+        """
+        Add an executed call of the logger and throttle the logger if it exceeds the budget.
+        :param total_time: Time of the whole logger call
+        :param child_time: Execution time of the tracked function
+        :return:
+        """
+        child_time = child_time or 0.0
+        overhead = max(total_time - child_time, 0.0)
+        if self._overhead is None:
+            self._overhead, self._child = overhead, child_time
+        else:
+            self._overhead += BUDGET_ALPHA * (overhead - self._overhead)
+            self._child += BUDGET_ALPHA * (child_time - self._child)
+        self._observed += 1
+        if self._observed >= BUDGET_MIN_CALLS and self.ratio() > self.budget:
+            self._throttle()
+
+    def _throttle(self):
+        ratio = self.ratio()
+        self._observed = 0
+        if self.every < BUDGET_MAX_EVERY:
+            self.every *= 2
+            decision = "sample 1/" + str(self.every)
+        elif not self.aggregates:
+            self.aggregates = True
+            decision = "aggregate 1/" + str(self.every)
+        else:
+            self.disabled = True
+            decision = "disable"
+        message = decision + " (overhead ratio {:.3f} > budget {:.3f})".format(ratio, self.budget)
+        logger.info("Overhead budget of " + self.logger_name + " on " + self.function_name + ": " + message)
+        try:
+            from pypads.app.pypads import get_current_pads
+            get_current_pads().api.set_tag(self.tag_name(), message,
+                                           description="Throttling of a logger exceeding the overhead budget.")
+        except Exception as e:
+            logger.warning("Couldn't log overhead budget decision of " + self.logger_name + ". " + str(e))
+
+    def tag_name(self):
+        return ".".join([BUDGET_TAG, self.logger_name, self.function_name])
+
+
+def overhead_budget(injection_logger, call_id, budget):
+    """
+    Get the overhead budget of a logger on the function of a call in the active run.
+    :param injection_logger: Logger which is called
+    :param call_id: Id of the call
+    :param budget: Allowed ratio of logger time to execution time
+    :return: OverheadBudget
+    """
+    from pypads.app.pypads import get_current_pads
+    pads = get_current_pads()
+    budgets = pads.cache.run_get(BUDGET_CACHE)
+    if budgets is None:
+        budgets = pads.cache.run_cache().cache.setdefault(BUDGET_CACHE, {})
+    key = (id(injection_logger), call_id.function_id)
+    overhead = budgets.get(key)
+    if overhead is None:
+        overhead = budgets.setdefault(key, OverheadBudget(budget, injection_logger.__class__.__name__,
+                                                          call_id.context.reference + "." + call_id.fn_name))
+    return overhead
@@ -0,0 +1,179 @@
+import inspect
+import time
+
+from pypads.app.injections.call_statistics import TimeStatistics
+
+# Parameter of a logger or hook to set the streaming mode. None proxies returned generators, True any returned iterator
+# and False disables the streaming.
+STREAM_PARAM = "_pypads_stream"
+
+
+class StreamStatistics:
+    """
+    Number of items and time spent producing them of a stream returned by a tracked function.
+    """
+
+    def __init__(self):
+        self.items = 0
+        self.item_time = TimeStatistics()
+        self.finished = False
+
+    @property
+    def total_time(self):
+        return self.item_time.total
+
+    def add(self, item_time):
+        self.items += 1
+        self.item_time.add(item_time)
+
+    def to_dict(self):
+        return {"items": self.items, "item_time": self.item_time.to_dict(), "finished": self.finished}
+
+
+def stream_kind(result, mode=None):
+    """
+    Get the kind of stream returned by a tracked function.
+    :param result: Returned value
+    :param mode: Value of the streaming parameter
+    :return: "sync", "async" or None if the result isn't tracked as a stream
+    """
+    if mode is False:
+        return None
+    if inspect.isgenerator(result):
+        return "sync"
+    if inspect.isasyncgen(result):
+        return "async"
+    if mode is True and not isinstance(result, (str, bytes, dict, list, tuple, set)):
+        if hasattr(result, "__next__"):
+            return "sync"
+        if hasattr(result, "__anext__"):
+            return "async"
+    return None
+
+
+def tracked_stream(stream, on_item, on_end):
+    """
+    Proxy a returned iterator. Items are passed through one by one without buffering, the time of producing each of
+    them is measured. Values sent and exceptions thrown into the proxy are passed on to the stream if it supports it,
+    otherwise the stream is closed before the exception is raised. The proxy is started at once, closing it or
+    dropping it without iterating it ends the stream as well.
+    :param stream: Returned iterator
+    :param on_item: Function called with the item, its index and the time it took to produce it
+    :param on_end: Function called with the StreamStatistics and the error, if any, once the stream is exhausted,
+    closed or failed
+    :return: Generator proxying the stream
+    """
+    proxy = _tracked_stream(stream, on_item, on_end)
+    next(proxy)
+    return proxy
+
+
+def _tracked_stream(stream, on_item, on_end):
+    statistics = StreamStatistics()
+    iterator = iter(stream)
+    send = getattr(iterator, "send", None)
+    throw = getattr(iterator, "throw", None)
+    close = getattr(iterator, "close", None)
+    error = None
+    try:
+        item = None
+        while True:
+            value, thrown = None, None
+            # The first yield only starts the proxy, every following one passes on an item of the stream
+            try:
+                value = yield item
+            except GeneratorExit:
+                raise
+            except BaseException as e:
+                if throw is None:
+                    raise
+                # Let the stream handle the exception, it may produce a next item
+                thrown = e
+            start = time.perf_counter()
+            try:
+                if thrown is not None:
+                    item = throw(thrown)
+                else:
+                    item = next(iterator) if value is None or send is None else send(value)
+            except StopIteration as e:
+                statistics.finished = True
+                return e.value
+            item_time = time.perf_counter() - start
+            statistics.add(item_time)
+            on_item(item, statistics.items - 1, item_time)
+    except GeneratorExit:
+        if close is not None:
+            close()
+        raise
+    except BaseException as e:
+        if isinstance(e, Exception):
+            error = e
+        if close is not None:
+            close()
+        raise
+    finally:
+        on_end(statistics, error)
+
+
+def tracked_async_stream(stream, on_item, on_end):
+    """
+    Proxy a returned asynchronous iterator. See tracked_stream.
+    :param stream: Returned asynchronous iterator
+    :param on_item: Function called with the item, its index and the time it took to produce it
+    :param on_end: Function called with the StreamStatistics and the error, if any, once the stream is exhausted,
+    closed or failed
+    :return: Asynchronous generator proxying the stream
+    """
+    proxy = _tracked_async_stream(stream, on_item, on_end)
+    # Nothing is awaited before the first yield, the proxy is started without an event loop
+    try:
+        proxy.__anext__().send(None)
+    except StopIteration:
+        pass
+    return proxy
+
+
+async def _tracked_async_stream(stream, on_item, on_end):
+    statistics = StreamStatistics()
+    iterator = stream.__aiter__()
+    athrow = getattr(iterator, "athrow", None)
+    aclose = getattr(iterator, "aclose", None)
+    error = None
+    try:
+        item = None
+        while True:
+            thrown = None
+            # The first yield only starts the proxy, every following one passes on an item of the stream
+            try:
+                yield item
+            except GeneratorExit:
+                raise
+            except BaseException as e:
+                if athrow is None:
+                    raise
+                # Let the stream handle the exception, it may produce a next item
+                thrown = e
+            start = time.perf_counter()
+            try:
+                if thrown is not None:
+                    item = await athrow(thrown)
+                else:
+                    item = await iterator.__anext__()
+            except StopAsyncIteration:
+                statistics.finished = True
+                return
+            item_time = time.perf_counter() - start
+            statistics.add(item_time)
+            on_item(item, statistics.items - 1, item_time)
+    except GeneratorExit:
+        if aclose is not None:
+            await aclose()
+        raise
+    except BaseException as e:
+        if isinstance(e, Exception):
+            error = e
+        if aclose is not None:
+            await aclose()
+        raise
+    finally:
+        on_end(statistics, error)
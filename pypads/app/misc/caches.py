@@ -1,8 +1,7 @@
 import sys
 
-import mlflow
-
 from pypads import logger
+from pypads.utils.lazy_mlflow import mlflow
 
 
 class Cache:
@@ -99,6 +98,31 @@ class PypadsRunCache(Cache):
         pads.api.register_teardown_fn("cache_cleanup", cleanup_cache, order=sys.maxsize)
 
 
+class RunState:
+    """
+    State of a run which doesn't change while the run is active. This is held in memory to answer questions about the
+    run without a round trip to the backend.
+    """
+
+    def __init__(self, run_id, experiment_id=None, nested=False, intermediate=False, config=None):
+        """
+        :param run_id: Id of the run
+        :param experiment_id: Id of the experiment of the run
+        :param nested: Flag if the run is nested in another run
+        :param intermediate: Flag if the run is an intermediate run
+        :param config: Pypads config of the run
+        """
+        self.run_id = run_id
+        self.experiment_id = experiment_id
+        self.nested = nested
+        self.intermediate = intermediate
+        self.config = config
+
+    def __str__(self):
+        return "RunState[" + str(self.run_id) + ", nested=" + str(self.nested) + ", intermediate=" + str(
+            self.intermediate) + "]"
+
+
 class PypadsCache(Cache):
     """
     Class holding data populated by loggers, runners etc. which may be reused in other loggers, runners etc.
@@ -107,11 +131,13 @@ class PypadsCache(Cache):
     def __init__(self):
         super().__init__()
         self._run_caches = {}
+        self._run_states = {}
 
     def merge(self, other):
         super().merge(other)
         from pypads.utils.util import dict_merge_caches
         self._run_caches = dict_merge_caches(self.run_caches, other.run_caches)
+        self._run_states.update(other._run_states)
 
     @property
     def run_caches(self):
@@ -165,3 +191,32 @@ class PypadsCache(Cache):
     def run_delete(self, run_id=None):
         run_id = self.run_init(run_id)
         del self._run_caches[run_id]
+
+    def run_state_add(self, run_state: RunState):
+        """
+        Add the state of a run.
+        :param run_state: State of the run
+        :return:
+        """
+        self._run_states[run_state.run_id] = run_state
+
+    def run_state(self, run_id=None):
+        """
+        Get the state of a run.
+        :param run_id: Id of the run. The active run is used if None.
+        :return: RunState or None if the state of the run isn't known
+        """
+        if run_id is None:
+            run = mlflow.active_run()
+            if run is None:
+                return None
+            run_id = run.info.run_id
+        return self._run_states.get(run_id)
+
+    def run_state_remove(self, run_id):
+        """
+        Invalidate the state of a run.
+        :param run_id: Id of the run
+        :return:
+        """
+        self._run_states.pop(run_id, None)
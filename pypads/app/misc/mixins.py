@@ -1,3 +1,4 @@
+import inspect
 import traceback
 from abc import abstractmethod, ABCMeta
 from typing import List, Union, Tuple, Set
@@ -72,6 +73,22 @@ class CallableMixin(SuperStop):
     def __real_call__(self, *args, **kwargs):
         pass
 
+    async def __acall__(self, *args, **kwargs):
+        """
+        Awaitable counterpart of __call__ used on calls of coroutine functions.
+        """
+        return await self.__async_real_call__(*args, **kwargs)
+
+    async def __async_real_call__(self, *args, **kwargs):
+        """
+        Awaitable counterpart of __real_call__. By default the synchronous implementation is called and its result
+        awaited if needed.
+        """
+        out = self.__real_call__(*args, **kwargs)
+        if inspect.isawaitable(out):
+            out = await out
+        return out
+
 
 class DependencyMixin(CallableMixin):
     """
@@ -95,10 +112,11 @@ class DependencyMixin(CallableMixin):
 
     @staticmethod
     def _to_lib_selectors(dependencies: Set[Union[LibSelector, str, Tuple[str, str]]]) -> Set[LibSelector]:
+        from pypads.importext.package_metadata import package_metadata
         selectors = set()
         for d in dependencies:
-            selectors.add(LibSelector(name=d[0], constraint=d[1]) if isinstance(d, tuple) else LibSelector(
-                name=d) if not isinstance(d, LibSelector) else d)
+            selectors.add(package_metadata.lib_selector(d[0], d[1]) if isinstance(d, tuple) else
+                          package_metadata.lib_selector(d) if not isinstance(d, LibSelector) else d)
         return selectors
 
     def _check_dependencies(self):
@@ -123,6 +141,10 @@ class DependencyMixin(CallableMixin):
         self._check_dependencies()
         return super().__call__(*args, **kwargs)
 
+    async def __acall__(self, *args, **kwargs):
+        self._check_dependencies()
+        return await super().__acall__(*args, **kwargs)
+
 
 class IntermediateCallableMixin(CallableMixin):
     """
@@ -137,11 +159,22 @@ class IntermediateCallableMixin(CallableMixin):
         super().__init__(*args, **kwargs)
 
     def __call__(self, *args, **kwargs):
+        self._check_allowed()
+        return super().__call__(*args, **kwargs)
+
+    async def __acall__(self, *args, **kwargs):
+        self._check_allowed()
+        return await super().__acall__(*args, **kwargs)
+
+    def _check_allowed(self):
+        """
+        Raise error if the call isn't allowed in the current run.
+        """
         from pypads.app.pypads import is_nested_run
         if self._nested or not is_nested_run():
             from pypads.app.pypads import is_intermediate_run
             if self._intermediate or not is_intermediate_run():
-                return super().__call__(*args, **kwargs)
+                return
         raise NoCallAllowedError("Call wasn't allowed by intermediate / nested settings of the current run.")
 
     @property
@@ -169,6 +202,12 @@ class TimedCallableMixin(CallableMixin):
         _return, time = timed(lambda: c(*args, **kwargs))
         return _return, time
 
+    async def __acall__(self, *args, **kwargs):
+        c = super().__acall__
+        from pypads.injections.analysis.time_keeper import async_timed
+        _return, time = await async_timed(lambda: c(*args, **kwargs))
+        return _return, time
+
 
 class DefensiveCallableMixin(CallableMixin):
     __metaclass__ = ABCMeta
@@ -191,10 +230,30 @@ class DefensiveCallableMixin(CallableMixin):
             logger.debug(traceback.format_exc())
             return self._handle_error(*args, ctx=ctx, _pypads_env=_pypads_env, error=e, **kwargs)
 
+    async def __acall__(self, ctx, *args, _pypads_env=None, **kwargs):
+        try:
+            return await super().__acall__(ctx, *args, _pypads_env=_pypads_env, **kwargs)
+        except KeyboardInterrupt:
+            return await self._handle_async_error(*args, ctx=ctx, _pypads_env=_pypads_env,
+                                                  error=Exception("KeyboardInterrupt"), **kwargs)
+        except Exception as e:
+            import traceback
+            logger.debug(traceback.format_exc())
+            return await self._handle_async_error(*args, ctx=ctx, _pypads_env=_pypads_env, error=e, **kwargs)
+
     @abstractmethod
     def _handle_error(self, *args, ctx, _pypads_env, error, **kwargs):
         raise NotImplementedError()
 
+    async def _handle_async_error(self, *args, ctx, _pypads_env, error, **kwargs):
+        """
+        Handle an error of an awaited call. Results of _handle_error are awaited if needed.
+        """
+        out = self._handle_error(*args, ctx=ctx, _pypads_env=_pypads_env, error=error, **kwargs)
+        if inspect.isawaitable(out):
+            out = await out
+        return out
+
 
 class ConfigurableCallableMixin(CallableMixin):
     __metaclass__ = ABCMeta
@@ -254,6 +313,16 @@ class FunctionHolderMixin(CallableMixin):
     def __real_call__(self, *args, **kwargs):
         return self._fn(*args, **kwargs)
 
+    async def __async_real_call__(self, *args, **kwargs):
+        out = self._fn(*args, **kwargs)
+        if inspect.isawaitable(out):
+            out = await out
+        return out
+
+
+# Validated name and version of the library descriptors by library name and version
+_library_descriptors = {}
+
 
 class ProvenanceMixin(ModelObject, metaclass=ABCMeta):
     """
@@ -276,13 +345,20 @@ class ProvenanceMixin(ModelObject, metaclass=ABCMeta):
         :return:
         """
         # TODO extract reference to self package
-        try:
-            name = self.__module__.split(".")[0]
-            from pypads.utils.util import find_package_version
-            version = find_package_version(name)
-            return LibraryModel(name=name, version=version, extracted=True)
-        except Exception:
-            return LibraryModel(name="__unkown__", version="0.0", extracted=True)
+        name = self.__module__.split(".")[0]
+        from pypads.importext.package_metadata import package_metadata
+        version = package_metadata.version(name)
+
+        # The name and version are validated once per library version. Each object gets its own descriptor, which can
+        # be changed without affecting other objects.
+        fields = _library_descriptors.get((name, version))
+        if fields is None:
+            try:
+                descriptor = LibraryModel(name=name, version=version, extracted=True)
+            except Exception:
+                descriptor = LibraryModel(name="__unkown__", version="0.0", extracted=True)
+            fields = _library_descriptors[(name, version)] = (descriptor.name, descriptor.version)
+        return LibraryModel.construct(name=fields[0], version=fields[1], extracted=True)
 
 
 class BaseDefensiveCallableMixin(DefensiveCallableMixin):
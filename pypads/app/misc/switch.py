@@ -0,0 +1,56 @@
+import threading
+from contextlib import contextmanager
+
+
+class TrackingSwitch:
+    """
+    Process wide switch of the tracking. Wrapped functions only check the enabled attribute of the switch before
+    calling their original function, so switched off tracking doesn't add any further overhead.
+    """
+    __slots__ = ("enabled", "_on", "_pauses", "_lock")
+
+    def __init__(self):
+        self.enabled = True
+        self._on = True
+        self._pauses = 0
+        self._lock = threading.Lock()
+
+    def _update(self):
+        self.enabled = self._on and self._pauses == 0
+
+    def enable(self):
+        """
+        Switch on the tracking. Tracking stays off until all pauses ended.
+        :return:
+        """
+        with self._lock:
+            self._on = True
+            self._update()
+
+    def disable(self):
+        """
+        Switch off the tracking.
+        :return:
+        """
+        with self._lock:
+            self._on = False
+            self._update()
+
+    @contextmanager
+    def paused(self):
+        """
+        Pause the tracking in the with block. Pauses can be nested.
+        :return:
+        """
+        with self._lock:
+            self._pauses += 1
+            self._update()
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._pauses -= 1
+                self._update()
+
+
+tracking = TrackingSwitch()
@@ -0,0 +1,156 @@
+import hashlib
+import importlib
+import json
+import os
+import sys
+
+from pypads import logger
+
+# Entry point group under which plugins register themselves. The entry point references either the plugin module
+# providing an activate function or the activate function itself.
+ENTRY_POINT_GROUP = "pypads.plugins"
+
+# Prefix of plugin modules which don't register an entry point
+LEGACY_PREFIX = "pypads_"
+
+# Bump this if the structure of the plugin index changes.
+INDEX_FORMAT = 1
+
+
+def _metadata():
+    try:
+        import importlib.metadata as metadata
+    except ImportError:
+        try:
+            import importlib_metadata as metadata
+        except ImportError:
+            return None
+    return metadata
+
+
+def _environment_key():
+    """
+    Build a key identifying the installed distributions. Installing or removing a distribution changes the
+    modification time of the folder it is installed to.
+    :return: Hex digest identifying the environment
+    """
+    digest = hashlib.sha256()
+    for part in [str(INDEX_FORMAT), sys.executable] + list(sys.path):
+        digest.update(part.encode("utf-8"))
+        try:
+            digest.update(str(os.stat(part or ".").st_mtime_ns).encode("utf-8"))
+        except OSError:
+            pass
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def scan_plugins():
+    """
+    Find installed plugins. Plugins are registered in the "pypads.plugins" entry point group. Distributions providing
+    top level modules prefixed with "pypads_" are found as well.
+    :return: Dict of plugin names to entry point values
+    """
+    metadata = _metadata()
+    if metadata is None:
+        import pkgutil
+        return {name: name for _, name, _ in pkgutil.iter_modules() if name.startswith(LEGACY_PREFIX)}
+
+    plugins = {}
+    legacy = set()
+    for dist in metadata.distributions():
+        try:
+            for entry_point in dist.entry_points:
+                if entry_point.group == ENTRY_POINT_GROUP:
+                    plugins[entry_point.name] = entry_point.value
+            top_level = dist.read_text("top_level.txt")
+            names = top_level.split() if top_level else [
+                str(dist.metadata["Name"] or "").lower().replace("-", "_").replace(".", "_")]
+            legacy.update(name for name in names if name.startswith(LEGACY_PREFIX))
+        except Exception as e:
+            logger.debug("Couldn't read metadata of distribution " + str(dist) + ". " + str(e))
+
+    # Plugin modules registering an entry point are only activated via their entry point
+    registered = {value.partition(":")[0].strip() for value in plugins.values()}
+    for name in sorted(legacy - registered):
+        plugins.setdefault(name, name)
+    return plugins
+
+
+class PluginIndex:
+    """
+    Index of the installed plugins. Reading the metadata of all installed distributions is expensive in big
+    environments, therefore the found plugins are stored in the pypads folder until the environment changes.
+    """
+
+    def __init__(self, folder):
+        """
+        :param folder: Pypads folder in which the index should be placed.
+        """
+        self._path = os.path.join(folder, "cache", "plugins.json")
+
+    @property
+    def path(self):
+        return self._path
+
+    def plugins(self):
+        """
+        Get the installed plugins. The index is rebuilt if the environment changed.
+        :return: Dict of plugin names to entry point values
+        """
+        key = _environment_key()
+        if os.path.exists(self._path):
+            try:
+                with open(self._path, "r") as fd:
+                    index = json.load(fd)
+                if index.get("key") == key:
+                    return index["plugins"]
+            except Exception as e:
+                logger.warning("Couldn't read plugin index " + self._path + ". " + str(e))
+
+        plugins = scan_plugins()
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            tmp_path = self._path + "." + str(os.getpid()) + ".tmp"
+            with open(tmp_path, "w") as fd:
+                json.dump({"key": key, "plugins": plugins}, fd)
+            os.replace(tmp_path, self._path)
+        except Exception as e:
+            logger.warning("Couldn't store plugin index to " + self._path + ". " + str(e))
+        return plugins
+
+
+def load_plugin(value):
+    """
+    Load the activate function of a plugin.
+    :param value: Entry point value in the form "module" or "module:function"
+    :return: Activate function
+    """
+    module_name, _, attr = value.partition(":")
+    module = importlib.import_module(module_name.strip())
+    if attr:
+        fn = module
+        for part in attr.strip().split("."):
+            fn = getattr(fn, part)
+        return fn
+    return module.activate
+
+
+def activate_plugins(folder, disable_plugins=None):
+    """
+    Activate all installed plugins which are not disabled.
+    :param folder: Pypads folder holding the plugin index
+    :param disable_plugins: Names of plugins or plugin modules which should not be activated
+    :return: Names of the activated plugins
+    """
+    disable_plugins = set(disable_plugins or [])
+    activated = []
+    for name, value in PluginIndex(folder).plugins().items():
+        if name in disable_plugins or value.partition(":")[0].strip() in disable_plugins:
+            continue
+        try:
+            load_plugin(value)()
+            activated.append(name)
+        except Exception as e:
+            logger.warning("Couldn't activate plugin " + name + ". " + str(e))
+    return activated
@@ -1,17 +1,14 @@
 import ast
 from typing import Union
 
-import mlflow
 
 from pypads import logger
 from pypads.app.base import PyPads, CONFIG_NAME
+from pypads.app.config import PyPadsConfig
+from pypads.utils.lazy_mlflow import mlflow
 
-# Cache configs for runs. Each run could is for now static in it's config.
-configs = {}
 current_pads = None
 
-# !--- Clean the config cache after run ---
-
 
 def set_current_pads(pads: Union[None, PyPads]):
     global current_pads
@@ -45,6 +42,11 @@ def is_nested_run():
     :return:
     """
     pads = get_current_pads()
+    run_state = pads.cache.run_state()
+    if run_state is not None:
+        return run_state.nested
+
+    # The run wasn't started by pypads
     tags = pads.mlf.get_run(pads.api.active_run().info.run_id).data.tags
     return "mlflow.parentRunId" in tags
 
@@ -63,14 +65,14 @@ def get_current_config(default=None):
     Get configuration defined in the current mlflow run
     :return:
     """
-    global configs
     active_run = mlflow.active_run()
-    if active_run in configs.keys():
-        return configs[active_run]
     if not active_run:
         return default
+    if current_pads:
+        return current_pads.config
+
+    # Read the persisted config if pypads isn't initialized
     run = mlflow.get_run(active_run.info.run_id)
     if CONFIG_NAME in run.data.tags:
-        configs[active_run] = ast.literal_eval(run.data.tags[CONFIG_NAME])
-        return configs[active_run]
+        return PyPadsConfig(ast.literal_eval(run.data.tags[CONFIG_NAME]))
     return default
@@ -39,6 +39,14 @@ class Anchor:
     def __str__(self):
         return self._name
 
+    def __reduce__(self):
+        # Unpickled anchors have to resolve to the registered instance
+        return _restore_anchor, (self._name, self._description)
+
+
+def _restore_anchor(name, description):
+    return get_anchor(name) or Anchor(name, description)
+
 
 def init_anchors():
     if not all([a.name in anchors for a in DEFAULT_ANCHORS]):
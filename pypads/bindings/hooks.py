@@ -1,9 +1,11 @@
 from typing import Iterable, Set
 
 from pypads.app.misc.mixins import OrderMixin, DEFAULT_ORDER
+from pypads.bindings.sampling import validate_sampling, make_sampler, SAMPLING_ARTIFACT
 from pypads.utils.logging_util import WriteFormats
 
-# Maps hooks to events
+# Maps hooks to events. An event can be sampled on frequently called functions by adding a "sampling" entry like
+# {"every": 100}, {"probability": 0.1}, {"rate": 5, "burst": 10} or {"first": 10, "backoff": 2}.
 
 DEFAULT_HOOK_MAPPING = {
     "init": {"on": ["pypads_init"]},
@@ -54,10 +56,11 @@ class Hook:
 
 
 class HookEventConfig(OrderMixin):
-    def __init__(self, hook, event_name, parameters=None, *args, **kwargs):
+    def __init__(self, hook, event_name, parameters=None, *args, sampling=None, **kwargs):
         self._hook = hook
         self._event_name = event_name
         self._parameters = parameters
+        self._sampling = sampling
         super().__init__(*args, **kwargs)
 
     @property
@@ -72,6 +75,10 @@ class HookEventConfig(OrderMixin):
     def parameters(self):
         return self._parameters
 
+    @property
+    def sampling(self):
+        return self._sampling
+
 
 class HookRegistry:
     """
@@ -81,12 +88,45 @@ class HookRegistry:
     def __init__(self, pypads):
         self._pypads = pypads
         self._hook_event_mapping = {}
+        # Samplers by tracked function, hook and event. Wrapping a function again reuses its samplers.
+        self._samplers = {}
+
+    @property
+    def samplers(self):
+        return list(self._samplers.values())
 
-    def add_reference(self, event_name: str, *hook_names: str, order=DEFAULT_ORDER, parameters=None):
+    def add_reference(self, event_name: str, *hook_names: str, order=DEFAULT_ORDER, parameters=None, sampling=None):
+        if sampling is not None:
+            validate_sampling(sampling)
+            self._register_sampling_report()
         for hook_name in hook_names:
             if hook_name not in self._hook_event_mapping:
                 self._hook_event_mapping[hook_name] = set()
-            self._hook_event_mapping[hook_name].add(HookEventConfig(hook_name, event_name, parameters, order=order))
+            self._hook_event_mapping[hook_name].add(
+                HookEventConfig(hook_name, event_name, parameters, order=order, sampling=sampling))
+
+    def _register_sampling_report(self):
+        """
+        Log the sampling decisions on the end of each run. The counts are reset on the start of a run.
+        :return:
+        """
+        registry = self
+
+        def sampling_report(*args, **kwargs):
+            from pypads.app.pypads import get_current_pads
+            get_current_pads().api.log_mem_artifact(SAMPLING_ARTIFACT,
+                                                    [sampler.report() for sampler in registry.samplers],
+                                                    write_format=WriteFormats.json)
+
+        def sampling_reset(*args, **kwargs):
+            from pypads.app.pypads import get_current_pads
+            for sampler in registry.samplers:
+                sampler.reset()
+            get_current_pads().api.register_teardown_fn("sampling_report", sampling_report, nested=False,
+                                                        intermediate=False)
+
+        self._pypads.api.register_setup_fn("sampling_reset", "Function resetting the sampling counts of events.",
+                                           sampling_reset, nested=False, intermediate=False)
 
     def get_configs_for_hook(self, hook: Hook) -> Set[HookEventConfig]:
         if hook.anchor.name not in self._hook_event_mapping:
@@ -94,7 +134,13 @@ class HookRegistry:
         else:
             return self._hook_event_mapping[hook.anchor.name]
 
-    def get_logging_functions(self, *hooks: Hook):
+    def get_logging_functions(self, *hooks: Hook, target=None):
+        """
+        Get the logging functions to call for given hooks.
+        :param hooks: Hooks of a tracked function
+        :param target: Name of the tracked function
+        :return: List of (logging function, parameters, sampler or None)
+        """
         configs = []
         for hook in hooks:
             configs = configs + [(hook, c) for c in list(self.get_configs_for_hook(hook))]
@@ -102,12 +148,21 @@ class HookRegistry:
 
         fns = []
         for hook, c in configs:
-            found_fns = [(f, c.parameters) for f in
+            sampler = self._sampler(c, target)
+            found_fns = [(f, c.parameters, sampler) for f in
                          self._pypads.function_registry.get_functions(c.event_name, hook.library)]
             found_fns.sort(key=lambda e: -e[0].order)
             fns = fns + found_fns
         return fns
 
+    def _sampler(self, config: HookEventConfig, target):
+        if config.sampling is None:
+            return None
+        key = (target, config.anchor, config.event_name)
+        if key not in self._samplers:
+            self._samplers[key] = make_sampler(config.sampling, config.event_name, target=target)
+        return self._samplers[key]
+
     @staticmethod
     def from_dict(pypads, hook_mapping):
         """
@@ -125,8 +180,9 @@ class HookRegistry:
             parameters = value["with"] if "with" in value else {}
             hook_names = value["on"]
             order = value["order"] if "order" in value else DEFAULT_ORDER
+            sampling = value["sampling"] if "sampling" in value else None
             if isinstance(hook_names, Iterable):
-                registry.add_reference(key, *hook_names, order=order, parameters=parameters)
+                registry.add_reference(key, *hook_names, order=order, parameters=parameters, sampling=sampling)
             else:
-                registry.add_reference(key, hook_names, order=order, parameters=parameters)
+                registry.add_reference(key, hook_names, order=order, parameters=parameters, sampling=sampling)
         return registry
@@ -0,0 +1,200 @@
+import random
+import threading
+import time
+from abc import abstractmethod, ABCMeta
+
+# Name of the artifact holding the sampling decisions of a run
+SAMPLING_ARTIFACT = "sampling"
+
+
+class Sampler:
+    """
+    Sampling policy of an event on a tracked function. Calls which are not sampled skip the event. The number of calls and
+    sampled calls are counted to allow for reweighting the logged data. Calls of multiple threads are decided one
+    after another.
+    """
+    __metaclass__ = ABCMeta
+
+    def __init__(self, event_name, target=None):
+        """
+        :param event_name: Name of the sampled event
+        :param target: Name of the tracked function
+        """
+        self.event_name = event_name
+        self.target = target
+        self.calls = 0
+        self.sampled = 0
+        self._lock = threading.Lock()
+
+    def sample(self):
+        """
+        Decide if the current call should be logged.
+        :return: True if the call is sampled
+        """
+        with self._lock:
+            self.calls += 1
+            if self._decide():
+                self.sampled += 1
+                return True
+            return False
+
+    @abstractmethod
+    def _decide(self):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def policy(self):
+        """
+        Description of the sampling policy.
+        :return: Dict of the policy parameters
+        """
+        raise NotImplementedError()
+
+    def reset(self):
+        with self._lock:
+            self._reset()
+
+    def _reset(self):
+        self.calls = 0
+        self.sampled = 0
+
+    def report(self):
+        """
+        Report of the sampling decisions.
+        :return: Dict holding the policy and counts
+        """
+        with self._lock:
+            calls, sampled = self.calls, self.sampled
+        return {"function": self.target, "event": self.event_name, "policy": self.policy(), "calls": calls,
+                "sampled": sampled, "skipped": calls - sampled, "weight": calls / sampled if sampled else None}
+
+
+class EveryNthSampler(Sampler):
+    """
+    Sample every nth call starting with the first one.
+    """
+
+    def __init__(self, *args, every, **kwargs):
+        super().__init__(*args, **kwargs)
+        if every < 1:
+            raise ValueError("Sampling every " + str(every) + "th call is not possible.")
+        self._every = every
+
+    def _decide(self):
+        return (self.calls - 1) % self._every == 0
+
+    def policy(self):
+        return {"every": self._every}
+
+
+class ProbabilisticSampler(Sampler):
+    """
+    Sample each call with the given probability.
+    """
+
+    def __init__(self, *args, probability, seed=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not 0 <= probability <= 1:
+            raise ValueError("Sampling probability " + str(probability) + " is not in [0, 1].")
+        self._probability = probability
+        self._random = random.Random(seed)
+
+    def _decide(self):
+        return self._random.random() < self._probability
+
+    def policy(self):
+        return {"probability": self._probability}
+
+
+class TokenBucketSampler(Sampler):
+    """
+    Sample at most rate calls per second. Up to burst calls can be sampled at once.
+    """
+
+    def __init__(self, *args, rate, burst=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if rate <= 0:
+            raise ValueError("Sampling rate " + str(rate) + " has to be positive.")
+        self._rate = rate
+        self._burst = burst or max(1, rate)
+        self._tokens = self._burst
+        self._last = time.monotonic()
+
+    def _decide(self):
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._last) * self._rate)
+        self._last = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def policy(self):
+        return {"rate": self._rate, "burst": self._burst}
+
+
+class BackoffSampler(Sampler):
+    """
+    Sample the first calls and afterwards only calls with an exponentially growing gap.
+    """
+
+    def __init__(self, *args, first, backoff=2, **kwargs):
+        super().__init__(*args, **kwargs)
+        if backoff <= 1:
+            raise ValueError("Sampling backoff " + str(backoff) + " has to be greater than 1.")
+        self._first = first
+        self._backoff = backoff
+        self._next = first + 1
+        self._gap = 1
+
+    def _decide(self):
+        if self.calls <= self._first:
+            return True
+        if self.calls >= self._next:
+            self._next = self.calls + self._gap
+            self._gap *= self._backoff
+            return True
+        return False
+
+    def _reset(self):
+        super()._reset()
+        self._next = self._first + 1
+        self._gap = 1
+
+    def policy(self):
+        return {"first": self._first, "backoff": self._backoff}
+
+
+# Keys of the sampling configuration selecting the policy
+sampling_policies = {
+    "every": EveryNthSampler,
+    "probability": ProbabilisticSampler,
+    "rate": TokenBucketSampler,
+    "first": BackoffSampler
+}
+
+
+def validate_sampling(sampling):
+    """
+    Check a sampling configuration of a hook mapping entry. A configuration holds exactly one of the keys "every",
+    "probability", "rate" and "first" with additional parameters of the selected policy.
+    :param sampling: Dict like {"every": 100}, {"probability": 0.1}, {"rate": 5, "burst": 10} or {"first": 10,
+    "backoff": 2}
+    :return: Sampler class of the configuration
+    """
+    policies = [key for key in sampling.keys() if key in sampling_policies]
+    if len(policies) != 1:
+        raise ValueError("Sampling configuration " + str(sampling) + " has to define exactly one of " + ", ".join(
+            sampling_policies.keys()) + ".")
+    return sampling_policies[policies[0]]
+
+
+def make_sampler(sampling, event_name, target=None):
+    """
+    Build a sampler from a sampling configuration.
+    :param sampling: Sampling configuration. See validate_sampling.
+    :param event_name: Name of the sampled event
+    :param target: Name of the tracked function
+    :return: Sampler
+    """
+    return validate_sampling(sampling)(event_name, target=target, **sampling)
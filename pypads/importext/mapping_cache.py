@@ -0,0 +1,139 @@
+import hashlib
+import os
+import pickle
+from os.path import expanduser
+
+from pypads import logger
+from pypads.importext.mappings import MappingFile, default_mapping_file_paths
+
+# Bump this if the pickled structure of mapping collections changes.
+CACHE_FORMAT = 2
+
+
+class MappingCache:
+    """
+    Cache holding compiled mapping files as pickles. Parsing the yaml of a mapping file and building the mapping trie is
+    expensive. This cache stores the built MappingCollection keyed by the path, mtime and content hash of the file.
+    """
+
+    def __init__(self, folder):
+        """
+        :param folder: Pypads folder in which the cache should be placed.
+        """
+        self._folder = os.path.join(folder, "cache", "mappings")
+
+    @property
+    def folder(self):
+        return self._folder
+
+    @staticmethod
+    def key(path, content):
+        """
+        Build the cache key of a mapping file.
+        :param path: Path to the mapping file
+        :param content: Binary content of the mapping file
+        :return: Hex digest identifying the compiled mapping
+        """
+        from pypads import __version__
+        digest = hashlib.sha256()
+        for part in (str(CACHE_FORMAT), __version__, os.path.abspath(path), str(os.stat(path).st_mtime_ns),
+                     hashlib.sha256(content).hexdigest()):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _cache_path(self, path, key):
+        return os.path.join(self._folder, "{}_{}.pickle".format(os.path.basename(path), key))
+
+    def load(self, path):
+        """
+        Load the mapping file at given path. The compiled version is used if existing, otherwise the file is parsed and
+        the result is stored into the cache.
+        :param path: Path to the mapping file.
+        :return: MappingFile
+        """
+        with open(path, "rb") as f:
+            content = f.read()
+        cache_path = self._cache_path(path, self.key(path, content))
+
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, "rb") as fd:
+                    return pickle.load(fd)
+            except Exception as e:
+                logger.warning("Couldn't load compiled mapping " + cache_path + ". Parsing " + path + " instead. " + str(
+                    e))
+
+        mapping = MappingFile(path)
+        self.store(cache_path, mapping)
+        return mapping
+
+    def store(self, cache_path, mapping):
+        """
+        Write a compiled mapping to the cache. The file is written to a temporary path first to not expose partially
+        written files to concurrently starting processes.
+        :param cache_path: Path of the cache entry.
+        :param mapping: Mapping to compile.
+        :return:
+        """
+        try:
+            if not os.path.isdir(self._folder):
+                os.makedirs(self._folder, exist_ok=True)
+            tmp_path = cache_path + "." + str(os.getpid()) + ".tmp"
+            with open(tmp_path, "wb") as fd:
+                pickle.dump(mapping, fd, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning("Couldn't store compiled mapping to " + cache_path + ". " + str(e))
+
+    def prebuild(self, *paths):
+        """
+        Compile given mapping files into the cache. If no paths are given the mapping files delivered with pypads are
+        compiled. This can be used to warm the cache for deployment images.
+        :param paths: Paths to mapping files.
+        :return: Paths of the compiled files
+        """
+        paths = paths or default_mapping_file_paths
+        compiled = []
+        for path in paths:
+            with open(path, "rb") as f:
+                content = f.read()
+            cache_path = self._cache_path(path, self.key(path, content))
+            self.store(cache_path, MappingFile(path))
+            compiled.append(cache_path)
+        return compiled
+
+    def clear(self):
+        """
+        Remove all compiled mappings.
+        :return:
+        """
+        if os.path.isdir(self._folder):
+            import shutil
+            shutil.rmtree(self._folder)
+
+
+def main(argv=None):
+    """
+    Command line entry to prebuild the mapping cache.
+    :param argv: Command line arguments
+    :return:
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description="Compile pypads mapping files into the mapping cache.")
+    parser.add_argument("paths", nargs="*", help="Mapping files to compile. Defaults to the mappings shipped with "
+                                                 "pypads.")
+    parser.add_argument("--folder", default=os.path.join(expanduser("~"), ".pypads"),
+                        help="Pypads folder holding the cache.")
+    parser.add_argument("--clear", action="store_true", help="Remove existing compiled mappings first.")
+    args = parser.parse_args(argv)
+
+    cache = MappingCache(args.folder)
+    if args.clear:
+        cache.clear()
+    for compiled in cache.prebuild(*args.paths):
+        print(compiled)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import glob
 import os
+import re
 from typing import List, Set, Tuple, Generator, Iterable
 
 import yaml
@@ -8,9 +9,9 @@ from pypads import logger
 from pypads.bindings.anchors import Anchor, get_anchor
 from pypads.bindings.hooks import Hook
 from pypads.importext.package_path import RegexMatcher, PackagePath, PackagePathMatcher, \
-    SerializableMatcher, Package
+    SerializableMatcher, Package, StaticMatcher, PackagePathSegment
 from pypads.importext.versioning import LibSelector
-from pypads.utils.util import find_package_version
+from pypads.importext.package_metadata import package_metadata
 
 default_mapping_file_paths = []
 default_mapping_file_paths.extend(glob.glob(
@@ -102,7 +103,101 @@ class Mapping:
         return hash((self.reference, "|".join([str(h) for h in self.hooks]), str(self.values)))
 
 
+class CompiledMappingNode:
+    """
+    Node of the compiled lookup structure of a MappingCollection. Static segments are resolved by a hash lookup while
+    all regex segments of the node are merged into a single alternation of named groups.
+    """
+    __slots__ = ("static", "matchers", "alternation", "mappings", "_subtree")
+
+    def __init__(self, path_map):
+        self.static = {}
+        self.matchers = []
+        self.mappings = ()
+        self._subtree = None
+        for k, v in path_map.items():
+            if isinstance(k, str) and ":mapping" == k:
+                self.mappings = tuple(v)
+            elif isinstance(k, StaticMatcher):
+                self.static[k.content] = CompiledMappingNode(v)
+            elif isinstance(k, RegexMatcher):
+                self.matchers.append((k.pattern.match, CompiledMappingNode(v)))
+            else:
+                self.matchers.append((lambda segment, m=k: m.matches(PackagePathSegment(segment)),
+                                      CompiledMappingNode(v)))
+        self.alternation = self._merge([k for k in path_map.keys() if not isinstance(k, (str, StaticMatcher))])
+
+    @staticmethod
+    def _merge(matchers):
+        """
+        Merge the regex matchers of a node into one alternation. Each alternative is wrapped in a named group to be able
+        to find out which matcher hit. Patterns which can't be merged without changing their meaning are skipped.
+        :param matchers: Matchers of the node
+        :return: Compiled alternation or None
+        """
+        if len(matchers) < 2 or not all([isinstance(m, RegexMatcher) for m in matchers]):
+            return None
+        if any([re.search(r"\\[1-9]|\(\?P=", m.content) for m in matchers]):
+            # Backreferences would point to other groups in the merged pattern
+            return None
+        try:
+            return re.compile("|".join(["(?P<_pypads_{}>{})".format(i, m.content) for i, m in enumerate(matchers)]))
+        except re.error:
+            return None
+
+    def _matching(self, segment):
+        """
+        Get the child nodes of all matchers matching the given segment.
+        :param segment: Segment string
+        :return: Matching child nodes
+        """
+        if self.alternation is None:
+            return [node for match, node in self.matchers if match(segment)]
+        hit = self.alternation.match(segment)
+        if hit is None:
+            return []
+        # Alternatives before the hit didn't match. Alternatives after it might still match.
+        first = int(hit.lastgroup[len("_pypads_"):])
+        return [self.matchers[first][1]] + [node for match, node in self.matchers[first + 1:] if match(segment)]
+
+    def subtree(self):
+        """
+        Get all mappings stored in and below this node.
+        :return: Tuple of mappings
+        """
+        if self._subtree is None:
+            mappings = list(self.mappings)
+            for node in self.static.values():
+                mappings.extend(node.subtree())
+            for _, node in self.matchers:
+                mappings.extend(node.subtree())
+            self._subtree = tuple(mappings)
+        return self._subtree
+
+    def collect(self, segments, index, out):
+        """
+        Collect all mappings matching the segments starting at given index into out.
+        :param segments: Segment strings
+        :param index: Index of the segment to match on this node
+        :param out: List to extend with found mappings
+        :return:
+        """
+        if index == len(segments):
+            out.extend(self.subtree())
+            return
+        segment = segments[index]
+        node = self.static.get(segment)
+        if node is not None:
+            node.collect(segments, index + 1, out)
+        if self.matchers:
+            for node in self._matching(segment):
+                node.collect(segments, index + 1, out)
+
+
 class MappingCollection:
+    # Maximal number of memoized lookups before the memo is reset
+    LOOKUP_CACHE_SIZE = 2 ** 16
+
     def __init__(self, key, version, library):
         """
         Object holding a set of mappings related to a library
@@ -114,6 +209,8 @@ class MappingCollection:
         self._name = key
         self._version = version
         self._lib = LibSelector.from_dict(library)
+        self._compiled = None
+        self._lookup_cache = {}
 
     @property
     def version(self):
@@ -146,6 +243,10 @@ class MappingCollection:
             path_map[":mapping"] = []
         path_map[":mapping"].append(mapping)
 
+        # Invalidate the compiled lookup
+        self._compiled = None
+        self._lookup_cache = {}
+
     def _get_all_mappings(self, current_path=None):
         """
         Get all mappings stored behind place in the mapping dict.
@@ -157,36 +258,45 @@ class MappingCollection:
             current_path = self._mappings
         for k, v in current_path.items():
             if isinstance(k, str) and ":mapping" == k:
-                mappings = mappings + v
+                mappings.extend(v)
             else:
                 if isinstance(v, dict):
-                    mappings = mappings + self._get_all_mappings(current_path=v)
+                    mappings.extend(self._get_all_mappings(current_path=v))
         return mappings
 
-    def find_mappings(self, segments, current_path=None):
+    def compile(self):
+        """
+        Build the compiled lookup structure of the mapping dict.
+        :return: Root node of the compiled lookup
+        """
+        if self._compiled is None:
+            self._compiled = CompiledMappingNode(self._mappings)
+        return self._compiled
+
+    def find_mappings(self, segments):
         """
         Find all mappings matching given segments. The segments foo.bar for example are matched by foo.bar.a
-        and foo.bar.{re:.*} etc.
+        and foo.bar.{re:.*} etc. Results are memoized per path.
         :param segments: Segments to look for
-        :param current_path: Place in the mapping dict from which we are looking in mapping dict. We iterate through
-        the map to find relevant mapping files.
         :return:
         """
-        mappings = []
-        if current_path is None:
-            current_path = self._mappings
-        if len(segments) > 0:
-            if segments[0] in current_path:
-                mappings = mappings + self.find_mappings(segments[1:], current_path[segments[0]])
-
-            # For non PathSegments we can't use the hash lookup
-            for s, v in current_path.items():
-                if isinstance(s, RegexMatcher) and s.matches(segments[0]):
-                    mappings = mappings + self.find_mappings(segments[1:], v)
-        else:
-            mappings = mappings + self._get_all_mappings(current_path)
-
-        return mappings
+        key = tuple([str(s) for s in segments])
+        found = self._lookup_cache.get(key)
+        if found is None:
+            out = []
+            self.compile().collect(key, 0, out)
+            found = tuple(out)
+            if len(self._lookup_cache) >= self.LOOKUP_CACHE_SIZE:
+                self._lookup_cache = {}
+            self._lookup_cache[key] = found
+        return list(found)
+
+    def __getstate__(self):
+        # The compiled lookup is rebuilt on demand
+        state = self.__dict__.copy()
+        state["_compiled"] = None
+        state["_lookup_cache"] = {}
+        return state
 
 
 def make_run_time_mapping_collection(lib):
@@ -319,6 +429,10 @@ class MappingFile(SerializedMapping):
         super().__init__(name, data)
 
 
+_UNRESOLVED = object()
+_PACKAGE_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+
+
 class MappingRegistry:
     """
     Class holding all the mappings
@@ -328,7 +442,7 @@ class MappingRegistry:
         # default paths
         self._pypads = pypads
         mapping_file_paths = []
-        if pypads.config["include_default_mappings"]:
+        if pypads.config.include_default_mappings:
             # Use our with the package delivered mapping files
             mapping_file_paths.extend(glob.glob(os.path.join(pypads.folder, "bindings", "**.yml")))
             mapping_file_paths.extend(default_mapping_file_paths)
@@ -336,6 +450,7 @@ class MappingRegistry:
             mapping_file_paths.extend(paths)
 
         self._mappings = {}
+        self._import_filter = _UNRESOLVED
 
         for path in mapping_file_paths:
             self.load_mapping(path)
@@ -394,14 +509,19 @@ class MappingRegistry:
                 "Couldn't add mapping " + str(mapping) + " to the pypads mapping registry. Lib or key are undefined.")
         else:
             self._mappings[key] = mapping
+            self._import_filter = _UNRESOLVED
 
     def load_mapping(self, path):
         """
-        Load and add mapping at given path.
+        Load and add mapping at given path. If the mapping cache is enabled a compiled version of the file is used.
         :param path: Path to the mapping file.
         :return:
         """
-        self.add_mapping(MappingFile(path))
+        if self._pypads.config.mapping_cache:
+            from pypads.importext.mapping_cache import MappingCache
+            self.add_mapping(MappingCache(self._pypads.folder).load(path))
+        else:
+            self.add_mapping(MappingFile(path))
 
     def get_libraries(self):
         """
@@ -413,18 +533,37 @@ class MappingRegistry:
             all_libs.add(mapping.lib)
         return all_libs
 
+    def import_filter(self):
+        """
+        Get the top level package names for which imports have to be intercepted. These are the packages of all
+        libraries in the registry and the packages listed in the "inheritance_watch" config. Modules defined in these
+        packages might inherit from a tracked class.
+        :return: Frozenset of top level package names or None if a library is given as regex and every import has to be
+        intercepted.
+        """
+        watched = self._pypads.config.inheritance_watch
+        if self._import_filter is _UNRESOLVED or self._import_filter[0] != watched:
+            names = {name.split(".", 1)[0] for name in watched}
+            for lib in self.get_libraries():
+                if lib is None or lib.regex or not _PACKAGE_NAME.match(lib.name):
+                    names = None
+                    break
+                names.add(lib.name.split(".", 1)[0])
+            self._import_filter = (watched, frozenset(names) if names is not None else None)
+        return self._import_filter[1]
+
     def get_relevant_mappings(self, package: Package):
         """
         Function to find all relevant mappings. This produces a generator getting extended with found subclasses
         :return:
         """
         if any([package.path.segments[0] == s.name for s, _ in self.get_entries()]):
-            lib_version = find_package_version(str(package.path.segments[0]))
+            lib_version = package_metadata.version(str(package.path.segments[0]))
             mappings = set()
 
             # Take only mappings which are fitting for versions if we have a selector
             if lib_version:
-                lib_selector = LibSelector(name=str(package.path.segments[0]), constraint=lib_version)
+                lib_selector = package_metadata.lib_selector(str(package.path.segments[0]), lib_version)
                 for k, collection in [(s, c) for s, c in self.get_entries() if s.allows_any(lib_selector)]:
                     for m in collection.find_mappings(package.path.segments):
                         mappings.add(m)
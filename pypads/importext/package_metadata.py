@@ -0,0 +1,134 @@
+"""
+Process wide cache of package metadata. Resolving the availability and version of a package searches the import path
+and the installed distributions, which is too slow to be done on every logger call. Availability, versions and the
+results of version checks are therefore cached until sys.modules or sys.path change. Parsed versions and constraints
+don't depend on the environment and are kept for the lifetime of the process.
+"""
+import sys
+
+from pypads.importext.semver import parse_constraint, Version
+from pypads.utils.util import is_package_available, find_package_version, find_package_regex_versions
+
+# Result of an installation check of a package which is available, but has no version
+NO_VERSION = object()
+
+
+class PackageMetadataCache:
+
+    def __init__(self):
+        self._modules = -1
+        self._path = None
+        self._available = {}
+        self._versions = {}
+        self._regex_versions = {}
+        self._installed = {}
+        self._parsed_versions = {}
+        self._constraints = {}
+        self._selectors = {}
+
+    def _validate(self):
+        """
+        Drop the environment dependent entries if sys.modules or sys.path changed since they were resolved.
+        :return:
+        """
+        if len(sys.modules) != self._modules or sys.path != self._path:
+            self._available = {}
+            self._versions = {}
+            self._regex_versions = {}
+            self._installed = {}
+            self._modules = len(sys.modules)
+            self._path = list(sys.path)
+
+    def invalidate(self):
+        """
+        Drop the environment dependent entries, e.g. after installing a package at runtime.
+        :return:
+        """
+        self._modules = -1
+
+    def is_available(self, name):
+        """
+        Check if given package is available.
+        :param name: Name of the package
+        :return:
+        """
+        self._validate()
+        available = self._available.get(name)
+        if available is None:
+            available = self._available[name] = is_package_available(name)
+        return available
+
+    def version(self, name):
+        """
+        Get the version of given package.
+        :param name: Name of the package
+        :return: Version string or None if it couldn't be found
+        """
+        self._validate()
+        if name not in self._versions:
+            self._versions[name] = find_package_version(name)
+        return self._versions[name]
+
+    def regex_versions(self, regex):
+        """
+        Get the versions of all packages matching given regex.
+        :param regex: Regex of the package names
+        :return: Dict of package names to versions
+        """
+        self._validate()
+        versions = self._regex_versions.get(regex)
+        if versions is None:
+            versions = self._regex_versions[regex] = find_package_regex_versions(regex)
+        return versions
+
+    def installed(self, key, resolve):
+        """
+        Get the memoized result of an installation check.
+        :param key: Key of the check
+        :param resolve: Function resolving the check if it isn't cached
+        :return: Result of the check
+        """
+        self._validate()
+        installed = self._installed.get(key)
+        if installed is None:
+            installed = self._installed[key] = resolve()
+        return installed
+
+    def parsed_version(self, version):
+        """
+        Parse a version string.
+        :param version: Version string
+        :return: Version
+        """
+        parsed = self._parsed_versions.get(version)
+        if parsed is None:
+            parsed = self._parsed_versions[version] = Version.parse(version)
+        return parsed
+
+    def constraint(self, constraint):
+        """
+        Parse a version constraint.
+        :param constraint: Constraint string
+        :return: VersionConstraint
+        """
+        parsed = self._constraints.get(constraint)
+        if parsed is None:
+            parsed = self._constraints[constraint] = parse_constraint(constraint)
+        return parsed
+
+    def lib_selector(self, name, constraint="*"):
+        """
+        Get a library selector. Selectors are shared and must not be changed.
+        :param name: Name of the library
+        :param constraint: Version constraint
+        :return: LibSelector
+        """
+        key = (name, constraint)
+        selector = self._selectors.get(key)
+        if selector is None:
+            from pypads.importext.versioning import LibSelector
+            selector = self._selectors[key] = LibSelector(name=name, constraint=constraint)
+        return selector
+
+
+package_metadata = PackageMetadataCache()
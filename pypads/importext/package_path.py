@@ -215,6 +215,17 @@ class RegexMatcher(ISegmentMatcher):
     """
     TAG = u'tag:yaml.org,2002:python/rSeg'
 
+    def __init__(self, content):
+        super().__init__(content)
+        self._pattern = re.compile(content)
+
+    @property
+    def pattern(self):
+        """
+        :return: Precompiled pattern of the matcher
+        """
+        return self._pattern
+
     @staticmethod
     def unserialize(reference) -> ISegmentMatcher:
         return RegexMatcher(reference[4:-1])
@@ -228,7 +239,7 @@ class RegexMatcher(ISegmentMatcher):
         return RegexMatcher(loader.construct_scalar(node))
 
     def matches(self, segment: PackagePathSegment):
-        return re.match(self.content, segment.content)
+        return self._pattern.match(segment.content)
 
     def serialize(self):
         return "{re:" + self.content + "}"
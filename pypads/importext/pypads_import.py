@@ -1,4 +1,3 @@
-import inspect
 import sys
 import types
 from functools import wraps
@@ -9,6 +8,7 @@ from multiprocessing import Value
 from pypads import logger
 from pypads.importext.mappings import Mapping, MatchedMapping
 from pypads.importext.package_path import PackagePath, PackagePathMatcher, Package
+from pypads.importext.wrap_plan import module_stamp
 from pypads.importext.wrapping.base_wrapper import Context
 
 
@@ -61,31 +61,30 @@ def duck_punch_loader(spec):
         reference = module.__name__
 
         if current_pads:
-            # TODO we might want to make this configurable/improve performance.
-            #  This looks at every imported class and every mapping.
-            # On execution of a module we search for relevant mappings
-            # For every var on module
-            try:
-                members = inspect.getmembers(module,
-                                             lambda x: hasattr(x, "__module__") and x.__module__ == module.__name__)
-            except Exception as e:
-                logger.debug(
-                    "getmembers of inspect failed on module '" + str(module.__name__) + "' with expection" + str(
-                        e) + ". Falling back to dir to get the members of the module.")
-                members = [(name, getattr(module, name)) for name in dir(module)]
-
+            # Replay the wrapping of an earlier start if the module is known to the plan
+            plan = current_pads.wrap_manager.plan
+            stamp = module_stamp(module) if plan is not None else None
+            planned = plan.module(reference, stamp) if plan is not None else None
+            if planned is not None:
+                for name, matched_mappings in planned:
+                    obj = module.__dict__.get(name)
+                    if obj is not None:
+                        current_pads.wrap_manager.wrap(obj, Context(module, reference), matched_mappings)
+                return out
+
+            # On execution of a module we search for relevant mappings. Only callables defined in the module itself
+            # can be mapped. Besides classes and functions these are builtins, compiled functions and partials.
+            members = [(name, obj) for name, obj in list(module.__dict__.items()) if
+                       callable(obj) and getattr(obj, "__module__", None) == reference]
+
+            wrapped = []
             for name, obj in members:
                 if obj is not None:
                     obj_ref = ".".join([reference, name])
                     package = Package(module, PackagePath(obj_ref))
 
-                    # Skip modules if they are from another package for now
-                    if inspect.ismodule(obj):
-                        if not module.__name__.split(".")[0] == obj.__name__.split(".")[0]:
-                            continue
-
                     mappings = set()
-                    if inspect.isclass(obj) and hasattr(obj, "mro"):
+                    if isinstance(obj, type) and hasattr(obj, "mro"):
                         try:
 
                             # Look at the MRO and add classes to be punched which inherit from our punched classes
@@ -102,8 +101,11 @@ def duck_punch_loader(spec):
                             logger.debug("Skipping some superclasses of " + str(obj) + ". " + str(e))
                     mappings = mappings.union(_get_relevant_mappings(package))
                     if len(mappings) > 0:
-                        current_pads.wrap_manager.wrap(obj, Context(module, reference),
-                                                       {MatchedMapping(mapping, package.path) for mapping in mappings})
+                        matched_mappings = {MatchedMapping(mapping, package.path) for mapping in mappings}
+                        wrapped.append((name, matched_mappings))
+                        current_pads.wrap_manager.wrap(obj, Context(module, reference), matched_mappings)
+            if plan is not None:
+                plan.record_module(reference, wrapped, stamp)
         return out
 
     spec.loader.exec_module = types.MethodType(exec_module, spec.loader)
@@ -117,6 +119,18 @@ class PyPadsFinder(PathFinder):
 
     def find_spec(cls, fullname, path=None, target=None):
         if fullname not in sys.modules:
+            # Leave modules untouched which can't hold or inherit anything mapped
+            from pypads.app.pypads import current_pads
+            if current_pads is None:
+                return None
+            try:
+                relevant = current_pads.mapping_registry.import_filter()
+            except AttributeError:
+                # Pypads is still setting up its registries
+                return None
+            if relevant is not None and fullname.split(".", 1)[0] not in relevant:
+                return None
+
             path_ = sys.meta_path[
                     [i for i in range(len(sys.meta_path)) if isinstance(sys.meta_path[i], PyPadsFinder)].pop() + 1:]
             i = iter(path_)
@@ -4,10 +4,9 @@ from typing import Type
 
 from pydantic.main import BaseModel
 
-from pypads.importext.semver import parse_constraint
+from pypads.importext.package_metadata import package_metadata, NO_VERSION
 from pypads.model.metadata import ModelObject
 from pypads.model.models import LibSelectorModel
-from pypads.utils.util import is_package_available, find_package_version, find_package_regex_versions
 
 
 class VersionNotFoundException(Exception):
@@ -26,7 +25,7 @@ class LibSelector(ModelObject):
     def __init__(self, *args, name, regex=False, constraint: str = "*", specificity: int = None, **kwargs) -> None:
         super().__init__(*args, name=name, regex=regex, constraint=constraint,
                          specificity=specificity or self._calc_specificity(), **kwargs)
-        self._parsed_constraint = parse_constraint(constraint)
+        self._parsed_constraint = package_metadata.constraint(constraint)
 
     @staticmethod
     def from_dict(library):
@@ -44,17 +43,23 @@ class LibSelector(ModelObject):
 
     def is_installed(self):
         """
-        Check if a match is installed
+        Check if a match is installed. The result is cached until sys.modules or sys.path change.
         :return:
         """
+        installed = package_metadata.installed((self.name, self.regex, self.constraint), self._resolve_installed)
+        if installed is NO_VERSION:
+            raise VersionNotFoundException("Couldn't find version for lib {}".format(self.name))
+        return installed
+
+    def _resolve_installed(self):
         if self.regex:
-            return any({self.allows(version) for version in find_package_regex_versions(self.name).values() if
+            return any({self.allows(version) for version in package_metadata.regex_versions(self.name).values() if
                         version is not None})
         else:
-            if is_package_available(self.name):
-                version = find_package_version(self.name)
+            if package_metadata.is_available(self.name):
+                version = package_metadata.version(self.name)
                 if version is None:
-                    raise VersionNotFoundException("Couldn't find version for lib {}".format(self.name))
+                    return NO_VERSION
                 return self.allows(version)
             return False
 
@@ -72,8 +77,7 @@ class LibSelector(ModelObject):
         :param version:
         :return:
         """
-        from pypads.importext.semver import Version
-        return self._parsed_constraint.allows(Version.parse(version))
+        return self._parsed_constraint.allows(package_metadata.parsed_version(version))
 
     def __str__(self):
         return "LibSelector[name=" + self.name + "," + self.constraint + "]"
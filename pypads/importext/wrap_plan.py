@@ -0,0 +1,218 @@
+import hashlib
+import importlib.util
+import os
+import pickle
+
+from pypads import logger
+from pypads.importext.mappings import Mapping, MatchedMapping
+from pypads.importext.package_path import PackagePathMatcher, PackagePath
+
+# Bump this if the pickled structure of wrap plans changes.
+PLAN_FORMAT = 2
+
+
+def _library_version(name):
+    """
+    Identify the installed version of a library without importing it. The location of the package and its
+    modification time change with every (re)installation.
+    :param name: Name of the library
+    :return: String identifying the installation
+    """
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None or spec.origin is None:
+        return "missing"
+    try:
+        return "{}@{}".format(spec.origin, os.stat(spec.origin).st_mtime_ns)
+    except OSError:
+        return spec.origin
+
+
+def module_stamp(module):
+    """
+    Identify the state of the source of a module. It changes if the file of the module is edited.
+    :param module: Module
+    :return: Tuple of the path, modification time and size of the file or None if the module has no file
+    """
+    path = getattr(module, "__file__", None)
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+class WrapPlan:
+    """
+    Plan of the resolved wrapping of modules and classes. Finding the mappings relevant for the members of a module,
+    checking the MRO for inherited mappings and matching mappings against the attributes of classes is done on every
+    start. The plan records the outcome of this discovery and stores it in the pypads folder. On later starts with the
+    same mappings, library installations and configuration the recorded outcome is replayed instead. Each module is
+    recorded with the state of its file, a module edited since is discovered again.
+    """
+
+    def __init__(self, pypads):
+        """
+        :param pypads: Owning pypads app. Its mapping registry and config have to be set up.
+        """
+        self._pypads = pypads
+        self._folder = os.path.join(pypads.folder, "cache", "wrap_plans")
+        self._collections = {c.name: c for _, c in pypads.mapping_registry.get_entries()}
+        self._key = self.key(pypads)
+        self._modules = {}
+        self._classes = {}
+        self._changed = False
+        self._load()
+
+    @property
+    def folder(self):
+        return self._folder
+
+    @property
+    def path(self):
+        return os.path.join(self._folder, "{}.pickle".format(self._key))
+
+    @staticmethod
+    def key(pypads):
+        """
+        Build the key of the plan. It changes if a mapping, the version of a mapped or watched library or the config
+        changes.
+        :param pypads: Pypads app
+        :return: Hex digest identifying the plan
+        """
+        from pypads import __version__
+        digest = hashlib.sha256()
+        parts = [str(PLAN_FORMAT), __version__, repr(sorted(pypads.config.items(), key=lambda i: i[0]))]
+        for _, collection in sorted(pypads.mapping_registry.get_entries(), key=lambda e: str(e[1].name)):
+            parts.append("{}:{}:{}:{}".format(collection.name, collection.version, collection.lib,
+                                              _library_version(collection.lib.name)))
+            parts.extend(sorted("{}|{}|{}".format(m.reference, sorted(str(h.anchor.name) for h in m.hooks),
+                                                  repr(m.values)) for m in collection.find_mappings([])))
+        for package in sorted(pypads.config.get("inheritance_watch", None) or []):
+            parts.append("watch:{}:{}".format(package, _library_version(package)))
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "rb") as fd:
+                    self._modules, self._classes = pickle.load(fd)
+            except Exception as e:
+                logger.warning("Couldn't load wrap plan " + self.path + ". Running full discovery instead. " + str(e))
+                self._modules, self._classes = {}, {}
+
+    def save(self):
+        """
+        Write the plan to the pypads folder if something new was recorded.
+        :return:
+        """
+        if not self._changed:
+            return
+        try:
+            if not os.path.isdir(self._folder):
+                os.makedirs(self._folder, exist_ok=True)
+            tmp_path = self.path + "." + str(os.getpid()) + ".tmp"
+            with open(tmp_path, "wb") as fd:
+                pickle.dump((self._modules, self._classes), fd, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+            self._changed = False
+        except Exception as e:
+            logger.warning("Couldn't store wrap plan to " + self.path + ". " + str(e))
+
+    @staticmethod
+    def _to_record(matched_mapping: MatchedMapping):
+        mapping = matched_mapping.mapping
+        return (mapping.in_collection.name, mapping.reference, tuple(h.anchor for h in mapping.hooks),
+                mapping.values, str(matched_mapping.package_path))
+
+    def _from_record(self, record):
+        collection_name, reference, anchors, values, package_path = record
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            raise KeyError(collection_name)
+        return MatchedMapping(Mapping(PackagePathMatcher(reference), collection, anchors, values),
+                              PackagePath(package_path))
+
+    def record_module(self, name, members, stamp=None):
+        """
+        Record the outcome of the discovery on a module.
+        :param name: Name of the module
+        :param members: List of tuples of member names and the matched mappings found for them
+        :param stamp: State of the file of the module, see module_stamp
+        :return:
+        """
+        self._modules[name] = (stamp, [(member, [self._to_record(mm) for mm in matched]) for member, matched in
+                                       members])
+        self._changed = True
+
+    def module(self, name, stamp=None):
+        """
+        Get the recorded members of a module.
+        :param name: Name of the module
+        :param stamp: Current state of the file of the module, see module_stamp
+        :return: List of tuples of member names and the matched mappings to wrap them with or None if the module
+        has to be discovered.
+        """
+        entry = self._modules.get(name)
+        if entry is None:
+            return None
+        recorded_stamp, records = entry
+        if recorded_stamp != stamp:
+            logger.debug("Module " + name + " changed since its wrapping was recorded. Discovering it again.")
+            return None
+        try:
+            return [(member, {self._from_record(r) for r in rs}) for member, rs in records]
+        except Exception as e:
+            logger.debug("Wrap plan of " + name + " couldn't be replayed. " + str(e))
+            return None
+
+    def record_class(self, reference, matched_mappings, attrs):
+        """
+        Record which attributes of a class are matched by which mappings.
+        :param reference: Reference of the class
+        :param matched_mappings: Mappings the class was wrapped with
+        :param attrs: Dict of attribute names to the matched mappings applicable to them
+        :return:
+        """
+        self._classes[reference] = (frozenset(mm.mapping.reference for mm in matched_mappings),
+                                    {name: frozenset(mm.mapping.reference for mm in mm_set) for name, mm_set in
+                                     attrs.items()})
+        self._changed = True
+
+    def class_attributes(self, reference, matched_mappings):
+        """
+        Get the attributes of a class to wrap. Whether a mapping applies to an attribute only depends on the reference
+        of the mapping, therefore the recording can be used as long as no unknown reference is given.
+        :param reference: Reference of the class
+        :param matched_mappings: Mappings the class is wrapped with
+        :return: Dict of attribute names to matched mappings or None if the attributes have to be matched.
+        """
+        entry = self._classes.get(reference)
+        if entry is None:
+            return None
+        considered, attr_references = entry
+        if not {mm.mapping.reference for mm in matched_mappings} <= considered:
+            return None
+        attrs = {}
+        for name, references in attr_references.items():
+            matched = {mm for mm in matched_mappings if mm.mapping.reference in references}
+            if matched:
+                attrs[name] = matched
+        return attrs
+
+    def clear(self):
+        """
+        Remove all stored plans.
+        :return:
+        """
+        self._modules, self._classes = {}, {}
+        if os.path.isdir(self._folder):
+            import shutil
+            shutil.rmtree(self._folder)
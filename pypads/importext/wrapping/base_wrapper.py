@@ -195,8 +195,9 @@ class BaseWrapper:
             for hook in matched_mapping.mapping.hooks:
                 hooks.add(hook)
 
+        target = ", ".join(sorted({str(matched_mapping.package_path) for matched_mapping in matched_mappings}))
         for hook in hooks:
-            fns = fns + self._pypads.hook_registry.get_logging_functions(hook)
+            fns = fns + self._pypads.hook_registry.get_logging_functions(hook, target=target)
         return fns
 
     @classmethod
@@ -38,20 +38,28 @@ class ClassWrapper(BaseWrapper):
             if hasattr(clazz, "__module__"):
                 self._pypads.wrap_manager.module_wrapper.add_punched_module_name(clazz.__module__)
 
-            attrs = {}
             clazz_context = Context(clazz, ".".join([context.reference, clazz.__name__]))
-            for matched_mapping in matched_mappings:
-                # Try to wrap every attr of the class
-                for name in list(filter(
-                        matched_mapping.mapping.applicable_filter(
-                            clazz_context),
-                        dir(clazz))):
-                    if name not in attrs:
-                        attrs[name] = set()
-                    attrs[name].add(matched_mapping)
+
+            # Take the applicable attributes from the wrap plan if they were recorded on an earlier start
+            plan = self._pypads.wrap_manager.plan
+            attrs = plan.class_attributes(clazz_context.reference, matched_mappings) if plan is not None else None
+            if attrs is None:
+                attrs = {}
+                for matched_mapping in matched_mappings:
+                    # Try to wrap every attr of the class
+                    for name in list(filter(
+                            matched_mapping.mapping.applicable_filter(
+                                clazz_context),
+                            dir(clazz))):
+                        if name not in attrs:
+                            attrs[name] = set()
+                        attrs[name].add(matched_mapping)
+                if plan is not None:
+                    plan.record_class(clazz_context.reference, matched_mappings, attrs)
 
             for name, mm in attrs.items():
-                self._pypads.wrap_manager.wrap(getattr(clazz, name), clazz_context, mm)
+                if hasattr(clazz, name):
+                    self._pypads.wrap_manager.wrap(getattr(clazz, name), clazz_context, mm)
 
             # Override class on module
             context.overwrite(clazz.__name__, clazz)
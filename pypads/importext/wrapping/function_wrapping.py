@@ -1,3 +1,5 @@
+import contextvars
+import inspect
 import types
 from contextlib import contextmanager
 from functools import wraps
@@ -5,13 +7,40 @@ from typing import Set
 
 from pypads.app.env import InjectionLoggerEnv
 from pypads import logger
-from pypads.app.call import FunctionReference, CallAccessor, Call
+from pypads.app.misc.switch import tracking as switch
+from pypads.app.call import FunctionReference, CallAccessor, Call, FunctionKind
 from pypads.importext.mappings import MatchedMapping
 from pypads.importext.wrapping.base_wrapper import BaseWrapper, Context
 from pypads.injections.analysis.call_tracker import add_call, finish_call
-from pypads.utils.util import get_experiment_id, get_run_id
+from pypads.utils.lazy_mlflow import mlflow
 
-error = False
+# Whether the missing run was already reported in the current thread or task
+_no_run_reported = contextvars.ContextVar("pypads_no_run_reported", default=False)
+
+# Binding of a wrapped function to the instance of a call per kind of function
+_binders = {
+    FunctionKind.static_method: lambda fn, instance: fn,
+    FunctionKind.function: types.MethodType,
+    FunctionKind.class_method: types.MethodType,
+    FunctionKind.wrapped: lambda fn, instance: fn.__get__(instance)
+}
+
+
+def _chain(inner, instance, name, env: InjectionLoggerEnv):
+    """
+    Build the callback executing the hook of the given environment.
+    :param inner: Function executing the hook
+    :param instance: Instance of the call
+    :param name: Name of the wrapped function. Recovering on errors looks up the original function by this name.
+    :param env: Environment of the hook
+    :return:
+    """
+
+    def hook_call(*args, **kwargs):
+        return inner(instance, *args, _pypads_env=env, **kwargs)
+
+    hook_call.__name__ = name
+    return hook_call
 
 
 class FunctionWrapper(BaseWrapper):
@@ -120,217 +149,150 @@ class FunctionWrapper(BaseWrapper):
 
     def wrap_method_helper(self, fn_reference: FunctionReference, hooks, mappings: Set[MatchedMapping]):
         """
-        Helper to differentiate between functions, classmethods, static methods and wrap them
+        Helper to differentiate between functions, classmethods, static methods and wrap them. The kind of the function
+        and the hooks are resolved once here, a call only has to bind the function and chain the hooks.
         :param fn_reference:
         :param hooks:
         :param mappings:
         :return:
         """
         fn = fn_reference.wrappee
+        kind = fn_reference.function_kind()
+        if kind not in _binders:
+            return fn
 
-        if fn_reference.is_static_method():
+        hooks = tuple(hooks)
+        asynchronous = inspect.iscoroutinefunction(fn)
+        dispatch = self._make_dispatch(fn_reference, hooks, mappings, _binders[kind], asynchronous)
+
+        # If the tracking is switched off the original function is called right away
+        if asynchronous:
+            # Coroutine functions get coroutine function entries awaiting the call within the hooks
+            if kind is FunctionKind.static_method:
+                @wraps(fn)
+                async def entry(*args, _pypads_hooks=hooks, _pypads_mapped_by=mappings, **kwargs):
+                    if not switch.enabled:
+                        return await fn(*args, **kwargs)
+                    return await dispatch(None, args, kwargs)
+            elif kind is FunctionKind.wrapped:
+                @wraps(getattr(fn_reference.context.container, fn.__name__))
+                async def entry(_self, *args, _pypads_hooks=hooks, _pypads_mapped_by=mappings, **kwargs):
+                    if not switch.enabled:
+                        return await fn.__get__(_self)(*args, **kwargs)
+                    return await dispatch(_self, args, kwargs)
+            else:
+                @wraps(fn)
+                async def entry(_self, *args, _pypads_hooks=hooks, _pypads_mapped_by=mappings, **kwargs):
+                    if not switch.enabled:
+                        return await fn(_self, *args, **kwargs)
+                    return await dispatch(_self, args, kwargs)
+        elif kind is FunctionKind.static_method:
             @wraps(fn)
             def entry(*args, _pypads_hooks=hooks, _pypads_mapped_by=mappings, **kwargs):
-                logger.debug("Call to tracked static method or function " + str(fn))
-
-                global error
-                if self._pypads.api.active_run():
-                    error = False
-                    with self._make_call(None, fn_reference) as call:
-                        accessor = call.call_id
-                        callback = fn
-
-                        # for every hook add
-                        if self._is_skip_recursion(accessor):
-                            logger.info("Skipping " + str(accessor.context.container.__name__) + "." + str(
-                                accessor.wrappee.__name__))
-                            out = callback(*args, **kwargs)
-                            return out
-
-                        for (h, params) in hooks:
-                            c = self._add_hook(h, params, callback, call, mappings)
-                            if c:
-                                callback = c
-
-                        # start executing the stack
-                        out = callback(*args, **kwargs)
-                else:
-                    if not error:
-                        error = True
-                        logger.error(
-                            "No run was active to log your hooks. You may want to start a run with PyPads().start_track()")
-                    out = fn(*args, **kwargs)
-                return out
-        elif fn_reference.is_function():
-            @wraps(fn)
+                if not switch.enabled:
+                    return fn(*args, **kwargs)
+                return dispatch(None, args, kwargs)
+        elif kind is FunctionKind.wrapped:
+            @wraps(getattr(fn_reference.context.container, fn.__name__))
             def entry(_self, *args, _pypads_hooks=hooks, _pypads_mapped_by=mappings, **kwargs):
-                # print("Call to tracked class method " + str(fn) + str(id(fn)))
-                logger.debug("Call to tracked method " + str(fn))
-
-                global error
-                if self._pypads.api.active_run():
-                    error = False
-                    with self._make_call(_self, fn_reference) as call:
-                        accessor = call.call_id
-                        # add the function to the callback stack
-                        callback = types.MethodType(fn, _self)
-
-                        # for every hook add
-                        if self._is_skip_recursion(accessor):
-                            logger.info("Skipping " + str(accessor.context.container.__name__) + "." + str(
-                                accessor.wrappee.__name__))
-                            out = callback(*args, **kwargs)
-                            return out
-
-                        for (h, params) in hooks:
-                            c = self._add_hook(h, params, callback, call, mappings)
-                            if c:
-                                callback = types.MethodType(c, _self)
-
-                        # start executing the stack
-                        out = callback(*args, **kwargs)
-                else:
-                    if not error:
-                        error = True
-                        logger.error(
-                            "No run was active to log your hooks. You may want to start a run with PyPads().start_track()")
-                    callback = types.MethodType(fn, _self)
-                    out = callback(*args, **kwargs)
-                return out
-
-        elif fn_reference.is_class_method():
+                if not switch.enabled:
+                    return fn.__get__(_self)(*args, **kwargs)
+                return dispatch(_self, args, kwargs)
+        else:
             @wraps(fn)
-            def entry(_cls, *args, _pypads_hooks=hooks, _pypads_mapped_by=mappings, **kwargs):
-                logger.debug("Call to tracked class method " + str(fn))
-
-                global error
-                if self._pypads.api.active_run():
-                    error = False
-                    with self._make_call(_cls, fn_reference) as call:
-                        accessor = call.call_id
-                        # add the function to the callback stack
-                        callback = types.MethodType(fn, _cls)
-
-                        # for every hook add
-                        if self._is_skip_recursion(accessor):
-                            logger.info("Skipping " + str(accessor.context.container.__name__) + "." + str(
-                                accessor.wrappee.__name__))
-                            out = callback(*args, **kwargs)
-                            return out
-
-                        for (h, params) in hooks:
-                            c = self._add_hook(h, params, callback, call, mappings)
-                            if c:
-                                callback = types.MethodType(c, _cls)
-
-                        # start executing the stack
-                        out = callback(*args, **kwargs)
-                else:
-                    if not error:
-                        error = True
-                        logger.error(
-                            "No run was active to log your hooks. You may want to start a run with PyPads().start_track()")
-                    callback = types.MethodType(fn, _cls)
-                    out = callback(*args, **kwargs)
-                return out
-
-        elif fn_reference.is_wrapped():
-            tmp_fn = getattr(fn_reference.context.container, fn.__name__)
-
-            @wraps(tmp_fn)
             def entry(_self, *args, _pypads_hooks=hooks, _pypads_mapped_by=mappings, **kwargs):
-                logger.debug("Call to tracked _IffHasAttrDescriptor " + str(fn))
-
-                global error
-                if self._pypads.api.active_run():
-                    error = False
-                    with self._make_call(_self, fn_reference) as call:
-                        accessor = call.call_id
-                        # add the function to the callback stack
-                        callback = fn.__get__(_self)
-
-                        # for every hook add
-                        if self._is_skip_recursion(accessor):
-                            logger.info("Skipping " + str(accessor.context.container.__name__) + "." + str(
-                                accessor.wrappee.__name__))
-                            out = callback(*args, **kwargs)
-                            return out
-
-                        for (h, params) in hooks:
-                            c = self._add_hook(h, params, callback, call, mappings)
-                            if c:
-                                callback = types.MethodType(c, _self)
-
-                        # start executing the stack
-                        out = callback(*args, **kwargs)
-                else:
-                    if not error:
-                        error = True
-                        logger.error(
-                            "No run was active to log your hooks. You may want to start a run with PyPads().start_track()")
-
-                    callback = fn.__get__(_self)
-                    out = callback(*args, **kwargs)
-                return out
-        else:
-            return fn
+                if not switch.enabled:
+                    return fn(_self, *args, **kwargs)
+                return dispatch(_self, args, kwargs)
+
+        logger.debug("Wrapped " + ("async " if asynchronous else "") + kind.value + " " + str(fn) + " with " + str(
+            len(hooks)) + " hooks.")
         fn_reference.context.overwrite(fn.__name__, entry)
-        # print("Wrapped " + str(fn) + str(id(fn)))
         return entry
 
-    def _add_hook(self, hook, params, callback, call: Call, mappings):
-        # For every hook we defined on the given function in out mapping file execute it before running the code
-        if not call.has_hook(hook):
-            return self._get_env_setter(
-                _pypads_env=InjectionLoggerEnv(mappings, hook, callback, call, params, get_experiment_id(),
-                                               get_run_id()))
-        else:
-            logger.debug(str(hook) + " is tracked multiple times on " + str(call) + ". Ignoring second hooking.")
-            return None
-
-    def _get_env_setter(self, _pypads_env: InjectionLoggerEnv):
+    def _make_dispatch(self, fn_reference: FunctionReference, hooks, mappings, bind, asynchronous=False):
         """
-        This wrapper sets the context
-        :return:
+        Build the function executing a call of a wrapped function.
+        :param fn_reference: Reference to the wrapped function
+        :param hooks: Tuple of (hook, parameters, sampler) to execute on a call
+        :param mappings: Mappings leading to the wrapping
+        :param bind: Function binding the wrapped function to the instance of the call
+        :param asynchronous: Build a coroutine function for a wrapped coroutine function
+        :return: Function taking the instance, args and kwargs of a call
         """
-        env = _pypads_env
-        call: Call = env.call
-        cid = call.call_id
-
-        # TODO maybe use https://gist.github.com/MacHu-GWU/0170849f693aa5f8d129aa03fc358305
-        if cid.is_static_method():
-            @wraps(cid.wrappee)
-            def env_setter(*args, _pypads_env=env, **kwargs):
-                logger.debug("Static method hook " + str(cid.context) + str(cid.wrappee) + str(env.hook))
-                return self._wrapped_inner_function(None, *args, _pypads_env=_pypads_env, **kwargs)
-
-            return env_setter
-        elif cid.is_function():
-            @wraps(cid.wrappee)
-            def env_setter(_self, *args, _pypads_env=env, **kwargs):
-                logger.debug("Method hook " + str(cid.context) + str(cid.wrappee) + str(env.hook))
-                return self._wrapped_inner_function(_self, *args, _pypads_env=_pypads_env, **kwargs)
-
-            return env_setter
-        elif cid.is_class_method():
-            @wraps(cid.wrappee)
-            def env_setter(_cls, *args, _pypads_env=env, **kwargs):
-                logger.debug("Class method hook " + str(cid.context) + str(cid.wrappee) + str(env.hook))
-                return self._wrapped_inner_function(_cls, *args, _pypads_env=_pypads_env,
-                                                    **kwargs)
-
-            return env_setter
-        elif cid.is_wrapped():
-            tmp_fn = getattr(cid.context.container, cid.wrappee.__name__)
-
-            @wraps(tmp_fn)
-            def env_setter(_self, *args, _pypads_env=env, **kwargs):
-                logger.debug("Method hook " + str(cid.context) + str(cid.wrappee) + str(env.hook))
-                return self._wrapped_inner_function(_self, *args, _pypads_env=_pypads_env, **kwargs)
-
-            return env_setter
+        fn = fn_reference.wrappee
+        fn_name = fn.__name__
+        inner = self._wrapped_inner_async_function if asynchronous else self._wrapped_inner_function
+        all_hooks = tuple((h, params) for (h, params, sampler) in hooks)
+        # Loggers of the same event share a sampler, which decides once per call for all of them
+        samplers = tuple({id(sampler): sampler for (h, params, sampler) in hooks if sampler is not None}.values())
+        sampled = len(samplers) > 0
+        skip_message = "Skipping " + str(getattr(fn_reference.context.container, "__name__",
+                                                 fn_reference.context)) + "." + fn_name
+
+        def active_hooks():
+            """
+            Get the active run and the hooks to execute on a call. The run is None if the call goes straight to the
+            original function.
+            """
+            run = mlflow.active_run()
+            if not run:
+                if not _no_run_reported.get():
+                    _no_run_reported.set(True)
+                    logger.error(
+                        "No run was active to log your hooks. You may want to start a run with PyPads().start_track()")
+                return None, None
+
+            if _no_run_reported.get():
+                _no_run_reported.set(False)
+
+            if sampled:
+                # Calls which aren't sampled by any hook go straight to the original function
+                decisions = {id(sampler): sampler.sample() for sampler in samplers}
+                sampled_hooks = [(h, params) for (h, params, sampler) in hooks
+                                 if sampler is None or decisions[id(sampler)]]
+                return (run, sampled_hooks) if sampled_hooks else (None, None)
+            return run, all_hooks
+
+        def chain(instance, run, hooks_to_chain, call):
+            """
+            Chain the hooks of a call from the innermost one outwards.
+            """
+            callback = bind(fn, instance)
+            if self._is_skip_recursion(call.call_id):
+                logger.info(skip_message)
+                return callback
+
+            experiment_id = run.info.experiment_id
+            run_id = run.info.run_id
+            for (h, params) in hooks_to_chain:
+                if call.has_hook(h):
+                    logger.debug(str(h) + " is tracked multiple times on " + str(call) + ". Ignoring second hooking.")
+                    continue
+                callback = _chain(inner, instance, fn_name,
+                                  InjectionLoggerEnv(mappings, h, callback, call, params, experiment_id, run_id))
+            return callback
+
+        if asynchronous:
+            async def dispatch(instance, args, kwargs):
+                run, hooks_to_chain = active_hooks()
+                if run is None:
+                    return await bind(fn, instance)(*args, **kwargs)
+
+                # The call stays on the call stack of the task until the coroutine is finished
+                with self._make_call(instance, fn_reference) as call:
+                    return await chain(instance, run, hooks_to_chain, call)(*args, **kwargs)
         else:
-            raise ValueError("Failed!")
+            def dispatch(instance, args, kwargs):
+                run, hooks_to_chain = active_hooks()
+                if run is None:
+                    return bind(fn, instance)(*args, **kwargs)
+
+                with self._make_call(instance, fn_reference) as call:
+                    # start executing the stack
+                    return chain(instance, run, hooks_to_chain, call)(*args, **kwargs)
+
+        return dispatch
 
     @staticmethod
     def _wrapped_inner_function(_self, *args, _pypads_env: InjectionLoggerEnv, **kwargs):
@@ -362,14 +324,48 @@ class FunctionWrapper(BaseWrapper):
         else:
             return env.callback(*args, **kwargs)
 
+    @staticmethod
+    async def _wrapped_inner_async_function(_self, *args, _pypads_env: InjectionLoggerEnv, **kwargs):
+        """
+        Wrapped function logic for coroutine functions. Loggers are awaited via __acall__, other hooks are called and
+        their result is awaited.
+        :param _self: Reference to
+        :param args:
+        :param kwargs:
+        :return:
+        """
+
+        env = _pypads_env
+        call = env.call
+        if not call.has_hook(env.hook):
+            call.add_hook(env.hook)
+
+            try:
+                # check for name collision in parameters
+                if set([k for k, v in kwargs.items()]) & set(
+                        [k for k, v in env.parameter.items()]):
+                    logger.warning("Hook parameter is overwriting a parameter in the standard "
+                                   "model call. This most likely will produce side effects.")
+
+                if not env.hook:
+                    return await env.callback(*args, **kwargs)
+                if hasattr(env.hook, "__acall__"):
+                    return await env.hook.__acall__(_self, _pypads_env=_pypads_env, *args, **kwargs)
+                out = env.hook(_self, _pypads_env=_pypads_env, *args, **kwargs)
+                return await out if inspect.isawaitable(out) else out
+            finally:
+                call.remove_hook(env.hook)
+        else:
+            return await env.callback(*args, **kwargs)
+
     def _is_skip_recursion(self, accessor):
         try:
             config = self._pypads.config
 
-            if 'recursion_depth' in config and config['recursion_depth'] is not -1:
-                if self._pypads.call_tracker.call_depth() > config['recursion_depth'] + 1:
+            if config.recursion_depth != -1:
+                if self._pypads.call_tracker.call_depth() > config.recursion_depth + 1:
                     return True
-            if 'recursion_identity' in config and config['recursion_identity']:
+            if config.recursion_identity:
                 if self._pypads.call_tracker.has_call_identity(accessor):
                     return True
             return False
@@ -21,6 +21,7 @@ class WrapManager:
         self._module_wrapper = ModuleWrapper(pypads)
         self._class_wrapper = ClassWrapper(pypads)
         self._function_wrapper = FunctionWrapper(pypads)
+        self._plan = None
 
     @property
     def module_wrapper(self):
@@ -34,6 +35,18 @@ class WrapManager:
     def function_wrapper(self):
         return self._function_wrapper
 
+    @property
+    def plan(self):
+        """
+        Plan of the wrapping which is replayed on later starts. The plan is loaded on first access.
+        :return: WrapPlan or None if the plan is deactivated
+        """
+        if self._plan is None and self._pypads.config.wrap_plan:
+            from pypads.importext.wrap_plan import WrapPlan
+            self._plan = WrapPlan(self._pypads)
+            self._pypads.add_atexit_fn(self._plan.save)
+        return self._plan
+
     def wrap(self, wrappee, ctx, matched_mappings: Set[MatchedMapping]):
         """
         Wrap given object with pypads functionality
@@ -1,4 +1,6 @@
-from collections.__init__ import OrderedDict
+import contextvars
+import itertools
+import threading
 
 from pypads import logger
 from pypads.app.call import CallAccessor, CallId, Call
@@ -15,33 +17,117 @@ from pypads.app.call import CallAccessor, CallId, Call
 #         return self._mapping
 
 
+class _Calls:
+    """
+    Number of an instance on which a function is called and the counter of the calls of the function on it.
+    """
+    __slots__ = ("instance_number", "claims")
+
+    def __init__(self, instance_number):
+        self.instance_number = instance_number
+        self.claims = itertools.count()
+
+
+class CallCounters:
+    """
+    Numbers of the instances and calls of tracked functions in a run. Only counters are kept, finished calls are not
+    referenced anymore. Call numbers are claimed from an itertools.count per function and instance without a lock,
+    each number is handed out exactly once even if multiple threads call the same function concurrently. Only the first
+    call of a function on an instance takes a lock to number the instance.
+    """
+
+    def __init__(self):
+        # function_id -> counter of the instances
+        self._instance_counters = {}
+        # (function_id, instance_id) -> _Calls
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def _calls_of(self, function_id, instance_id):
+        key = (function_id, instance_id)
+        calls = self._calls.get(key)
+        if calls is None:
+            with self._lock:
+                calls = self._calls.get(key)
+                if calls is None:
+                    instances = self._instance_counters.setdefault(function_id, itertools.count())
+                    calls = self._calls[key] = _Calls(next(instances))
+        return calls
+
+    def instance_number(self, function_id, instance_id):
+        """
+        Get the number of an instance on which the function is called. Instances are numbered in the order of their
+        first call.
+        :param function_id: Id of the function
+        :param instance_id: Id of the instance
+        :return:
+        """
+        return self._calls_of(function_id, instance_id).instance_number
+
+    def call_number(self, function_id, instance_id):
+        """
+        Get the number of calls of the function on the instance.
+        :param function_id: Id of the function
+        :param instance_id: Id of the instance
+        :return:
+        """
+        calls = self._calls.get((function_id, instance_id))
+        if calls is None:
+            return 0
+        # The repr of a count holds the number next() returns, reading it doesn't advance the counter
+        return int(repr(calls.claims)[len("count("):-1])
+
+    def claim(self, function_id, instance_id):
+        """
+        Claim the number of a new call of the function on the instance.
+        :param function_id: Id of the function
+        :param instance_id: Id of the instance
+        :return: Number of the call
+        """
+        return next(self._calls_of(function_id, instance_id).claims)
+
+
+def _identity(accessor: CallAccessor):
+    """
+    Key of the call identity of an accessor. Functions are identical on the same instance, all other kinds of functions
+    on the same context.
+    """
+    if accessor.is_function():
+        return "instance", accessor.instance_id, accessor.function_name()
+    return "context", id(accessor.context), accessor.function_name()
+
+
 class CallTracker:
     """
-    This class tracks the number of execution per instance of an object.
+    This class tracks the number of execution per instance of an object. The call stack is local to the current
+    thread or asyncio task, while the call counters are shared by the whole run.
     """
 
     def __init__(self, pads):
         self._pads = pads
-        self._call_stack = []
+        # Tuple of the active calls and dict of the number of active calls per call identity. Both are replaced on
+        # every change, contexts copied from this one (like the ones of asyncio tasks) keep their own state.
+        self._state = contextvars.ContextVar("pypads_call_stack_" + str(id(self)), default=((), {}))
 
-    def instance_call_number(self, accessor):
-        function_calls: OrderedDict = self.function_call_dict(accessor.function_id)
-        instance_id = accessor.instance_id
+    def counters(self) -> CallCounters:
+        """
+        Get the call counters of the active run.
+        :return:
+        """
+        counters = self._pads.cache.run_get("call_counters")
+        if counters is None:
+            counters = self._pads.cache.run_cache().cache.setdefault("call_counters", CallCounters())
+        return counters
 
-        call_items = list(function_calls.items())
-        for instance_number in range(0, len(call_items)):
-            # noinspection PyUnresolvedReferences
-            key, value = call_items[instance_number]
-            if key == instance_id:
-                return instance_number
-        return 0
+    def instance_call_number(self, accessor):
+        return self.counters().instance_number(accessor.function_id, accessor.instance_id)
 
     @property
     def call_stack(self):
-        return self._call_stack
+        return self._state.get()[0]
 
     def call_depth(self):
-        return len(self._call_stack)
+        return len(self._state.get()[0])
 
     def call_number(self, accessor: CallAccessor):
         """
@@ -49,72 +135,43 @@ class CallTracker:
         :param accessor:
         :return:
         """
-        return len(self.calls(accessor))
+        return self.counters().call_number(accessor.function_id, accessor.instance_id)
 
     def make_call_id(self, accessor: CallAccessor) -> CallId:
         """
-        Returns the current call id. The id is built from: process_id, thread_id, defining_ctx_name, self_number/id,
+        Returns the id of a new call. The id is built from: process_id, thread_id, defining_ctx_name, self_number/id,
         wrapped_fn_name, call_number
         :param accessor:
         :return:
         """
-        return CallId(accessor.instance, accessor.context, accessor.wrappee, self.instance_call_number(accessor),
-                      self.call_number(accessor))
+        counters = self.counters()
+        function_id = accessor.function_id
+        instance_id = accessor.instance_id
+        return CallId.from_accessor(accessor, counters.instance_number(function_id, instance_id),
+                                    counters.claim(function_id, instance_id))
 
     def current_call_number(self):
         """
         Get the current call number
         :return:
         """
-        call = self._call_stack[-1]
-        return self.call_number(call.accessor)
+        call = self._state.get()[0][-1]
+        return call.call_id.call_number
 
     def current_call(self):
         """
         Get the call_id of the current call
         :return:
         """
-        return self._call_stack[-1] if len(self._call_stack) > 0 else None
+        call_stack = self._state.get()[0]
+        return call_stack[-1] if len(call_stack) > 0 else None
 
     def current_process(self):
-        return str(self._call_stack[-1].call_id.process) + "." + str(self._call_stack[-1].call_id.thread)
-
-    def call_objects(self):
-        """
-        Get all call objects which are stored in our tracker.
-        :return:
-        """
-        # Add call_objects if not exists in cache
-        if not self._pads.cache.run_exists("call_objects"):
-            self._pads.cache.run_add("call_objects", {})
-        return self._pads.cache.run_get("call_objects")
-
-    def function_call_dict(self, function_id) -> OrderedDict:
-        call_objects = self.call_objects()
-        if function_id not in call_objects:
-            call_objects[function_id] = OrderedDict()
-        return call_objects[function_id]
-
-    def calls(self, accessor: CallAccessor):
-        """
-        Get all calls of given call accessor.
-        :param accessor:
-        :return:
-        """
-        instance_id = accessor.instance_id
-        function_id = accessor.function_id
-
-        function_calls = self.function_call_dict(function_id)
-        if instance_id not in function_calls:
-            function_calls[instance_id] = []
-
-        return function_calls[instance_id]
+        call_id = self._state.get()[0][-1].call_id
+        return str(call_id.process) + "." + str(call_id.thread)
 
     def has_call_identity(self, accessor: CallAccessor):
-        for stored in self._call_stack:
-            if stored.is_call_identity(accessor):
-                return True
-        return False
+        return _identity(accessor) in self._state.get()[1]
 
     def add(self, call: Call):
         """
@@ -122,19 +179,34 @@ class CallTracker:
         logging function stack.
         :return: A dict for holding information about the call.
         """
-        self._call_stack.append(call)
-
-        calls = self.calls(call.call_id)
-        calls.append(call)
+        call_stack, identities = self._state.get()
+        identity = _identity(call.call_id)
+        identities = dict(identities)
+        identities[identity] = identities.get(identity, 0) + 1
+        self._state.set((call_stack + (call,), identities))
         return call
 
     def finish(self, call):
-        if call in self._call_stack:
-            call.finish()
-            self._call_stack.remove(call)
-            # TODO clear memory in call_objects?
+        call_stack, identities = self._state.get()
+        # Calls are normally finished in the reverse order of their start
+        if call_stack and call_stack[-1] is call:
+            call_stack = call_stack[:-1]
+        else:
+            for i in range(len(call_stack) - 1, -1, -1):
+                if call_stack[i] is call:
+                    call_stack = call_stack[:i] + call_stack[i + 1:]
+                    break
+            else:
+                logger.error("Tried to finish call which is not on the stack. " + str(call))
+                return
+        identity = _identity(call.call_id)
+        identities = dict(identities)
+        if identities.get(identity, 0) > 1:
+            identities[identity] -= 1
         else:
-            logger.error("Tried to finish call which is not on the stack. " + str(call))
+            identities.pop(identity, None)
+        self._state.set((call_stack, identities))
+        call.finish()
 
 
 def add_call(accessor):
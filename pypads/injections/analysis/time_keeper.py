@@ -18,6 +18,13 @@ def timed(f):
     return ret, elapsed
 
 
+async def async_timed(f):
+    start = time.time()
+    ret = await f()
+    elapsed = time.time() - start
+    return ret, elapsed
+
+
 def get_logger_times():
     from pypads.app.pypads import get_current_pads
     pads = get_current_pads()
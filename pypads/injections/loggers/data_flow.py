@@ -5,8 +5,9 @@ from pydantic import BaseModel, HttpUrl
 
 from pypads.app.injections.base_logger import LoggerCall, TrackedObject
 from pypads.app.injections.injection import InjectionLogger
+from pypads.app.injections.streaming import StreamStatistics
 from pypads.model.models import ArtifactMetaModel, TrackedObjectModel, OutputModel
-from pypads.utils.logging_util import WriteFormats
+from pypads.utils.logging_util import WriteFormats, binary_write_format
 
 
 # TODO Literal for python 3.7 / 3.8?
@@ -41,13 +42,14 @@ class InputTO(TrackedObject):
         self._add_param(name, value, format, "keyword-argument")
 
     def _add_param(self, name, value, format, type):
+        format = binary_write_format(value, format)
         path = os.path.join(self._base_path(), self._get_artifact_path(name))
         meta = ArtifactMetaModel(path=path,
                                  description="Input to function with index {} and type {}".format(len(self.inputs),
                                                                                                   type),
                                  format=format)
+        self._store_data_artifact(value, meta)
         self.inputs.append(self.InputModel.ParamModel(content_format=format, name=name, value=meta, type=type))
-        self._store_artifact(value, meta)
 
     def _get_artifact_path(self, name):
         return os.path.join(str(id(self)), "input", name)
@@ -115,13 +117,14 @@ class OutputTO(TrackedObject):
         return cls.OutputModel
 
     def __init__(self, value, format, *args, tracked_by: LoggerCall, **kwargs):
+        format = binary_write_format(value, format)
         super().__init__(*args, content_format=format, tracked_by=tracked_by, **kwargs)
         path = os.path.join(self._base_path(), self._get_artifact_path())
         self.output = path
-        self._store_artifact(value, ArtifactMetaModel(path=path,
-                                                      description="Output of function call {}".format(
-                                                          self.tracked_by.original_call),
-                                                      format=format))
+        self._store_data_artifact(value, ArtifactMetaModel(path=path,
+                                                           description="Output of function call {}".format(
+                                                               self.tracked_by.original_call),
+                                                           format=format))
 
     def _get_artifact_path(self, name="output"):
         return super()._get_artifact_path(name)
@@ -155,5 +158,8 @@ class OutputILF(InjectionLogger):
         :param kwargs:
         :return:
         """
+        if isinstance(_pypads_result, StreamStatistics):
+            # Items of returned streams aren't buffered, only the statistics of the stream are stored
+            _pypads_result = _pypads_result.to_dict()
         output = OutputTO(_pypads_result, format=_pypads_write_format, tracked_by=_logger_call)
         output.store(_logger_output, key="FunctionOutput")
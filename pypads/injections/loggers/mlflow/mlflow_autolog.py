@@ -1,7 +1,6 @@
 import sys
 
 import gorilla
-from mlflow.utils.annotations import experimental
 
 from pypads.app.env import InjectionLoggerEnv
 from pypads.app.injections.injection import InjectionLogger
@@ -40,11 +39,12 @@ class MlflowAutologger(InjectionLogger):
     def __init__(self, *args, order=-1, **kwargs):
         super().__init__(*args, order=order, **kwargs)
 
-    @experimental
     def __call_wrapped__(self, ctx, *args, _args, _kwargs, _pypads_autologgers=None, _pypads_env=InjectionLoggerEnv,
                          **kwargs):
         """
             Function used to enable autologgers of mlflow.
+
+            .. Note:: Experimental: This method may change or be removed in a future release without warning.
         """
 
         if _pypads_autologgers is None:
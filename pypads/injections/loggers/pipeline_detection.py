@@ -1,7 +1,5 @@
 import os
 
-import mlflow
-from mlflow.utils.autologging_utils import try_mlflow_log
 from pydantic import BaseModel
 from pydantic.networks import HttpUrl
 from typing import Type
@@ -12,6 +10,7 @@ from pypads.app.injections.injection import InjectionLoggerCall, MultiInjectionL
 from pypads.model.models import TrackedObjectModel, OutputModel, ArtifactMetaModel
 from pypads.utils.logging_util import WriteFormats, get_temp_folder
 from pypads.utils.util import is_package_available
+from pypads.utils.lazy_mlflow import mlflow, try_mlflow_log
 
 
 # utilities
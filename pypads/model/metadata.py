@@ -6,7 +6,6 @@ from pydantic import validate_model, BaseModel, ValidationError
 
 from pypads.app.misc.inheritance import SuperStop
 from pypads.model.models import RunObjectModel
-from pypads.utils.util import has_direct_attr
 
 
 class ModelInterface(SuperStop):
@@ -48,22 +47,28 @@ class ModelObject(ModelInterface, metaclass=ABCMeta):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        fields = set(self.get_model_fields().keys())
-
-        # Add given fields to metadata object if not already existing
-        for key, val in kwargs.items():
-            if key in fields and not has_direct_attr(self, key):
-                setattr(self, key, val)
-                fields.remove(key)
-
-        # Add defaults which are not given
-        for key in fields:
-            if not has_direct_attr(self, key) and self.get_model_fields():
-                setattr(self, key, self.get_model_fields()[key].get_default())
+        # Add given fields or their defaults to metadata object if not already existing
+        attributes = self.__dict__
+        for key, field in self._instance_fields():
+            if key not in attributes:
+                setattr(self, key, kwargs[key] if key in kwargs else field.get_default())
         if issubclass(self.get_model_cls(), RunObjectModel) and (
                 not hasattr(self, "uri") or getattr(self, "uri") is None):
             setattr(self, "uri", "{}#{}".format(getattr(self, 'is_a'), getattr(self, 'uid')))
 
+    @classmethod
+    def _instance_fields(cls):
+        """
+        Get the fields of the model which aren't already defined on the class. They are collected once per class, the
+        model itself is only built when it is accessed.
+        :return: Tuple of field names and fields
+        """
+        fields = cls.__dict__.get("_model_instance_fields")
+        if fields is None:
+            fields = cls._model_instance_fields = tuple(
+                (key, field) for key, field in cls.get_model_cls().__fields__.items() if not hasattr(cls, key))
+        return fields
+
     def model(self):
         return self.get_model_cls().from_orm(self)
 
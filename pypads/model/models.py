@@ -172,6 +172,7 @@ class ArtifactMetaModel(BaseModel):
     path: str = ...
     description: str = ...
     format: WriteFormats = ...
+    digest: Optional[str] = None  # Digest of the payload if it is stored in the blob store
 
 
 class TagMetaModel(BaseModel):
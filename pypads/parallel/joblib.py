@@ -95,7 +95,7 @@ if is_package_available("joblib"):
             run = mlflow.active_run()
             if run:
                 from pypads.app.pypads import current_pads
-                if current_pads and current_pads.config["track_sub_processes"]:
+                if current_pads and current_pads.config.track_sub_processes:
                     # TODO Only cloudpickle args / kwargs if needed and not always.
                     pickled_params = (_pickle_tuple(args, kwargs), _cloudpickle_tuple(fn))
                     args = pickled_params
@@ -144,7 +144,7 @@ if is_package_available("joblib"):
         pads = current_pads
 
         if pads:
-            if pads.config["track_sub_processes"]:
+            if pads.config.track_sub_processes:
                 # Temporary hold handlers and remove them
                 from pypads.pads_loguru import logger_manager
                 logger_manager.temporary_remove()
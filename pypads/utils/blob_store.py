@@ -0,0 +1,306 @@
+"""
+Content-addressable store of logged data. Inputs and outputs of tracked functions are often the same data logged again
+and again, e.g. the training data of every fit of a grid search. The store keeps each payload once, addressed by a
+digest of its content, and is shared by all runs and experiments using the same pypads folder. Every run referencing a
+payload holds a reference on it. Payloads without references left are removed by a garbage collection.
+"""
+import glob
+import hashlib
+import os
+import pickle
+import uuid
+
+from pypads import logger
+from pypads.utils.logging_util import WriteFormats
+
+# Formats of which the payloads are stored in the blob store. Text, yaml and json stay readable in the run.
+BLOB_FORMATS = {WriteFormats.pickle, WriteFormats.npy, WriteFormats.npz, WriteFormats.columnar}
+
+# Key of the digest in the pointer artifacts of the runs
+BLOB_POINTER = "pypads.blob"
+
+# Run cache key of the digests referenced by the active run
+BLOB_REFS = "blob_refs"
+
+
+class _HashWriter:
+    """
+    File like object feeding everything written to it into a hash.
+    """
+
+    def __init__(self, hasher):
+        self._hasher = hasher
+
+    def write(self, data):
+        self._hasher.update(data)
+        return len(data)
+
+
+def _hasher():
+    """
+    Get a new hash object. xxhash is used if it is installed, otherwise sha1, which is hardware accelerated on most
+    platforms. The digest only addresses content and isn't used for security.
+    :return:
+    """
+    from pypads.importext.package_metadata import package_metadata
+    if package_metadata.is_available("xxhash"):
+        import xxhash
+        return xxhash.xxh3_128()
+    return hashlib.sha1()
+
+
+def digest(obj, write_format):
+    """
+    Compute the digest of an object. The object is pickled with protocol 5 into the hash. Contiguous buffers, e.g. the
+    data of numpy arrays, are hashed in place without being copied into the pickle stream.
+    :param obj: Object to hash
+    :param write_format: Format the object is stored with
+    :return: Hex digest
+    """
+    hasher = _hasher()
+    hasher.update(write_format.value.encode())
+
+    def buffer_callback(buffer):
+        try:
+            hasher.update(buffer.raw())
+        except BufferError:
+            # Non contiguous buffers are hashed as part of the stream
+            return True
+        return False
+
+    pickle.dump(obj, _HashWriter(hasher), protocol=5, buffer_callback=buffer_callback)
+    return hasher.hexdigest()
+
+
+class BlobStore:
+    """
+    Content-addressable store of payloads in a folder. A payload is stored as blobs/<digest[:2]>/<digest>.<extension>.
+    References are marker files refs/<digest>/<run_id> holding the tracking uri of the run, which makes adding a
+    reference idempotent and safe for concurrent processes. The number of referencing runs is the reference count of
+    a payload.
+    """
+
+    def __init__(self, folder):
+        """
+        :param folder: Folder of the store
+        """
+        self.folder = folder
+        self.writes = 0
+
+    def _blob_base(self, key):
+        return os.path.join(self.folder, "blobs", key[:2], key)
+
+    def _refs_folder(self, key):
+        return os.path.join(self.folder, "refs", key)
+
+    def path(self, key):
+        """
+        Get the path of a stored payload.
+        :param key: Digest of the payload
+        :return: Path or None if the payload isn't stored
+        """
+        paths = glob.glob(glob.escape(self._blob_base(key)) + ".*")
+        return paths[0] if paths else None
+
+    def put(self, obj, write_format, run_id, tracking_uri, key=None):
+        """
+        Store an object if its payload isn't stored yet and reference it by a run.
+        :param obj: Object to store
+        :param write_format: Format to store the object with
+        :param run_id: Id of the referencing run
+        :param tracking_uri: Tracking uri of the referencing run
+        :param key: Digest of the object if it is known already
+        :return: Digest of the payload
+        """
+        from pypads.utils.logging_util import write_file
+        if isinstance(write_format, str):
+            write_format = WriteFormats[write_format]
+        if key is None:
+            key = digest(obj, write_format)
+        # Reference first to keep a concurrent garbage collection from removing the payload
+        self.reference(key, run_id, tracking_uri)
+        if self.path(key) is None:
+            base = self._blob_base(key)
+            os.makedirs(os.path.dirname(base), exist_ok=True)
+            os.makedirs(os.path.join(self.folder, "tmp"), exist_ok=True)
+            # Write to a temporary file and move it to make the payload visible to other processes at once
+            written = write_file(os.path.join(self.folder, "tmp", uuid.uuid4().hex), obj, write_format)
+            os.replace(written, base + os.path.splitext(written)[1])
+            self.writes += 1
+        return key
+
+    def get(self, key):
+        """
+        Read a stored payload. Arrays are memory-mapped, see try_read_artifact.
+        :param key: Digest of the payload
+        :return: Stored object
+        """
+        from pypads.utils.logging_util import try_read_artifact
+        path = self.path(key)
+        if path is None:
+            raise KeyError("No payload with digest " + key + " is stored in " + self.folder)
+        return try_read_artifact(path, folder_lookup=False)
+
+    def reference(self, key, run_id, tracking_uri):
+        """
+        Reference a payload by a run. Referencing it again by the same run doesn't change the reference count.
+        :param key: Digest of the payload
+        :param run_id: Id of the run
+        :param tracking_uri: Tracking uri of the run
+        :return:
+        """
+        folder = self._refs_folder(key)
+        os.makedirs(folder, exist_ok=True)
+        ref = os.path.join(folder, run_id)
+        if not os.path.exists(ref):
+            with open(ref, "w") as fd:
+                fd.write(tracking_uri)
+
+    def release(self, key, run_id):
+        """
+        Remove the reference of a run on a payload.
+        :param key: Digest of the payload
+        :param run_id: Id of the run
+        :return:
+        """
+        try:
+            os.remove(os.path.join(self._refs_folder(key), run_id))
+        except FileNotFoundError:
+            pass
+
+    def references(self, key):
+        """
+        Get the runs referencing a payload.
+        :param key: Digest of the payload
+        :return: Dict of run ids to tracking uris
+        """
+        folder = self._refs_folder(key)
+        if not os.path.isdir(folder):
+            return {}
+        refs = {}
+        for run_id in os.listdir(folder):
+            try:
+                with open(os.path.join(folder, run_id)) as fd:
+                    refs[run_id] = fd.read()
+            except FileNotFoundError:
+                pass
+        return refs
+
+    def keys(self):
+        """
+        Get the digests of all stored payloads.
+        :return: Set of digests
+        """
+        return {os.path.basename(path).split(".")[0] for path in
+                glob.glob(os.path.join(glob.escape(self.folder), "blobs", "*", "*"))}
+
+    def collect(self, dry_run=False):
+        """
+        Release the references of deleted runs and remove the payloads without references. A reference is kept if
+        the tracking store of its run can't be reached. Payloads referenced while the collection runs may be removed,
+        run it while no run logs to the store.
+        :param dry_run: Only report the payloads which would be removed
+        :return: Digests of the removed payloads
+        """
+        removed = []
+        keys = self.keys()
+        if os.path.isdir(os.path.join(self.folder, "refs")):
+            # References of payloads which failed to be written
+            keys |= set(os.listdir(os.path.join(self.folder, "refs")))
+        for key in sorted(keys):
+            live = [run_id for run_id, tracking_uri in self.references(key).items()
+                    if _run_alive(run_id, tracking_uri)]
+            if live:
+                if not dry_run:
+                    for run_id in set(self.references(key)) - set(live):
+                        self.release(key, run_id)
+                continue
+            removed.append(key)
+            if not dry_run:
+                for run_id in self.references(key):
+                    self.release(key, run_id)
+                for path in glob.glob(glob.escape(self._blob_base(key)) + ".*"):
+                    os.remove(path)
+                try:
+                    os.rmdir(self._refs_folder(key))
+                except OSError:
+                    pass
+        logger.info("Blob store garbage collection " + ("would remove " if dry_run else "removed ") +
+                    str(len(removed)) + " payloads.")
+        return removed
+
+
+def _run_alive(run_id, tracking_uri):
+    """
+    Check if a run still exists and isn't deleted.
+    :param run_id: Id of the run
+    :param tracking_uri: Tracking uri of the run
+    :return: False if the run was deleted or doesn't exist
+    """
+    from mlflow.entities import LifecycleStage
+    from mlflow.exceptions import MlflowException
+    from mlflow.protos.databricks_pb2 import RESOURCE_DOES_NOT_EXIST, ErrorCode
+    from pypads.utils.lazy_mlflow import client
+    try:
+        return client(tracking_uri).get_run(run_id).info.lifecycle_stage != LifecycleStage.DELETED
+    except MlflowException as e:
+        if e.error_code == ErrorCode.Name(RESOURCE_DOES_NOT_EXIST):
+            return False
+        logger.warning("Couldn't check run " + run_id + ". Keeping its references. " + str(e))
+        return True
+    except Exception as e:
+        logger.warning("Couldn't check run " + run_id + ". Keeping its references. " + str(e))
+        return True
+
+
+def blob_store():
+    """
+    Get the blob store in the pypads folder.
+    :return: BlobStore
+    """
+    from pypads.app.pypads import get_current_pads
+    pads = get_current_pads()
+    store = pads.cache.get("blob_store")
+    if store is None:
+        store = BlobStore(os.path.join(pads.folder, "blob_store"))
+        pads.cache.add("blob_store", store)
+    return store
+
+
+def store_blob(obj, write_format):
+    """
+    Store an object in the blob store and reference it by the active run. A payload referenced already by the run
+    isn't referenced again.
+    :param obj: Object to store
+    :param write_format: Format to store the object with
+    :return: Digest of the payload or None if the object isn't stored in the blob store
+    """
+    from pypads.app.pypads import get_current_pads
+    pads = get_current_pads()
+    if isinstance(write_format, str):
+        write_format = WriteFormats[write_format]
+    if write_format not in BLOB_FORMATS:
+        return None
+    enabled = pads.config.get("blob_store", None)
+    run = pads.api.active_run()
+    if enabled is None:
+        # Payloads of runs in remote stores have to stay in the run to be found by other machines
+        from pypads.utils.logging_util import local_artifact_root
+        enabled = local_artifact_root(run.info.artifact_uri) is not None
+    if not enabled:
+        return None
+    store = blob_store()
+    refs = pads.cache.run_get(BLOB_REFS)
+    if refs is None:
+        refs = pads.cache.run_cache().cache.setdefault(BLOB_REFS, set())
+    try:
+        key = digest(obj, write_format)
+    except Exception as e:
+        logger.warning("Couldn't hash " + str(type(obj)) + " for the blob store. Storing it in the run instead. " +
+                       str(e))
+        return None
+    if key in refs and store.path(key) is not None:
+        return key
+    store.put(obj, write_format, run.info.run_id, pads.backend.uri, key=key)
+    refs.add(key)
+    return key
@@ -0,0 +1,265 @@
+"""
+Lazy access to mlflow. Importing mlflow pulls in SQLAlchemy, alembic, protobuf and more. PyPads modules therefore access
+mlflow through the proxy defined here, which imports mlflow only when an attribute of it is accessed. Questions about
+the run state can be answered without importing mlflow at all, as no run can be active as long as mlflow isn't loaded.
+"""
+import importlib
+import sys
+import threading
+
+
+class LazyModule:
+    """
+    Proxy of a module. The module is imported on the first attribute access.
+    """
+
+    def __init__(self, name):
+        """
+        :param name: Name of the proxied module
+        """
+        self._pypads_name = name
+        self._pypads_module = None
+        self._pypads_on_load = []
+
+    def on_load(self, fn):
+        """
+        Register a function to be called with the module as soon as it is loaded by the proxy.
+        :param fn: Function taking the loaded module
+        :return:
+        """
+        self._pypads_on_load.append(fn)
+
+    @property
+    def is_loaded(self):
+        return self._pypads_module is not None
+
+    def load(self):
+        """
+        Import the proxied module.
+        :return: The module
+        """
+        if self._pypads_module is None:
+            module = importlib.import_module(self._pypads_name)
+            self._pypads_module = module
+            for fn in self._pypads_on_load:
+                fn(module)
+        return self._pypads_module
+
+    def __getattr__(self, item):
+        return getattr(self.load(), item)
+
+    def __repr__(self):
+        return "<lazy module '{}' ({})>".format(self._pypads_name, "loaded" if self.is_loaded else "not loaded")
+
+
+class MlflowProxy(LazyModule):
+    """
+    Proxy of mlflow answering run state questions without importing mlflow. Setting the tracking uri is deferred until
+    mlflow gets loaded.
+    """
+
+    def __init__(self):
+        super().__init__("mlflow")
+        self._pypads_tracking_uri = None
+        self.on_load(self._apply_tracking_uri)
+
+    def _apply_tracking_uri(self, module):
+        if self._pypads_tracking_uri is not None:
+            module.set_tracking_uri(self._pypads_tracking_uri)
+
+    @property
+    def is_imported(self):
+        """
+        Check if mlflow was imported by anyone.
+        :return:
+        """
+        return self.is_loaded or self._pypads_name in sys.modules
+
+    def set_tracking_uri(self, uri):
+        """
+        Set the tracking uri of mlflow. If mlflow isn't imported yet the uri is set as soon as it gets loaded.
+        :param uri: Tracking uri
+        :return:
+        """
+        self._pypads_tracking_uri = uri
+        if self.is_imported:
+            self.load().set_tracking_uri(uri)
+
+    def active_run(self):
+        """
+        Get the active mlflow run.
+        :return: The active run or None if mlflow isn't imported yet
+        """
+        if not self.is_imported:
+            return None
+        return self.load().active_run()
+
+
+mlflow = MlflowProxy()
+
+
+def try_mlflow_log(fn, *args, **kwargs):
+    """
+    Call a mlflow logging function and only warn on failure.
+    :param fn: Logging function
+    :return:
+    """
+    from mlflow.utils.autologging_utils import try_mlflow_log as _try_mlflow_log
+    return _try_mlflow_log(fn, *args, **kwargs)
+
+
+# Number of keep-alive connections kept per host of a REST tracking store
+POOL_SIZE = 10
+
+_clients = {}
+_clients_lock = threading.Lock()
+_pooled_store_class = None
+
+
+class PooledSessions(threading.local):
+    """
+    Keep-alive sessions of the REST stores of pypads, one per thread. Sessions aren't shared between threads, as
+    requests doesn't guarantee sessions to be thread-safe, and not with other users of mlflow in the process.
+    """
+
+    def __init__(self, pool_size=POOL_SIZE):
+        """
+        :param pool_size: Number of connections kept alive per host
+        """
+        self._pool_size = pool_size
+        self._session = None
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=self._pool_size, pool_maxsize=self._pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+
+class _SessionRequests:
+    """
+    Stand-in of the requests module for the rest utils of mlflow. Requests are sent over the keep-alive sessions of
+    pypads, everything else is taken from the requests module.
+    """
+
+    def __init__(self, sessions):
+        self._sessions = sessions
+
+    def request(self, *args, **kwargs):
+        return self._sessions.session.request(*args, **kwargs)
+
+    def __getattr__(self, item):
+        import requests
+        return getattr(requests, item)
+
+
+def _pooling_supported():
+    """
+    Check if the rest utils of the installed mlflow can be run over the sessions of pypads. They have to send their
+    requests with requests.request and the REST store has to call them like mlflow 1.x up to 1.11 does. Later versions
+    of mlflow keep their own sessions.
+    :return: True if the REST stores of pypads can be pooled
+    """
+    import inspect
+    import requests
+    import mlflow as _mlflow
+    from mlflow.store.tracking import rest_store
+    from mlflow.utils import rest_utils
+    if not _mlflow.__version__.startswith("1."):
+        return False
+    if getattr(rest_utils, "requests", None) is not requests or hasattr(rest_utils, "_get_request_session"):
+        return False
+    if not all(hasattr(module, name) for module, name in ((rest_store, "_METHOD_TO_INFO"),
+                                                           (rest_utils, "http_request"),
+                                                           (rest_utils, "call_endpoint"))):
+        return False
+    try:
+        return list(inspect.signature(rest_store.RestStore._call_endpoint).parameters) == ["self", "api",
+                                                                                          "json_body"] and \
+            list(inspect.signature(rest_utils.call_endpoint).parameters) == ["host_creds", "endpoint", "method",
+                                                                             "json_body", "response_proto"]
+    except (TypeError, ValueError):
+        return False
+
+
+def _pooled_call_endpoint(sessions):
+    """
+    Build a copy of call_endpoint of the mlflow rest utils sending its requests over the given sessions. The copy runs
+    the code of mlflow with its headers, authentication, error handling and retries, only the requests module it sees
+    is replaced.
+    :param sessions: PooledSessions
+    :return: call_endpoint
+    """
+    import types
+    from mlflow.utils import rest_utils
+    namespace = dict(vars(rest_utils))
+    namespace["requests"] = _SessionRequests(sessions)
+    for name in ("http_request", "call_endpoint"):
+        fn = getattr(rest_utils, name)
+        copy = types.FunctionType(fn.__code__, namespace, fn.__name__, fn.__defaults__, fn.__closure__)
+        copy.__kwdefaults__ = fn.__kwdefaults__
+        namespace[name] = copy
+    return namespace["call_endpoint"]
+
+
+def pooled_rest_store(store):
+    """
+    Wrap a mlflow REST store to send its requests over keep-alive sessions of pypads. The rest utils of mlflow open a
+    new connection for every request and can't be given a session, the store therefore calls a copy of them which
+    sends its requests over the sessions. The store is returned unchanged if the installed mlflow doesn't match.
+    :param store: RestStore
+    :return: Pooled RestStore
+    """
+    global _pooled_store_class
+    if _pooled_store_class is None:
+        if not _pooling_supported():
+            from pypads import logger
+            logger.debug("REST stores of mlflow " + mlflow.__version__ + " aren't pooled by pypads.")
+            _pooled_store_class = False
+        else:
+            from mlflow.store.tracking.rest_store import RestStore, _METHOD_TO_INFO
+
+            class PooledRestStore(RestStore):
+
+                def __init__(self, get_host_creds, sessions=None):
+                    super().__init__(get_host_creds)
+                    self.sessions = sessions or PooledSessions()
+                    self._pooled_call_endpoint = _pooled_call_endpoint(self.sessions)
+
+                def _call_endpoint(self, api, json_body):
+                    endpoint, method = _METHOD_TO_INFO[api]
+                    return self._pooled_call_endpoint(self.get_host_creds(), endpoint, method, json_body,
+                                                      api.Response())
+
+            _pooled_store_class = PooledRestStore
+    if _pooled_store_class is False or isinstance(store, _pooled_store_class):
+        return store
+    return _pooled_store_class(store.get_host_creds)
+
+
+def client(uri=None):
+    """
+    Get the mlflow tracking client of a tracking uri. Clients are created once per uri and shared, creating a client
+    constructs a new tracking store. Clients of REST stores send their requests over pooled keep-alive sessions, other
+    users of mlflow aren't affected.
+    :param uri: Tracking uri of the client. Defaults to the current tracking uri.
+    :return: MlflowClient
+    """
+    if uri is None:
+        uri = mlflow.get_tracking_uri()
+    mlf = _clients.get(uri)
+    if mlf is None:
+        with _clients_lock:
+            mlf = _clients.get(uri)
+            if mlf is None:
+                from mlflow.tracking import MlflowClient
+                mlf = MlflowClient(uri)
+                if uri.startswith("http://") or uri.startswith("https://"):
+                    mlf._tracking_client.store = pooled_rest_store(mlf._tracking_client.store)
+                _clients[uri] = mlf
+    return mlf
@@ -1,15 +1,16 @@
 import json
+import mmap
 import os
 import pickle
+import sys
+import threading
 from collections import OrderedDict
 from enum import Enum
 
-import mlflow
 import yaml
-from mlflow.tracking import MlflowClient
-from mlflow.utils.autologging_utils import try_mlflow_log
 
 from pypads import logger
+from pypads.utils.lazy_mlflow import mlflow, try_mlflow_log, client
 
 
 def add_to_store_object(source, obj, store=True):
@@ -56,6 +57,10 @@ class WriteFormats(Enum):
     text = 'text'
     yaml = 'yaml'
     json = 'json'
+    npy = 'npy'
+    npz = 'npz'
+    columnar = 'columnar'
+    blob = 'blob'
 
 
 class ReadFormats(Enum):
@@ -63,12 +68,100 @@ class ReadFormats(Enum):
     txt = 'txt'
     yaml = 'yaml'
     json = 'json'
+    npy = 'npy'
+    npz = 'npz'
+    feather = 'feather'
+    blob = 'blob'
+
+
+# Marker of pickle files with out-of-band buffers appended after the pickle stream
+PICKLE_BUFFERS = "pypads.pickle5"
+
+# Alignment of the out-of-band buffers in a pickle file
+PICKLE_BUFFER_ALIGNMENT = 64
+
+
+def binary_write_format(obj, write_format):
+    """
+    Get the format to write an object with. Numpy arrays and pandas DataFrames configured to be written as text or
+    pickle are written as npy or columnar instead, if binary artifacts are enabled.
+    :param obj: Object to write
+    :param write_format: Configured format
+    :return: WriteFormats
+    """
+    if isinstance(write_format, str):
+        write_format = WriteFormats[write_format]
+    if write_format not in (WriteFormats.text, WriteFormats.pickle):
+        return write_format
+    # Don't import numpy or pandas if they weren't used to create the object
+    numpy, pandas = sys.modules.get("numpy"), sys.modules.get("pandas")
+    if numpy is None and pandas is None:
+        return write_format
+    from pypads.app.pypads import get_current_pads
+    if not get_current_pads().config.get("binary_artifacts", True):
+        return write_format
+    if numpy is not None and isinstance(obj, numpy.ndarray) and not obj.dtype.hasobject:
+        return WriteFormats.npy
+    if pandas is not None and isinstance(obj, pandas.DataFrame):
+        return WriteFormats.columnar
+    return write_format
+
+
+def _dump_pickle(obj, fd):
+    """
+    Pickle an object with protocol 5. Contiguous buffers of the object, e.g. the data of numpy arrays, are written
+    out-of-band after the pickle stream as they are, without copying them into the stream. A header in front of the
+    stream holds the length of the stream and of the buffers.
+    :param obj: Object to pickle
+    :param fd: File opened for binary writing
+    :return:
+    """
+    buffers = []
+
+    def buffer_callback(buffer):
+        try:
+            buffers.append(buffer.raw())
+        except BufferError:
+            # Non contiguous buffers are copied into the stream
+            return True
+        return False
+
+    stream = pickle.dumps(obj, protocol=5, buffer_callback=buffer_callback)
+    if not buffers:
+        fd.write(stream)
+        return
+    pickle.dump((PICKLE_BUFFERS, len(stream), [buffer.nbytes for buffer in buffers]), fd, protocol=5)
+    fd.write(stream)
+    for buffer in buffers:
+        fd.write(b"\0" * (-fd.tell() % PICKLE_BUFFER_ALIGNMENT))
+        fd.write(buffer)
+
+
+def _load_pickle(fd):
+    """
+    Unpickle a file written by _dump_pickle or plain pickle. Out-of-band buffers are memory-mapped copy-on-write
+    instead of read, unpickled arrays are loaded lazily but stay writable without changing the file.
+    :param fd: File opened for binary reading
+    :return: Unpickled object
+    """
+    obj = pickle.load(fd)
+    if not (isinstance(obj, tuple) and len(obj) == 3 and obj[0] == PICKLE_BUFFERS):
+        return obj
+    _, stream_length, lengths = obj
+    stream_start = fd.tell()
+    mapped = memoryview(mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_COPY))
+    buffers = []
+    offset = stream_start + stream_length
+    for length in lengths:
+        offset += -offset % PICKLE_BUFFER_ALIGNMENT
+        buffers.append(mapped[offset:offset + length])
+        offset += length
+    return pickle.loads(mapped[stream_start:stream_start + stream_length], buffers=buffers)
 
 
 # extract all tags of runs by experiment id
 def all_tags(experiment_id):
-    client = MlflowClient(mlflow.get_tracking_uri())
-    ds_infos = client.list_run_infos(experiment_id)
+    ds_infos = client(mlflow.get_tracking_uri()).list_run_infos(experiment_id)
     for i in ds_infos:
         yield mlflow.get_run(i.run_id).data.tags
 
@@ -82,6 +175,7 @@ def try_read_artifact(file_name, folder_lookup=True):
     # TODO make defensive
     path = file_name
     if folder_lookup:
+        flush_artifacts()
         base_path = get_run_folder()
         path = os.path.join(base_path, "artifacts", file_name)
 
@@ -93,10 +187,30 @@ def try_read_artifact(file_name, folder_lookup=True):
     def read_pickle(p):
         try:
             with open(p, "rb") as fd:
-                return pickle.load(fd)
+                return _load_pickle(fd)
         except Exception as e:
             logger.warning("Couldn't read pickle file. " + str(e))
 
+    def read_npy(p):
+        import numpy
+        # Copy-on-write like out-of-band pickle buffers, writes to the array don't reach the artifact
+        return numpy.load(p, mmap_mode="c")
+
+    def read_npz(p):
+        # Arrays of npz archives are read lazily on access
+        import numpy
+        return numpy.load(p)
+
+    def read_feather(p):
+        from pyarrow import feather
+        return feather.read_table(p, memory_map=True).to_pandas()
+
+    def read_blob(p):
+        # Pointer to a payload in the blob store
+        from pypads.utils.blob_store import blob_store, BLOB_POINTER
+        with open(p, "r") as fd:
+            return blob_store().get(json.load(fd)[BLOB_POINTER])
+
     def read_yaml(p):
         try:
             with open(p, "r") as fd:
@@ -117,7 +231,11 @@ def try_read_artifact(file_name, folder_lookup=True):
         ReadFormats.pickle: read_pickle,
         ReadFormats.txt: read_text,
         ReadFormats.yaml: read_yaml,
-        ReadFormats.json: read_json
+        ReadFormats.json: read_json,
+        ReadFormats.npy: read_npy,
+        ReadFormats.npz: read_npz,
+        ReadFormats.feather: read_feather,
+        ReadFormats.blob: read_blob
     }
 
     read_format = path.split('.')[-1]
@@ -143,12 +261,33 @@ def try_write_artifact(file_name, obj, write_format, preserve_folder=True):
     :param obj:
     :return:
     """
-    base_path = get_temp_folder()
-    path = os.path.join(base_path, file_name)
+    sync = artifact_sync()
+    relative_path = file_name if preserve_folder and not os.path.isabs(file_name) else os.path.basename(file_name)
+    if sync.artifact_root is not None:
+        # Write straight into the artifacts of a run in a local store
+        path = os.path.join(sync.artifact_root, relative_path)
+    else:
+        path = os.path.join(get_temp_folder(), file_name)
 
     if not os.path.exists(os.path.dirname(path)):
         os.makedirs(os.path.dirname(path))
 
+    path = write_file(path, obj, write_format)
+
+    # Files staged in the temp folder are synced one by one
+    if path is not None and sync.artifact_root is None:
+        sync.mark(path, os.path.dirname(relative_path) or None)
+
+
+def write_file(path, obj, write_format):
+    """
+    Write an object to a local file.
+    :param path: Path of the file without the extension of the format
+    :param obj: Object to write
+    :param write_format: Format to write with
+    :return: Path of the written file or None if the format isn't supported
+    """
+
     # Functions for the options to write to
     def write_text(p, o):
         with open(p + ".txt", "w+") as fd:
@@ -158,12 +297,55 @@ def try_write_artifact(file_name, obj, write_format, preserve_folder=True):
     def write_pickle(p, o):
         try:
             with open(p + ".pickle", "wb+") as fd:
-                pickle.dump(o, fd)
+                _dump_pickle(o, fd)
                 return fd.name
         except Exception as e:
             logger.warning("Couldn't pickle output. Trying to save toString instead. " + str(e))
             return write_text(p, o)
 
+    def write_npy(p, o):
+        try:
+            import numpy
+            with open(p + ".npy", "wb+") as fd:
+                numpy.save(fd, o, allow_pickle=False)
+                return fd.name
+        except Exception as e:
+            logger.warning("Couldn't write output as npy. Trying to pickle it instead. " + str(e))
+            return write_pickle(p, o)
+
+    def write_npz(p, o):
+        try:
+            import numpy
+            with open(p + ".npz", "wb+") as fd:
+                if isinstance(o, dict):
+                    numpy.savez(fd, **o)
+                else:
+                    numpy.savez(fd, *o)
+                return fd.name
+        except Exception as e:
+            logger.warning("Couldn't write output as npz. Trying to pickle it instead. " + str(e))
+            return write_pickle(p, o)
+
+    def write_blob(p, o):
+        # Pointer to a payload in the blob store, o is the digest
+        from pypads.utils.blob_store import BLOB_POINTER
+        with open(p + ".blob", "w+") as fd:
+            json.dump({BLOB_POINTER: o}, fd)
+            return fd.name
+
+    def write_columnar(p, o):
+        # Feather files are memory-mapped column by column. Without pyarrow the columns are pickled out-of-band.
+        from pypads.importext.package_metadata import package_metadata
+        if not package_metadata.is_available("pyarrow"):
+            return write_pickle(p, o)
+        try:
+            from pyarrow import feather
+            feather.write_feather(o, p + ".feather", compression="uncompressed")
+            return p + ".feather"
+        except Exception as e:
+            logger.warning("Couldn't write output as feather. Trying to pickle it instead. " + str(e))
+            return write_pickle(p, o)
+
     def write_yaml(p, o):
         try:
             with open(p + ".yaml", "w+") as fd:
@@ -195,7 +377,11 @@ def try_write_artifact(file_name, obj, write_format, preserve_folder=True):
         WriteFormats.pickle: write_pickle,
         WriteFormats.text: write_text,
         WriteFormats.yaml: write_yaml,
-        WriteFormats.json: write_json
+        WriteFormats.json: write_json,
+        WriteFormats.npy: write_npy,
+        WriteFormats.npz: write_npz,
+        WriteFormats.columnar: write_columnar,
+        WriteFormats.blob: write_blob
     }
 
     # Write to disk
@@ -206,16 +392,105 @@ def try_write_artifact(file_name, obj, write_format, preserve_folder=True):
             logger.warning("Configured write format " + write_format + " not supported! ")
             return
 
-    path = options[write_format](path, obj)
-    if preserve_folder:
-        in_folder = os.path.join(base_path, file_name.split(os.sep)[0])
-        # Log artifact to mlflow
-        if os.path.isdir(in_folder):
-            try_mlflow_log(mlflow.log_artifact, in_folder)
-        else:
-            try_mlflow_log(mlflow.log_artifact, path)
-    else:
-        try_mlflow_log(mlflow.log_artifact, path)
+    return options[write_format](path, obj)
+
+
+class ArtifactSync:
+    """
+    Sync of the written files of a run to the artifacts of the run. If the artifacts of the run are stored locally,
+    files are written straight into the artifact folder and nothing has to be synced. Otherwise files are staged in the
+    temp folder, marked as dirty and only dirty files are uploaded, each one directly to its artifact path. The uploads
+    are either done as soon as a file is marked or deferred until the sync is flushed, at the latest when the run ends.
+    """
+
+    def __init__(self, run_id, deferred=False, artifact_root=None):
+        """
+        :param run_id: Id of the run
+        :param deferred: Defer the uploads until the sync is flushed
+        :param artifact_root: Local artifact folder of the run. None if the artifacts are stored remotely.
+        """
+        self._run_id = run_id
+        self._deferred = deferred
+        self.artifact_root = artifact_root
+        self._dirty = OrderedDict()
+        self._lock = threading.Lock()
+        self.uploads = 0
+
+    def mark(self, path, artifact_path=None):
+        """
+        Mark a new or changed file in the temp folder.
+        :param path: Local path of the file
+        :param artifact_path: Folder of the artifact in the run. None for the root folder.
+        :return:
+        """
+        with self._lock:
+            # A file marked again is uploaded once
+            self._dirty.pop(path, None)
+            self._dirty[path] = artifact_path
+        if not self._deferred:
+            self.flush()
+
+    def flush(self):
+        """
+        Upload all dirty files.
+        :return:
+        """
+        with self._lock:
+            dirty, self._dirty = self._dirty, OrderedDict()
+        for path, artifact_path in dirty.items():
+            if os.path.exists(path):
+                try_mlflow_log(client().log_artifact, self._run_id, path, artifact_path)
+                self.uploads += 1
+
+
+# Run cache key of the artifact sync of a run
+ARTIFACT_SYNC = "artifact_sync"
+
+
+def artifact_sync():
+    """
+    Get the artifact sync of the active run.
+    :return: ArtifactSync
+    """
+    from pypads.app.pypads import get_current_pads
+    pads = get_current_pads()
+    sync = pads.cache.run_get(ARTIFACT_SYNC)
+    if sync is None:
+        run = pads.api.active_run()
+        sync = pads.cache.run_cache().cache.setdefault(ARTIFACT_SYNC, ArtifactSync(
+            run.info.run_id, deferred=pads.config.get("artifact_sync", "immediate") == "deferred",
+            artifact_root=local_artifact_root(run.info.artifact_uri) if pads.config.get("direct_artifact_writes",
+                                                                                        True) else None))
+    return sync
+
+
+def local_artifact_root(artifact_uri):
+    """
+    Get the local folder of an artifact uri.
+    :param artifact_uri: Artifact uri of a run
+    :return: Local path or None if the artifacts aren't stored in the local file system
+    """
+    if os.path.isabs(artifact_uri):
+        return artifact_uri
+    from urllib.parse import urlparse
+    parsed = urlparse(artifact_uri)
+    if parsed.scheme == "file" and parsed.netloc in ("", "localhost"):
+        from mlflow.utils.file_utils import local_file_uri_to_path
+        return local_file_uri_to_path(artifact_uri)
+    return None
+
+
+def flush_artifacts():
+    """
+    Upload the dirty files of the active run if any are left.
+    :return:
+    """
+    from pypads.app.pypads import get_current_pads
+    pads = get_current_pads()
+    if pads.api.active_run() is not None:
+        sync = pads.cache.run_get(ARTIFACT_SYNC)
+        if sync is not None:
+            sync.flush()
 
 
 def _to_artifact_meta_name(name):
@@ -1,13 +1,14 @@
+import asyncio
 import inspect
 import operator
 import threading
 from functools import reduce
 
-import mlflow
 import pkg_resources
 
 from pypads import logger
 from pypads.app.misc.caches import Cache
+from pypads.utils.lazy_mlflow import mlflow
 
 
 def get_class_that_defined_method(meth):
@@ -29,6 +30,22 @@ def get_class_that_defined_method(meth):
     return getattr(meth, '__objclass__', None)  # handle special descriptor objects
 
 
+def run_coroutine(coroutine):
+    """
+    Run a coroutine to completion from synchronous code. If an event loop is already running in this thread the
+    coroutine is run on its own loop in a helper thread.
+    :param coroutine: Coroutine to run
+    :return: Result of the coroutine
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
 def dict_merge(*dicts):
     """
     Simple merge of dicts
@@ -0,0 +1,89 @@
+import os
+
+from test.base_test import TEST_FOLDER, BaseTest
+
+
+class ArtifactSyncTest(BaseTest):
+
+    def _artifacts(self, tracker, run_id):
+        root = os.path.join(tracker.backend.mlf.get_run(run_id).info.artifact_uri.replace("file://", ""))
+        return {os.path.relpath(os.path.join(folder, name), root) for folder, _, names in os.walk(root)
+                for name in names}
+
+    def test_incremental_sync(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        from pypads.utils.logging_util import try_write_artifact, artifact_sync, WriteFormats
+        tracker = PyPads(uri=TEST_FOLDER, config={"include_default_mappings": False, "direct_artifact_writes": False},
+                         autostart=True)
+        run_id = tracker.api.active_run().info.run_id
+        sync = artifact_sync()
+        uploads = sync.uploads
+        for i in range(20):
+            try_write_artifact(os.path.join("Sync", "Calls", str(i)), {"call": i}, WriteFormats.json)
+        try_write_artifact("top", "value", WriteFormats.text)
+        try_write_artifact(os.path.join("Sync", "flat"), "value", WriteFormats.text, preserve_folder=False)
+        artifacts = self._artifacts(tracker, run_id)
+
+        # --------------------------- asserts ---------------------------
+        # Every write uploads only the written file
+        assert sync.uploads - uploads == 22
+        assert {os.path.join("Sync", "Calls", str(i) + ".json") for i in range(20)} <= artifacts
+        assert "top.txt" in artifacts and "flat.txt" in artifacts
+        assert tracker.api.artifact(os.path.join("Sync", "Calls", "3.json")) == {"call": 3}
+        # !-------------------------- asserts ---------------------------
+
+    def test_deferred_sync(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        from pypads.utils.logging_util import try_write_artifact, WriteFormats
+        tracker = PyPads(uri=TEST_FOLDER, config={"include_default_mappings": False, "artifact_sync": "deferred",
+                                                  "direct_artifact_writes": False}, autostart=True)
+        run_id = tracker.api.active_run().info.run_id
+        for i in range(5):
+            try_write_artifact(os.path.join("Deferred", "value"), i, WriteFormats.text)
+        pending = self._artifacts(tracker, run_id)
+        tracker.api.end_run()
+        artifacts = self._artifacts(tracker, run_id)
+
+        # --------------------------- asserts ---------------------------
+        assert os.path.join("Deferred", "value.txt") not in pending
+        assert os.path.join("Deferred", "value.txt") in artifacts
+        with open(os.path.join(tracker.backend.mlf.get_run(run_id).info.artifact_uri.replace("file://", ""),
+                               "Deferred", "value.txt")) as f:
+            assert f.read() == "4"
+        # !-------------------------- asserts ---------------------------
+
+    def test_direct_writes(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        from pypads.utils.logging_util import try_write_artifact, artifact_sync, get_temp_folder, WriteFormats
+        tracker = PyPads(uri=TEST_FOLDER, config={"include_default_mappings": False}, autostart=True)
+        run_id = tracker.api.active_run().info.run_id
+        sync = artifact_sync()
+        try_write_artifact(os.path.join("Direct", "Calls", "0"), {"call": 0}, WriteFormats.json)
+        try_write_artifact(os.path.join("Direct", "flat"), "value", WriteFormats.text, preserve_folder=False)
+        staged = os.path.join(get_temp_folder(), "Direct")
+        artifacts = self._artifacts(tracker, run_id)
+
+        # --------------------------- asserts ---------------------------
+        assert sync.artifact_root is not None and sync.uploads == 0
+        assert os.path.join("Direct", "Calls", "0.json") in artifacts and "flat.txt" in artifacts
+        # Nothing is staged in the temp folder
+        assert not os.path.exists(staged)
+        assert tracker.api.artifact(os.path.join("Direct", "Calls", "0.json")) == {"call": 0}
+        # !-------------------------- asserts ---------------------------
+
+    def test_local_artifact_root(self):
+        # --------------------------- setup of the tracking ---------------------------
+        from pypads.utils.logging_util import local_artifact_root
+
+        # --------------------------- asserts ---------------------------
+        assert local_artifact_root("/tmp/mlruns/0/run/artifacts") == "/tmp/mlruns/0/run/artifacts"
+        assert local_artifact_root("file:///tmp/mlruns/0/run/artifacts") == "/tmp/mlruns/0/run/artifacts"
+        assert local_artifact_root("s3://bucket/0/run/artifacts") is None
+        assert local_artifact_root("http://localhost:5000/artifacts") is None
+        # !-------------------------- asserts ---------------------------
@@ -0,0 +1,92 @@
+import asyncio
+import inspect
+
+from pypads.app.injections.injection import InjectionLogger
+from pypads.importext.mappings import SerializedMapping
+from test.base_test import TEST_FOLDER, BaseTest
+
+async_mapping = """
+metadata:
+  author: "PyPads"
+  version: "0.0.1"
+  library:
+    name: "test_classes"
+    version: "0.1"
+
+mappings:
+    :test_classes.dummy_classes.AsyncDummy.serve:
+            hooks: "pypads_log"
+"""
+
+config = {
+    "recursion_identity": False,
+    "recursion_depth": -1}
+
+
+class AsyncLogger(InjectionLogger):
+    """ Logger with coroutine functions as __pre__ and __post__. """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.results = []
+        self.calls = []
+
+    async def __pre__(self, ctx, *args, _logger_call, _args, _kwargs, **kwargs):
+        await asyncio.sleep(0)
+        return "pre"
+
+    async def __post__(self, ctx, *args, _logger_call, _pypads_pre_return, _pypads_result, _args, _kwargs, **kwargs):
+        await asyncio.sleep(0)
+        self.results.append((_pypads_pre_return, _pypads_result))
+        self.calls.append(_logger_call)
+
+
+class AsyncTrackingTest(BaseTest):
+
+    def test_coroutine_function(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        async_logger = AsyncLogger()
+        tracker = PyPads(uri=TEST_FOLDER, config={**config, "include_default_mappings": False, "wrap_plan": False},
+                         mappings=[SerializedMapping("async", async_mapping)],
+                         hooks={"async_logger": {"on": ["pypads_log"]}}, events={"async_logger": async_logger},
+                         autostart=False)
+        tracker.activate_tracking(reload_modules=True)
+        tracker.start_track()
+        from test_classes.dummy_classes import AsyncDummy
+        dummy = AsyncDummy()
+
+        async def serve():
+            return await asyncio.gather(*[dummy.serve(0.05) for _ in range(3)])
+
+        results = asyncio.run(serve())
+
+        # --------------------------- asserts ---------------------------
+        assert inspect.iscoroutinefunction(AsyncDummy.serve)
+        assert results == [0.05] * 3
+        # The loggers awaited the call and got its result instead of a coroutine
+        assert async_logger.results == [("pre", 0.05)] * 3
+        assert all(call.child_time >= 0.05 for call in async_logger.calls)
+        assert tracker.call_tracker.call_depth() == 0
+        # !-------------------------- asserts ---------------------------
+
+    def test_async_logger_on_function(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        async_logger = AsyncLogger()
+        tracker = PyPads(uri=TEST_FOLDER, config=config, hooks={"async_logger": {"on": ["pypads_log"]}},
+                         events={"async_logger": async_logger}, autostart=True)
+
+        def experiment():
+            return "I'm a return value."
+
+        experiment = tracker.api.track(experiment, anchors=["pypads_log"])
+        result = experiment()
+
+        # --------------------------- asserts ---------------------------
+        # Async functionality of a logger is run to completion on synchronous calls
+        assert result == "I'm a return value."
+        assert async_logger.results == [("pre", "I'm a return value.")]
+        # !-------------------------- asserts ---------------------------
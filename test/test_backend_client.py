@@ -0,0 +1,108 @@
+import threading
+
+from test.base_test import TEST_FOLDER, BaseTest
+
+
+class BackendClientTest(BaseTest):
+
+    def test_shared_client(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        tracker = PyPads(uri=TEST_FOLDER, autostart=True)
+        from mlflow.tracking._tracking_service import utils
+        constructions = []
+        get_store = utils._get_store
+
+        def counting_get_store(*args, **kwargs):
+            constructions.append(args)
+            return get_store(*args, **kwargs)
+
+        utils._get_store = counting_get_store
+        try:
+            clients = []
+            threads = [threading.Thread(target=lambda: clients.append(tracker.backend.mlf)) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            for i in range(10):
+                tracker.api.log_metric("metric", i, step=i)
+                tracker.api.log_param("param_" + str(i), i)
+                tracker.api.set_tag("tag", i)
+            run = tracker.api.get_run(tracker.api.active_run().info.run_id)
+        finally:
+            utils._get_store = get_store
+
+        # --------------------------- asserts ---------------------------
+        assert all(mlf is tracker.backend.mlf for mlf in clients)
+        assert constructions == []
+        assert run.data.metrics["metric"] == 9
+        assert run.data.params["param_3"] == "3"
+        assert run.data.tags["tag"] == "9"
+        # !-------------------------- asserts ---------------------------
+
+    def test_pooled_rest_store(self):
+        # --------------------------- setup of the tracking ---------------------------
+        import json
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from pypads.utils.lazy_mlflow import client
+        ports = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                ports.append(self.client_address[1])
+                body = json.dumps({"experiments": [{"experiment_id": "0", "name": "Default"}]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            mlf = client("http://127.0.0.1:" + str(server.server_address[1]))
+            experiments = [mlf.list_experiments() for _ in range(5)]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        # --------------------------- asserts ---------------------------
+        import requests
+        from mlflow.utils import rest_utils
+        assert experiments[-1][0].name == "Default"
+        # Requests are sent over one kept alive connection
+        assert len(ports) == 5 and len(set(ports)) == 1
+        # The requests of other mlflow users aren't changed
+        assert rest_utils.requests is requests
+        # !-------------------------- asserts ---------------------------
+
+    def test_unpooled_rest_store(self):
+        # --------------------------- setup of the tracking ---------------------------
+        from mlflow.store.tracking.rest_store import RestStore
+        from mlflow.utils import rest_utils
+        from pypads.utils import lazy_mlflow
+        store = RestStore(lambda: rest_utils.MlflowHostCreds("http://127.0.0.1:1"))
+        pooled_class = lazy_mlflow._pooled_store_class
+        # Rest utils keeping their own sessions, like the ones of later mlflow versions
+        rest_utils._get_request_session = lambda *args, **kwargs: None
+        lazy_mlflow._pooled_store_class = None
+        try:
+            unpooled = lazy_mlflow.pooled_rest_store(store)
+        finally:
+            del rest_utils._get_request_session
+            lazy_mlflow._pooled_store_class = pooled_class
+
+        # --------------------------- asserts ---------------------------
+        # The stock store is kept if the internals of mlflow don't match
+        assert unpooled is store
+        assert lazy_mlflow.pooled_rest_store(store) is not store
+        # !-------------------------- asserts ---------------------------
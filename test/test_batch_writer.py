@@ -0,0 +1,156 @@
+import threading
+import time
+
+from test.base_test import TEST_FOLDER, BaseTest
+
+
+class RecordingClient:
+    """ Client recording the batches written with it. """
+
+    def __init__(self, delay=0.0):
+        self.batches = []
+        self.delay = delay
+
+    def log_batch(self, run_id, metrics=(), params=(), tags=()):
+        time.sleep(self.delay)
+        self.batches.append((run_id, list(metrics), list(params), list(tags)))
+
+
+class BatchWriterTest(BaseTest):
+
+    def test_batches(self):
+        # --------------------------- setup of the tracking ---------------------------
+        from mlflow.entities import Metric, Param, RunTag
+        from pypads.app.backends.batch_writer import BatchWriter, METRIC, PARAM, TAG, MAX_ENTITIES_PER_BATCH, \
+            MAX_PARAMS_TAGS_PER_BATCH
+        client = RecordingClient()
+        writer = BatchWriter(lambda: client, flush_interval=60, queue_size=50)
+        for i in range(2500):
+            writer.add(METRIC, "run", Metric("metric", i, 0, i))
+        for i in range(150):
+            writer.add(PARAM, "run", Param("param_" + str(i), str(i)))
+        for i in range(3):
+            writer.add(TAG, "run", RunTag("tag", str(i)))
+        flushed = writer.flush(timeout=30)
+
+        # --------------------------- asserts ---------------------------
+        assert flushed
+        assert all(len(m) + len(p) + len(t) <= MAX_ENTITIES_PER_BATCH and len(p) + len(t) <= MAX_PARAMS_TAGS_PER_BATCH
+                   for _, m, p, t in client.batches)
+        assert [metric.value for _, m, _, _ in client.batches for metric in m] == list(range(2500))
+        assert len([param for _, _, p, _ in client.batches for param in p]) == 150
+        # Only the last value of the tag is written
+        assert [tag.value for _, _, _, t in client.batches for tag in t] == ["2"]
+        assert writer.written == 2651 and writer.failed == 0
+        # !-------------------------- asserts ---------------------------
+
+    def test_flush_timeout(self):
+        # --------------------------- setup of the tracking ---------------------------
+        from mlflow.entities import Metric
+        from pypads.app.backends.batch_writer import BatchWriter, METRIC
+        release = threading.Event()
+
+        class HangingClient:
+            def log_batch(self, run_id, metrics=(), params=(), tags=()):
+                release.wait()
+
+        writer = BatchWriter(lambda: HangingClient(), flush_interval=60, queue_size=50)
+        for i in range(5):
+            writer.add(METRIC, "run", Metric("metric", i, 0, i))
+        start = time.monotonic()
+        flushed = writer.flush(timeout=0.2)
+        waited = time.monotonic() - start
+        pending = writer.pending
+        release.set()
+
+        # --------------------------- asserts ---------------------------
+        # A hanging store doesn't block the flush for longer than the timeout
+        assert not flushed and waited < 5
+        assert pending == 5
+        assert writer.flush(timeout=5) and writer.pending == 0
+        # !-------------------------- asserts ---------------------------
+
+    def test_backpressure(self):
+        # --------------------------- setup of the tracking ---------------------------
+        from mlflow.entities import Metric
+        from pypads.app.backends.batch_writer import BatchWriter, METRIC
+        client = RecordingClient(delay=0.01)
+        writer = BatchWriter(lambda: client, flush_interval=0.001, queue_size=10)
+        sizes = []
+
+        def produce():
+            for i in range(200):
+                writer.add(METRIC, "run", Metric("metric", i, 0, i))
+                sizes.append(writer._queue.qsize())
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        producer.join(timeout=30)
+        flushed = writer.flush(timeout=30)
+
+        # --------------------------- asserts ---------------------------
+        assert flushed and max(sizes) <= 10
+        assert sum(len(m) for _, m, _, _ in client.batches) == 200
+        # !-------------------------- asserts ---------------------------
+
+    def test_delivery_on_end_run(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        tracker = PyPads(uri=TEST_FOLDER, config={"batch_flush_interval": 60}, autostart=True)
+        run_id = tracker.api.active_run().info.run_id
+        for i in range(1500):
+            tracker.api.log_metric("metric", i, step=i)
+        tracker.api.log_param("param", 1)
+        tracker.api.log_param("param", 2)
+        tracker.api.set_tag("tag", "value")
+        tracker.api.end_run()
+        run = tracker.backend.mlf.get_run(run_id)
+        history = tracker.backend.mlf.get_metric_history(run_id, "metric")
+
+        # --------------------------- asserts ---------------------------
+        assert sorted(metric.step for metric in history) == list(range(1500))
+        # The conflicting value of the parameter is rejected by the store
+        assert run.data.params["param"] == "1" and tracker.backend.writer.failed == 1
+        assert run.data.tags["tag"] == "value"
+        # !-------------------------- asserts ---------------------------
+
+    def test_flush_after_writer_died(self):
+        # --------------------------- setup of the tracking ---------------------------
+        from mlflow.entities import Metric
+        from pypads.app.backends.batch_writer import BatchWriter, METRIC
+        client = RecordingClient()
+        writer = BatchWriter(lambda: client, flush_interval=60, queue_size=50)
+        # Queue records without a writer thread, as if it died before taking them
+        writer._ensure_thread = lambda: None
+        for i in range(5):
+            writer.add(METRIC, "run", Metric("metric", i, 0, i))
+        del writer._ensure_thread
+        pending = writer.pending_for("run")
+        flushed = writer.flush(timeout=30)
+
+        # --------------------------- asserts ---------------------------
+        assert pending and flushed
+        assert [metric.value for _, m, _, _ in client.batches for metric in m] == list(range(5))
+        assert not writer.pending_for("run")
+        # !-------------------------- asserts ---------------------------
+
+    def test_read_after_write(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        tracker = PyPads(uri=TEST_FOLDER, config={"batch_flush_interval": 60}, autostart=True)
+        run_id = tracker.api.active_run().info.run_id
+        tracker.api.log_metric("metric", 1, step=0)
+        tracker.api.log_param("param", 1)
+        tracker.api.set_tag("tag", "value")
+        run = tracker.mlf.get_run(run_id)
+        history = tracker.mlf.get_metric_history(run_id=run_id, key="metric")
+
+        # --------------------------- asserts ---------------------------
+        # Records held back by the batch writer are written before the run is read
+        assert run.data.metrics["metric"] == 1 and run.data.params["param"] == "1"
+        assert run.data.tags["tag"] == "value"
+        assert [metric.value for metric in history] == [1]
+        assert not tracker.backend.writer.pending_for(run_id)
+        # !-------------------------- asserts ---------------------------
@@ -0,0 +1,134 @@
+import mmap
+import os
+
+import numpy as np
+import pandas as pd
+
+from test.base_test import TEST_FOLDER, BaseTest
+
+
+class BinaryFormatsTest(BaseTest):
+
+    def test_npy(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        from pypads.utils.logging_util import try_write_artifact, WriteFormats
+        tracker = PyPads(uri=TEST_FOLDER, config={"include_default_mappings": False}, autostart=True)
+        data = np.arange(1000, dtype=np.float64).reshape(100, 10)
+        try_write_artifact(os.path.join("Binary", "data"), data, WriteFormats.npy)
+        read = tracker.api.artifact(os.path.join("Binary", "data.npy"))
+
+        # --------------------------- asserts ---------------------------
+        # Arrays are memory-mapped instead of read
+        assert isinstance(read, np.memmap)
+        assert np.array_equal(read, data)
+        # Writes to the array don't change the artifact
+        read[0, 0] = -1
+        assert tracker.api.artifact(os.path.join("Binary", "data.npy"))[0, 0] == 0
+        # !-------------------------- asserts ---------------------------
+
+    def test_npz(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        from pypads.utils.logging_util import try_write_artifact, WriteFormats
+        tracker = PyPads(uri=TEST_FOLDER, config={"include_default_mappings": False}, autostart=True)
+        try_write_artifact(os.path.join("Binary", "named"), {"x": np.ones(5), "y": np.zeros(3)}, WriteFormats.npz)
+        try_write_artifact(os.path.join("Binary", "positional"), (np.ones(2), np.arange(4)), WriteFormats.npz)
+        named = tracker.api.artifact(os.path.join("Binary", "named.npz"))
+        positional = tracker.api.artifact(os.path.join("Binary", "positional.npz"))
+
+        # --------------------------- asserts ---------------------------
+        assert np.array_equal(named["x"], np.ones(5)) and np.array_equal(named["y"], np.zeros(3))
+        assert np.array_equal(positional["arr_1"], np.arange(4))
+        # !-------------------------- asserts ---------------------------
+
+    def test_pickle_out_of_band(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        from pypads.utils.logging_util import try_write_artifact, WriteFormats
+        tracker = PyPads(uri=TEST_FOLDER, config={"include_default_mappings": False}, autostart=True)
+        value = {"weights": np.random.rand(50, 20), "transposed": np.random.rand(20, 30).T, "name": "model"}
+        try_write_artifact(os.path.join("Binary", "value"), value, WriteFormats.pickle)
+        try_write_artifact(os.path.join("Binary", "plain"), {"a": [1, 2]}, WriteFormats.pickle)
+        read = tracker.api.artifact(os.path.join("Binary", "value.pickle"))
+
+        # --------------------------- asserts ---------------------------
+        assert read["name"] == "model"
+        assert np.array_equal(read["weights"], value["weights"])
+        assert np.array_equal(read["transposed"], value["transposed"])
+        # Contiguous buffers are backed by the memory-mapped file
+        base = read["weights"]
+        while isinstance(base, np.ndarray):
+            base = base.base
+        assert isinstance(base.obj, mmap.mmap)
+        # Loaded arrays are writable without changing the artifact
+        read["weights"][0, 0] = -1.0
+        assert tracker.api.artifact(os.path.join("Binary", "value.pickle"))["weights"][0, 0] == value["weights"][0, 0]
+        # Objects without buffers are plain pickle files
+        assert tracker.api.artifact(os.path.join("Binary", "plain.pickle")) == {"a": [1, 2]}
+        # !-------------------------- asserts ---------------------------
+
+    def test_pickled_estimator(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        from pypads.utils.logging_util import try_write_artifact, WriteFormats
+        tracker = PyPads(uri=TEST_FOLDER, config={"include_default_mappings": False}, autostart=True)
+        from sklearn.linear_model import SGDClassifier
+        X, y = np.random.rand(100, 5), np.random.randint(0, 2, 100)
+        try_write_artifact(os.path.join("Binary", "estimator"), SGDClassifier().fit(X, y), WriteFormats.pickle)
+        estimator = tracker.api.artifact(os.path.join("Binary", "estimator.pickle"))
+
+        # --------------------------- asserts ---------------------------
+        # A loaded estimator can be trained further
+        assert estimator.coef_.flags.writeable
+        estimator.partial_fit(X, y)
+        # !-------------------------- asserts ---------------------------
+
+    def test_columnar(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        from pypads.utils.logging_util import try_write_artifact, WriteFormats
+        tracker = PyPads(uri=TEST_FOLDER, config={"include_default_mappings": False}, autostart=True)
+        frame = pd.DataFrame({"a": np.arange(100), "b": np.random.rand(100), "c": ["x"] * 100})
+        try_write_artifact(os.path.join("Binary", "frame"), frame, WriteFormats.columnar)
+        extension = "feather" if os.path.exists(
+            os.path.join(tracker.api.active_run().info.artifact_uri.replace("file://", ""), "Binary",
+                         "frame.feather")) else "pickle"
+        read = tracker.api.artifact(os.path.join("Binary", "frame." + extension))
+
+        # --------------------------- asserts ---------------------------
+        pd.testing.assert_frame_equal(read, frame)
+        # !-------------------------- asserts ---------------------------
+
+    def test_binary_write_format(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        from pypads.utils.logging_util import binary_write_format, WriteFormats
+        PyPads(uri=TEST_FOLDER, config={"include_default_mappings": False}, autostart=True)
+
+        # --------------------------- asserts ---------------------------
+        assert binary_write_format(np.ones(3), WriteFormats.text) == WriteFormats.npy
+        assert binary_write_format(np.ones(3), "pickle") == WriteFormats.npy
+        assert binary_write_format(pd.DataFrame({"a": [1]}), WriteFormats.pickle) == WriteFormats.columnar
+        # Object arrays can't be written without pickle
+        assert binary_write_format(np.array([{}, None]), WriteFormats.pickle) == WriteFormats.pickle
+        assert binary_write_format(np.ones(3), WriteFormats.json) == WriteFormats.json
+        assert binary_write_format("text", WriteFormats.text) == WriteFormats.text
+        # !-------------------------- asserts ---------------------------
+
+    def test_binary_artifacts_disabled(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        from pypads.utils.logging_util import binary_write_format, WriteFormats
+        PyPads(uri=TEST_FOLDER, config={"include_default_mappings": False, "binary_artifacts": False}, autostart=True)
+
+        # --------------------------- asserts ---------------------------
+        assert binary_write_format(np.ones(3), WriteFormats.text) == WriteFormats.text
+        # !-------------------------- asserts ---------------------------
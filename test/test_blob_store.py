@@ -0,0 +1,105 @@
+import os
+
+import numpy as np
+
+from test.base_test import TEST_FOLDER, BaseTest
+
+
+class BlobStoreTest(BaseTest):
+
+    def _log_output(self, value, name="output"):
+        from pypads.app.injections.base_logger import TrackedObject
+        from pypads.model.models import ArtifactMetaModel
+        from pypads.utils.logging_util import WriteFormats
+        meta = ArtifactMetaModel(path=os.path.join("Outputs", name), description="Output", format=WriteFormats.npy)
+        TrackedObject._store_data_artifact(value, meta)
+        return meta
+
+    def test_deduplication(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        from pypads.utils.blob_store import blob_store
+        tracker = PyPads(uri=TEST_FOLDER, config={"include_default_mappings": False}, autostart=True)
+        data = np.random.rand(100, 10)
+        first_run = tracker.api.active_run().info.run_id
+        metas = [self._log_output(data, str(i)) for i in range(3)]
+        tracker.api.end_run()
+        tracker.api.start_run()
+        second_run = tracker.api.active_run().info.run_id
+        second = self._log_output(data.copy())
+        store = blob_store()
+
+        # --------------------------- asserts ---------------------------
+        # The payload is written once and referenced by both runs
+        assert store.writes == 1
+        assert len({meta.digest for meta in metas + [second]}) == 1
+        assert set(store.references(second.digest)) == {first_run, second_run}
+        assert np.array_equal(tracker.api.blob(second.digest), data)
+        # The meta information of the artifact references the payload
+        assert tracker.api.artifact_meta(os.path.join("Outputs", "output"))["digest"] == second.digest
+        # The run holds a pointer artifact resolving the payload
+        assert np.array_equal(tracker.api.artifact(os.path.join("Outputs", "output.blob")), data)
+        # Other data is stored on its own
+        assert self._log_output(data[:50], "half").digest != second.digest
+        # !-------------------------- asserts ---------------------------
+
+    def test_garbage_collection(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        from pypads.utils.blob_store import blob_store
+        tracker = PyPads(uri=TEST_FOLDER, config={"include_default_mappings": False}, autostart=True)
+        shared, single = np.random.rand(20), np.random.rand(30)
+        first_run = tracker.api.active_run().info.run_id
+        shared_digest = self._log_output(shared).digest
+        single_digest = self._log_output(single, "single").digest
+        tracker.api.end_run()
+        tracker.api.start_run()
+        second_run = tracker.api.active_run().info.run_id
+        self._log_output(shared)
+        store = blob_store()
+        tracker.backend.mlf.delete_run(first_run)
+        dry = tracker.api.collect_blobs(dry_run=True)
+        dry_references = set(store.references(shared_digest))
+        removed = tracker.api.collect_blobs()
+
+        # --------------------------- asserts ---------------------------
+        assert single_digest in dry and dry_references == {first_run, second_run}
+        assert single_digest in removed and shared_digest not in removed
+        assert store.path(single_digest) is None
+        # The reference of the deleted run is released, the payload is kept for the second run
+        assert set(store.references(shared_digest)) == {second_run}
+        assert np.array_equal(tracker.api.blob(shared_digest), shared)
+        # !-------------------------- asserts ---------------------------
+
+    def test_text_not_stored(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        from pypads.utils.blob_store import store_blob, BLOB_REFS
+        from pypads.utils.logging_util import WriteFormats
+        tracker = PyPads(uri=TEST_FOLDER, config={"include_default_mappings": False}, autostart=True)
+        text_key = store_blob("value", WriteFormats.text)
+        key = store_blob({"a": 1}, WriteFormats.pickle)
+
+        # --------------------------- asserts ---------------------------
+        assert text_key is None and key is not None
+        # Only the stored payload is referenced by the run
+        assert tracker.cache.run_get(BLOB_REFS) == {key}
+        # !-------------------------- asserts ---------------------------
+
+    def test_disabled(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        tracker = PyPads(uri=TEST_FOLDER, config={"include_default_mappings": False, "blob_store": False},
+                         autostart=True)
+        data = np.random.rand(10)
+        meta = self._log_output(data)
+
+        # --------------------------- asserts ---------------------------
+        # The payload is stored in the run
+        assert meta.digest is None
+        assert np.array_equal(tracker.api.artifact(os.path.join("Outputs", "output.npy")), data)
+        # !-------------------------- asserts ---------------------------
@@ -0,0 +1,89 @@
+import glob
+import json
+import os
+
+from test.base_test import RanLogger, TEST_FOLDER, BaseTest
+
+config = {
+    "recursion_identity": False,
+    "recursion_depth": -1}
+
+
+class CallStatisticsTest(BaseTest):
+
+    def test_aggregated_calls(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        from pypads.app.injections.call_statistics import STATISTICS_CACHE, LATENCY_BUCKETS
+        logger = RanLogger()
+        tracker = PyPads(uri=TEST_FOLDER, config=config, events={"ran_logger": logger},
+                         hooks={"ran_logger": {"on": ["pypads_log"], "with": {"_pypads_aggregate": True}}},
+                         autostart=True)
+
+        def experiment():
+            return "I'm a return value."
+
+        experiment = tracker.api.track(experiment, anchors=["pypads_log"])
+        for _ in range(5):
+            experiment()
+
+        run = tracker.api.active_run()
+        summary = tracker.cache.run_get(STATISTICS_CACHE).summary()
+        tracker.api.end_run()
+
+        # --------------------------- asserts ---------------------------
+        functions = summary[("RanLogger", logger._base_path())]["functions"]
+        assert len(functions) == 1
+        statistics = list(functions.values())[0]
+        assert statistics["calls"] == 5 and statistics["failures"] == 0
+        assert sum(statistics["latency_histogram"]) == 5
+        assert len(statistics["latency_histogram"]) == len(LATENCY_BUCKETS) + 1
+        assert statistics["child_time"]["min"] <= statistics["child_time"]["max"]
+
+        artifacts = glob.glob(os.path.join(TEST_FOLDER, "**", run.info.run_id, "artifacts", "**",
+                                           "call_statistics.json"), recursive=True)
+        assert len(artifacts) == 1
+        with open(artifacts[0]) as fd:
+            assert json.load(fd)["functions"] == functions
+        assert not glob.glob(os.path.join(TEST_FOLDER, "**", run.info.run_id, "artifacts", "InjectionLoggers",
+                                          "RanLogger", "Calls"), recursive=True)
+        # !-------------------------- asserts ---------------------------
+
+    def test_concurrent_statistics(self):
+        # --------------------------- setup of the tracking ---------------------------
+        import threading
+        from types import SimpleNamespace
+        from pypads.app.injections.call_statistics import CallStatisticsCollector
+        collector = CallStatisticsCollector()
+
+        class PathLogger:
+            def __init__(self, base_path):
+                self.base_path = base_path
+
+            def _base_path(self):
+                return self.base_path
+
+        loggers = [PathLogger("first/"), PathLogger("second/")]
+        call_id = SimpleNamespace(context=SimpleNamespace(reference="module"), fn_name="function")
+        logger_call = SimpleNamespace(original_call=SimpleNamespace(call_id=call_id), failed=None, pre_time=0.001,
+                                      child_time=0.01, post_time=0.001)
+
+        def add():
+            for i in range(1000):
+                collector.add(loggers[i % 2], logger_call)
+
+        threads = [threading.Thread(target=add) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        summary = collector.summary()
+
+        # --------------------------- asserts ---------------------------
+        # Loggers of the same class with different base paths are summarized separately
+        assert set(summary.keys()) == {("PathLogger", "first/"), ("PathLogger", "second/")}
+        for logger_summary in summary.values():
+            statistics = logger_summary["functions"]["module.function"]
+            assert statistics["calls"] == 4000 and sum(statistics["latency_histogram"]) == 4000
+        # !-------------------------- asserts ---------------------------
@@ -0,0 +1,86 @@
+from pypads.importext.mappings import SerializedMapping
+from pypads.importext.versioning import LibSelector
+from test.base_test import TEST_FOLDER, BaseTest
+
+something_mapping = """
+metadata:
+  author: "PyPads"
+  version: "0.0.1"
+  library:
+    name: "test_classes"
+    version: "0.1"
+
+mappings:
+    :test_classes.dummy_classes.PunchDummy.something:
+            hooks: "pypads_log"
+"""
+
+config = {
+    "recursion_identity": False,
+    "recursion_depth": -1}
+
+
+class CallIdRecorder:
+    """ Event recording the call ids of the tracked calls. """
+    order = 0
+    uid = None
+    supported_libraries = {LibSelector(name=".*", constraint="*")}
+
+    def __init__(self):
+        self.call_ids = []
+
+    def __call__(self, ctx, *args, _pypads_env, **kwargs):
+        self.call_ids.append(_pypads_env.call.call_id)
+        return _pypads_env.callback(*args, **kwargs)
+
+
+class CallTrackerTest(BaseTest):
+
+    def test_counters(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        recorder = CallIdRecorder()
+        tracker = PyPads(uri=TEST_FOLDER, config={**config, "include_default_mappings": False, "wrap_plan": False},
+                         mappings=[SerializedMapping("something", something_mapping)],
+                         hooks={"recorder": {"on": ["pypads_log"]}}, events={"recorder": recorder}, autostart=False)
+        tracker.activate_tracking(reload_modules=True)
+        tracker.start_track()
+        from test_classes.dummy_classes import PunchDummy
+        first, second = PunchDummy(), PunchDummy()
+        for instance in [first, second, first, first]:
+            instance.something()
+
+        # --------------------------- asserts ---------------------------
+        assert [(c.instance_number, c.call_number) for c in recorder.call_ids] == [(0, 0), (1, 0), (0, 1), (0, 2)]
+        assert tracker.call_tracker.call_depth() == 0
+        assert not tracker.call_tracker.has_call_identity(recorder.call_ids[0])
+        # !-------------------------- asserts ---------------------------
+
+    def test_concurrent_claims(self):
+        # --------------------------- setup of the tracking ---------------------------
+        import threading
+        from pypads.injections.analysis.call_tracker import CallCounters
+        counters = CallCounters()
+        claimed = []
+        numbered = []
+
+        def claim():
+            for _ in range(1000):
+                claimed.append(counters.claim("function", "instance"))
+            for i in range(100):
+                numbered.append((i, counters.instance_number("function", i)))
+
+        threads = [threading.Thread(target=claim) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # --------------------------- asserts ---------------------------
+        assert sorted(claimed) == list(range(8000))
+        assert counters.call_number("function", "instance") == 8000
+        # Each instance gets one number and no number is skipped
+        assert len(set(numbered)) == 100
+        assert sorted(number for _, number in set(numbered)) == list(range(1, 101))
+        # !-------------------------- asserts ---------------------------
@@ -0,0 +1,107 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pypads.importext.mappings import SerializedMapping
+from pypads.importext.versioning import LibSelector
+from test.base_test import TEST_FOLDER, BaseTest
+
+nesting_mapping = """
+metadata:
+  author: "PyPads"
+  version: "0.0.1"
+  library:
+    name: "test_classes"
+    version: "0.1"
+
+mappings:
+    :test_classes.dummy_classes.NestingDummy:
+        :{re:(outer|inner)$}:
+            hooks: "pypads_log"
+"""
+
+config = {
+    "recursion_identity": False,
+    "recursion_depth": -1}
+
+
+class CallTreeRecorder:
+    """ Event recording the call stack of the current thread on each tracked call. """
+    order = 0
+    uid = None
+    supported_libraries = {LibSelector(name=".*", constraint="*")}
+
+    def __init__(self):
+        self.stacks = []
+
+    def __call__(self, ctx, *args, _pypads_env, **kwargs):
+        from pypads.app.pypads import get_current_pads
+        call_stack = get_current_pads().call_tracker.call_stack
+        self.stacks.append((threading.get_ident(), _pypads_env.call,
+                            tuple(call.call_id.wrappee.__name__ for call in call_stack)))
+        return _pypads_env.callback(*args, **kwargs)
+
+
+class ConcurrentTrackingTest(BaseTest):
+
+    def test_threaded_call_trees(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        recorder = CallTreeRecorder()
+        tracker = PyPads(uri=TEST_FOLDER, config={**config, "include_default_mappings": False, "wrap_plan": False},
+                         mappings=[SerializedMapping("nesting", nesting_mapping)],
+                         hooks={"recorder": {"on": ["pypads_log"]}}, events={"recorder": recorder}, autostart=False)
+        tracker.activate_tracking(reload_modules=True)
+        tracker.start_track()
+        from test_classes.dummy_classes import NestingDummy
+        shared = NestingDummy()
+        calls = 40
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda i: shared.outer(0.001), range(calls)))
+
+        # --------------------------- asserts ---------------------------
+        assert results == [0.001] * calls
+        outer = [(thread, call, stack) for (thread, call, stack) in recorder.stacks if stack[-1] == "outer"]
+        inner = [(thread, call, stack) for (thread, call, stack) in recorder.stacks if stack[-1] == "inner"]
+        assert len(outer) == calls and len(inner) == calls
+        # Each thread only sees its own calls on the stack
+        assert all(stack == ("outer",) for (_, _, stack) in outer)
+        assert all(stack == ("outer", "inner") for (_, _, stack) in inner)
+        # The counters hand out each call number exactly once
+        assert sorted(call.call_id.call_number for (_, call, _) in outer) == list(range(calls))
+        assert sorted(call.call_id.call_number for (_, call, _) in inner) == list(range(calls))
+        assert all(call.call_id.thread == thread for (thread, call, _) in recorder.stacks)
+        assert tracker.call_tracker.call_depth() == 0
+        # !-------------------------- asserts ---------------------------
+
+    def test_task_call_trees(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        import asyncio
+        from pypads.app.base import PyPads
+        recorder = CallTreeRecorder()
+        tracker = PyPads(uri=TEST_FOLDER, config={**config, "include_default_mappings": False, "wrap_plan": False},
+                         mappings=[SerializedMapping("nesting", nesting_mapping)],
+                         hooks={"recorder": {"on": ["pypads_log"]}}, events={"recorder": recorder}, autostart=False)
+        tracker.activate_tracking(reload_modules=True)
+        tracker.start_track()
+        from test_classes.dummy_classes import NestingDummy
+        shared = NestingDummy()
+
+        async def task():
+            await asyncio.sleep(0)
+            return tracker.call_tracker.call_depth(), shared.outer()
+
+        async def tasks():
+            # The call stack of a task is copied from the creating context, calls in a task don't leak into others
+            return await asyncio.gather(*[task() for _ in range(5)])
+
+        results = asyncio.run(tasks())
+
+        # --------------------------- asserts ---------------------------
+        assert results == [(0, 0.0)] * 5
+        assert len(recorder.stacks) == 10
+        assert all(stack in {("outer",), ("outer", "inner")} for (_, _, stack) in recorder.stacks)
+        assert tracker.call_tracker.call_depth() == 0
+        # !-------------------------- asserts ---------------------------
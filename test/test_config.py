@@ -0,0 +1,45 @@
+import ast
+import pickle
+
+from test.base_test import BaseTest, TEST_FOLDER
+
+
+class ConfigTest(BaseTest):
+
+    def test_snapshot(self):
+        # --------------------------- setup of the tracking ---------------------------
+        from pypads.app.config import PyPadsConfig
+        config = PyPadsConfig({"recursion_depth": 3, "inheritance_watch": ["foo"], "custom": "value"})
+
+        # --------------------------- asserts ---------------------------
+        assert config.recursion_depth == 3
+        assert config.inheritance_watch == ("foo",)
+        assert not config.recursion_identity
+        assert config["custom"] == "value" and config.get("missing") is None
+        assert {**config, "recursion_depth": 1}["recursion_depth"] == 1
+        with self.assertRaises(AttributeError):
+            config.recursion_depth = 1
+        assert ast.literal_eval(str(config)) == config
+        assert pickle.loads(pickle.dumps(config)) == config
+        # Settings missing in the values take the defaults of pypads
+        from pypads.app.base import DEFAULT_CONFIG
+        assert config.mapping_cache == DEFAULT_CONFIG["mapping_cache"]
+        assert config.wrap_plan == DEFAULT_CONFIG["wrap_plan"]
+        assert config.include_default_mappings == DEFAULT_CONFIG["include_default_mappings"]
+        # !-------------------------- asserts ---------------------------
+
+    def test_persisted_config(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads, CONFIG_NAME
+        from pypads.app.config import PyPadsConfig
+        tracker = PyPads(uri=TEST_FOLDER, config={"recursion_depth": 2}, autostart=True)
+        run = tracker.api.active_run()
+
+        # --------------------------- asserts ---------------------------
+        assert isinstance(tracker.config, PyPadsConfig)
+        assert tracker.config.recursion_depth == 2
+        assert tracker.cache.run_state().config is tracker.config
+        tags = tracker.mlf.get_run(run.info.run_id).data.tags
+        assert ast.literal_eval(tags[CONFIG_NAME]) == tracker.config
+        # !-------------------------- asserts ---------------------------
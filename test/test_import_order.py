@@ -51,3 +51,47 @@ class PypadsImportOrder(BaseTest):
         assert not hasattr(PunchDummy, "_pypads_mapping_PunchDummy")
         assert not hasattr(PunchDummy2, "_pypads_mapping_PunchDummy2")
         assert not hasattr(dummy2, "_pypads_mapping_PunchDummy2")
+
+    def test_punch_only_mapped_libraries(self):
+        from pypads.app.base import PyPads
+        from pypads.importext.pypads_import import PyPadsFinder
+        from test_classes.dummy_mapping import _get_punch_dummy_mapping
+        tracker = PyPads(uri=TEST_FOLDER, mappings=_get_punch_dummy_mapping(),
+                         config={"include_default_mappings": False, "inheritance_watch": ["watched"]})
+        tracker.activate_tracking(reload_modules=False)
+        tracker.start_track()
+        assert tracker.mapping_registry.import_filter() == {"test_classes", "watched"}
+        assert PyPadsFinder().find_spec("json.tool") is None
+        import sys
+        import test_classes
+        sys.modules.pop("test_classes.dummy_classes", None)
+        assert PyPadsFinder().find_spec("test_classes.dummy_classes", test_classes.__path__) is not None
+
+    def test_punch_discovers_callables(self):
+        from pypads.app.base import PyPads
+        import sys
+        from pypads.importext.mappings import SerializedMapping
+        from pypads.importext.wrap_plan import module_stamp
+        mapping = SerializedMapping("callables_dummy", """
+metadata:
+  author: "Thomas Weißgerber"
+  version: "0.0.1"
+  library:
+    name: "test_classes"
+    version: "0.1"
+
+mappings:
+    :test_classes.dummy_callables.{re:.*}:
+            events: "pypads_dummy_hook"
+""")
+        tracker = PyPads(uri=TEST_FOLDER, folder=TEST_FOLDER, mappings=[mapping],
+                         config={"include_default_mappings": False})
+        tracker.wrap_manager.plan.clear()
+        sys.modules.pop("test_classes.dummy_callables", None)
+        tracker.activate_tracking(reload_modules=False)
+        tracker.start_track()
+        import test_classes.dummy_callables as module
+        members = dict(tracker.wrap_manager.plan.module(module.__name__, module_stamp(module)))
+        assert {"double", "counter", "Counter", "_scale"} <= set(members.keys())
+        assert "factor" not in members and "partial" not in members
+        assert module.double(2) == 4
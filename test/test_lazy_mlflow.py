@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+
+from test.base_test import BaseTest, TEST_FOLDER
+
+# Budget in microseconds for importing pypads.app.base. Importing mlflow alone exceeds it.
+IMPORT_BUDGET = 2000000
+
+construct_script = """
+import sys
+from pypads.app.base import PyPads
+tracker = PyPads(uri={folder!r}, folder={folder!r})
+tracker.activate_tracking()
+assert "mlflow" not in sys.modules, "mlflow was imported on construction"
+assert tracker.api.active_run() is None
+
+from pypads.utils.lazy_mlflow import mlflow
+assert mlflow.get_tracking_uri() == {folder!r}, "tracking uri wasn't applied on load"
+"""
+
+
+class LazyMlflowTest(BaseTest):
+
+    def test_import_budget(self):
+        # --------------------------- setup of the tracking ---------------------------
+        env = {**os.environ, "PYTHONPATH": os.getcwd()}
+        out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import pypads.app.base"], env=env,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True).stderr.decode()
+
+        # --------------------------- asserts ---------------------------
+        cumulative = {}
+        for line in out.splitlines():
+            if line.startswith("import time:") and "|" in line:
+                _, total, name = line[len("import time:"):].split("|")
+                if total.strip().isdigit():
+                    cumulative[name.strip()] = int(total)
+        assert "mlflow" not in cumulative
+        assert cumulative["pypads.app.base"] < IMPORT_BUDGET
+        # !-------------------------- asserts ---------------------------
+
+    def test_construction_without_mlflow(self):
+        # --------------------------- setup of the tracking ---------------------------
+        env = {**os.environ, "PYTHONPATH": os.getcwd()}
+        result = subprocess.run([sys.executable, "-c", construct_script.format(folder=TEST_FOLDER)], env=env,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        # --------------------------- asserts ---------------------------
+        assert result.returncode == 0, result.stderr.decode()[-2000:]
+        # !-------------------------- asserts ---------------------------
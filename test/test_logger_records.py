@@ -0,0 +1,78 @@
+from pypads.app.injections.injection import InjectionLogger
+from pypads.importext.mappings import SerializedMapping
+from test.base_test import TEST_FOLDER, BaseTest
+
+cheap_mapping = """
+metadata:
+  author: "PyPads"
+  version: "0.0.1"
+  library:
+    name: "test_classes"
+    version: "0.1"
+
+mappings:
+    :test_classes.dummy_classes.CheapDummy.cheap:
+            hooks: "pypads_log"
+"""
+
+config = {
+    "recursion_identity": False,
+    "recursion_depth": -1}
+
+
+class RecordingLogger(InjectionLogger):
+    """ Logger recording the parameters, calls and outputs it gets. """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.records = []
+
+    def __post__(self, ctx, *args, _logger_call, _logger_output, _pypads_result, level=None, source=None, **kwargs):
+        self.records.append((level, source, _logger_call, _logger_output))
+
+
+class LoggerRecordsTest(BaseTest):
+
+    def test_output_holder_class(self):
+        # --------------------------- setup of the tracking ---------------------------
+        first, second = RecordingLogger.build_output(), RecordingLogger.build_output()
+
+        # --------------------------- asserts ---------------------------
+        assert type(first) is type(second) is RecordingLogger.output_holder_class()
+        assert first.uid != second.uid and first.uri != second.uri
+        assert first.get_model_cls() is RecordingLogger.output_schema_class()
+        assert InjectionLogger.output_holder_class() is not RecordingLogger.output_holder_class()
+        # !-------------------------- asserts ---------------------------
+
+    def test_records(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        recording_logger = RecordingLogger(level="static", source="static")
+        tracker = PyPads(uri=TEST_FOLDER, config={**config, "include_default_mappings": False, "wrap_plan": False},
+                         mappings=[SerializedMapping("cheap", cheap_mapping)],
+                         hooks={"recording": {"on": ["pypads_log"], "with": {"level": "hook"}}},
+                         events={"recording": recording_logger}, autostart=False)
+        tracker.activate_tracking(reload_modules=True)
+        tracker.start_track()
+        from test_classes.dummy_classes import CheapDummy
+        dummy = CheapDummy()
+        dummy.cheap()
+        dummy.cheap()
+        run_id = tracker.api.active_run().info.run_id
+
+        # --------------------------- asserts ---------------------------
+        (level, source, first_call, first_output), (_, _, second_call, second_output) = recording_logger.records
+        # Parameters of the hook overwrite the static ones
+        assert level == "hook" and source == "static"
+        assert recording_logger.static_parameters == {"level": "static", "source": "static"}
+        assert first_call.uid != second_call.uid and first_output.uid != second_output.uid
+        assert first_call.run_id == run_id and first_call.failed is None
+        # Descriptors of the library are equal but not shared between records
+        assert first_call.defined_in == second_call.defined_in
+        assert first_call.defined_in is not second_call.defined_in
+        first_call.defined_in.version = "changed"
+        assert second_call.defined_in.version != "changed"
+        model = first_call.model()
+        assert model.uid == first_call.uid and model.original_call.call_id.fn_name == "cheap"
+        # !-------------------------- asserts ---------------------------
@@ -0,0 +1,40 @@
+import os
+
+from pypads.importext.mappings import MappingFile
+from pypads.importext.package_path import PackagePath
+from test.base_test import BaseTest, TEST_FOLDER
+
+minimal_path = os.path.join(os.path.dirname(__file__), "test_sklearn", "test_mappings", "sklearn_minimal.yml")
+
+
+class MappingCacheTest(BaseTest):
+
+    def test_compiled_mapping(self):
+        # --------------------------- setup of the tracking ---------------------------
+        from pypads.importext.mapping_cache import MappingCache
+        cache = MappingCache(TEST_FOLDER)
+        cache.clear()
+        compiled = cache.prebuild(minimal_path)
+
+        # --------------------------- asserts ---------------------------
+        assert len(compiled) == 1 and os.path.exists(compiled[0])
+        loaded = cache.load(minimal_path)
+        parsed = MappingFile(minimal_path)
+        segments = PackagePath("sklearn.tree.tree.DecisionTreeClassifier.fit").segments
+        assert set(loaded.find_mappings(segments)) == set(parsed.find_mappings(segments))
+        assert str(loaded.lib) == str(parsed.lib)
+        # !-------------------------- asserts ---------------------------
+
+    def test_registry_uses_cache(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        from pypads.importext.mapping_cache import MappingCache
+        MappingCache(TEST_FOLDER).clear()
+        tracker = PyPads(uri=TEST_FOLDER, folder=TEST_FOLDER, config={"include_default_mappings": False},
+                         mappings=[minimal_path])
+
+        # --------------------------- asserts ---------------------------
+        assert len(os.listdir(MappingCache(TEST_FOLDER).folder)) == 1
+        assert len(list(tracker.mapping_registry.get_entries())) == 1
+        # !-------------------------- asserts ---------------------------
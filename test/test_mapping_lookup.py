@@ -0,0 +1,43 @@
+from pypads.importext.mappings import SerializedMapping
+from pypads.importext.package_path import PackagePath
+from test.base_test import BaseTest
+
+overlapping_mapping = """
+metadata:
+  author: "Thomas Weißgerber"
+  version: "0.0.1"
+  library:
+    name: "test_classes"
+    version: "0.1"
+
+mappings:
+  !!python/pPath test_classes.Estimator:
+    !!python/rSeg (fit|fit_predict|fit_transform)$:
+      hooks: "pypads_fit"
+    !!python/rSeg (fit_predict|predict|score)$:
+      hooks: "pypads_predict"
+    !!python/rSeg (fit_transform|transform)$:
+      hooks: "pypads_transform"
+    :score:
+      hooks: "pypads_metric"
+"""
+
+
+class MappingLookupTest(BaseTest):
+
+    def test_overlapping_regex(self):
+        # --------------------------- setup of the tracking ---------------------------
+        collection = SerializedMapping("overlapping", overlapping_mapping)
+
+        def anchors(path):
+            return {h.anchor.name for m in collection.find_mappings(PackagePath(path).segments) for h in m.hooks}
+
+        # --------------------------- asserts ---------------------------
+        assert anchors("test_classes.Estimator.fit_transform") == {"pypads_fit", "pypads_transform"}
+        assert anchors("test_classes.Estimator.fit_predict") == {"pypads_fit", "pypads_predict"}
+        assert anchors("test_classes.Estimator.score") == {"pypads_predict", "pypads_metric"}
+        assert anchors("test_classes.Estimator.get_params") == set()
+        assert len(collection.find_mappings(PackagePath("test_classes.Estimator").segments)) == 4
+        # Memoized lookups return the same result
+        assert anchors("test_classes.Estimator.score") == {"pypads_predict", "pypads_metric"}
+        # !-------------------------- asserts ---------------------------
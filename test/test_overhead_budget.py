@@ -0,0 +1,82 @@
+import time
+
+from pypads.app.injections.injection import InjectionLogger
+from pypads.importext.mappings import SerializedMapping
+from test.base_test import TEST_FOLDER, BaseTest
+
+cheap_mapping = """
+metadata:
+  author: "PyPads"
+  version: "0.0.1"
+  library:
+    name: "test_classes"
+    version: "0.1"
+
+mappings:
+    :test_classes.dummy_classes.CheapDummy.cheap:
+            hooks: "pypads_log"
+"""
+
+config = {
+    "recursion_identity": False,
+    "recursion_depth": -1}
+
+
+class SlowLogger(InjectionLogger):
+    """ Logger taking much longer than the function it is called on. """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.executions = 0
+
+    def __post__(self, ctx, *args, _logger_call, _pypads_result, **kwargs):
+        self.executions += 1
+        time.sleep(0.002)
+
+
+class OverheadBudgetTest(BaseTest):
+
+    def test_throttling(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        from pypads.app.injections.overhead import BUDGET_CACHE
+        slow_logger = SlowLogger()
+        tracker = PyPads(uri=TEST_FOLDER, config={**config, "include_default_mappings": False, "wrap_plan": False,
+                                                  "overhead_budget": 0.05},
+                         mappings=[SerializedMapping("cheap", cheap_mapping)],
+                         hooks={"slow": {"on": ["pypads_log"]}}, events={"slow": slow_logger}, autostart=False)
+        tracker.activate_tracking(reload_modules=True)
+        tracker.start_track()
+        from test_classes.dummy_classes import CheapDummy
+        dummy = CheapDummy()
+
+        results = [dummy.cheap() for _ in range(600)]
+        executions = slow_logger.executions
+        more = [dummy.cheap() for _ in range(100)]
+        budget = list(tracker.cache.run_get(BUDGET_CACHE).values())[0]
+        run = tracker.api.get_run(tracker.api.active_run().info.run_id)
+
+        # --------------------------- asserts ---------------------------
+        assert results == [1] * 600 and more == [1] * 100
+        # The logger got sampled, aggregated and disabled on the function
+        assert budget.disabled and budget.aggregates and budget.every == 8
+        assert executions < 200
+        assert slow_logger.executions == executions
+        assert run.data.tags[budget.tag_name()].startswith("disable")
+        # !-------------------------- asserts ---------------------------
+
+    def test_within_budget(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.injections.overhead import OverheadBudget, BUDGET_MIN_CALLS
+
+        budget = OverheadBudget(0.05, "Logger", "function")
+        for _ in range(BUDGET_MIN_CALLS * 2):
+            assert budget.admit()
+            budget.observe(1.01, 1.0)
+
+        # --------------------------- asserts ---------------------------
+        assert budget.every == 1 and not budget.aggregates and not budget.disabled
+        assert abs(budget.ratio() - 0.01) < 1e-6
+        # !-------------------------- asserts ---------------------------
@@ -0,0 +1,58 @@
+import sys
+
+from pypads.importext import package_metadata as metadata_module
+from pypads.importext.versioning import LibSelector
+from test.base_test import BaseTest
+
+
+class PackageMetadataTest(BaseTest):
+
+    def test_memoized_resolution(self):
+        # --------------------------- setup of the tracking ---------------------------
+        from pypads.importext.package_metadata import PackageMetadataCache
+        lookups = []
+        find_spec, find_version = metadata_module.is_package_available, metadata_module.find_package_version
+
+        def counting(fn):
+            def counted(name):
+                lookups.append(name)
+                return fn(name)
+
+            return counted
+
+        metadata_module.is_package_available = counting(find_spec)
+        metadata_module.find_package_version = counting(find_version)
+        try:
+            cache = PackageMetadataCache()
+            versions = [cache.version("yaml") for _ in range(10)]
+            available = [cache.is_available("yaml") for _ in range(10)]
+            repeated = len(lookups)
+            sys.path.append("pypads_package_metadata_test")
+            try:
+                cache.version("yaml")
+            finally:
+                sys.path.remove("pypads_package_metadata_test")
+        finally:
+            metadata_module.is_package_available = find_spec
+            metadata_module.find_package_version = find_version
+
+        # --------------------------- asserts ---------------------------
+        import yaml
+        assert set(versions) == {yaml.__version__} and all(available)
+        assert repeated == 2
+        assert len(lookups) == 3
+        assert cache.parsed_version("1.2.3") is cache.parsed_version("1.2.3")
+        assert cache.constraint(">=1.0") is cache.constraint(">=1.0")
+        # !-------------------------- asserts ---------------------------
+
+    def test_shared_selectors(self):
+        # --------------------------- setup of the tracking ---------------------------
+        from pypads.importext.package_metadata import package_metadata
+        selector = package_metadata.lib_selector("yaml", ">=1.0")
+
+        # --------------------------- asserts ---------------------------
+        assert selector is package_metadata.lib_selector("yaml", ">=1.0")
+        assert isinstance(selector, LibSelector) and selector.is_installed()
+        assert not package_metadata.lib_selector("yaml", "<1.0").is_installed()
+        assert not package_metadata.lib_selector("pypads_not_installed").is_installed()
+        # !-------------------------- asserts ---------------------------
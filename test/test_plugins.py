@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+from test.base_test import BaseTest, TEST_FOLDER
+
+probe_module = """
+activated = []
+
+
+def activate():
+    activated.append(True)
+"""
+
+probe_metadata = """Metadata-Version: 2.1
+Name: pypads-probe
+Version: 0.1
+"""
+
+probe_entry_points = """[pypads.plugins]
+probe = pypads_probe:activate
+"""
+
+
+def _install_probe(folder):
+    with open(os.path.join(folder, "pypads_probe.py"), "w") as f:
+        f.write(probe_module)
+    dist_info = os.path.join(folder, "pypads_probe-0.1.dist-info")
+    os.makedirs(dist_info)
+    with open(os.path.join(dist_info, "METADATA"), "w") as f:
+        f.write(probe_metadata)
+    with open(os.path.join(dist_info, "entry_points.txt"), "w") as f:
+        f.write(probe_entry_points)
+
+
+class PluginTest(BaseTest):
+
+    def test_entry_point_plugin(self):
+        # --------------------------- setup of the tracking ---------------------------
+        from pypads.app.plugins import activate_plugins, PluginIndex
+        with tempfile.TemporaryDirectory() as site:
+            _install_probe(site)
+            sys.path.insert(0, site)
+            try:
+                disabled = activate_plugins(TEST_FOLDER, disable_plugins=["probe"])
+                activated = activate_plugins(TEST_FOLDER)
+
+                # --------------------------- asserts ---------------------------
+                import pypads_probe
+                assert "probe" not in disabled
+                assert activated == ["probe"]
+                assert pypads_probe.activated == [True]
+                assert os.path.exists(PluginIndex(TEST_FOLDER).path)
+                # !-------------------------- asserts ---------------------------
+            finally:
+                sys.path.remove(site)
+                sys.modules.pop("pypads_probe", None)
+
+    def test_import_time(self):
+        """
+        Importing pypads must neither import installed plugins nor scan the environment for them.
+        """
+        # --------------------------- setup of the tracking ---------------------------
+        with tempfile.TemporaryDirectory() as site:
+            _install_probe(site)
+            env = {**os.environ, "PYTHONPATH": os.pathsep.join([site, os.getcwd()])}
+            out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import pypads.app.base"], env=env,
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True).stderr.decode()
+
+        # --------------------------- asserts ---------------------------
+        self_times = {}
+        for line in out.splitlines():
+            if line.startswith("import time:") and "|" in line:
+                own, _, name = line[len("import time:"):].split("|")
+                if own.strip().isdigit():
+                    self_times[name.strip()] = int(own)
+        assert "pypads.app.base" in self_times
+        assert "pypads_probe" not in self_times
+        # Generous bound for the module itself. Scanning for plugins used to take seconds in big environments.
+        assert self_times["pypads.app.base"] < 500000
+        # !-------------------------- asserts ---------------------------
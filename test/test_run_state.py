@@ -0,0 +1,31 @@
+from test.base_test import BaseTest, TEST_FOLDER
+
+
+class RunStateTest(BaseTest):
+
+    def test_run_state(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        from pypads.app.pypads import is_nested_run, is_intermediate_run
+        tracker = PyPads(uri=TEST_FOLDER, autostart=True)
+        run = tracker.api.active_run()
+
+        # --------------------------- asserts ---------------------------
+        state = tracker.cache.run_state()
+        assert state.run_id == run.info.run_id
+        assert state.experiment_id == run.info.experiment_id
+        assert state.config == tracker.config
+        assert not is_nested_run() and not is_intermediate_run()
+
+        with tracker.api.intermediate_run() as intermediate:
+            intermediate_state = tracker.cache.run_state()
+            assert intermediate_state.run_id == intermediate.info.run_id
+            assert is_nested_run() and is_intermediate_run()
+
+        assert tracker.cache.run_state(intermediate.info.run_id) is None
+        assert tracker.cache.run_state() is state
+
+        tracker.api.end_run()
+        assert tracker.cache.run_state(run.info.run_id) is None
+        # !-------------------------- asserts ---------------------------
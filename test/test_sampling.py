@@ -0,0 +1,115 @@
+from test.base_test import RanLogger, TEST_FOLDER, BaseTest
+
+config = {
+    "recursion_identity": False,
+    "recursion_depth": -1}
+
+
+class SamplingTest(BaseTest):
+
+    def test_policies(self):
+        # --------------------------- setup of the tracking ---------------------------
+        from pypads.bindings.sampling import make_sampler
+
+        def decisions(sampling, calls=20):
+            sampler = make_sampler(sampling, "event")
+            return [i + 1 for i in range(calls) if sampler.sample()], sampler
+
+        # --------------------------- asserts ---------------------------
+        assert decisions({"every": 5})[0] == [1, 6, 11, 16]
+        assert decisions({"first": 3, "backoff": 2})[0] == [1, 2, 3, 4, 5, 7, 11, 19]
+        assert decisions({"probability": 0})[0] == []
+        assert len(decisions({"probability": 1})[0]) == 20
+        sampled, sampler = decisions({"rate": 0.001, "burst": 2})
+        assert sampled == [1, 2]
+        assert sampler.report()["skipped"] == 18 and sampler.report()["weight"] == 10
+        with self.assertRaises(ValueError):
+            make_sampler({"every": 2, "probability": 0.5}, "event")
+        # !-------------------------- asserts ---------------------------
+
+    def test_sampled_hook(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        logger = RanLogger()
+        tracker = PyPads(uri=TEST_FOLDER, config=config, events={"ran_logger": logger},
+                         hooks={"ran_logger": {"on": ["pypads_log"], "sampling": {"every": 3}}}, autostart=True)
+
+        def experiment():
+            return "I'm a return value."
+
+        experiment = tracker.api.track(experiment, anchors=["pypads_log"])
+        outputs = [experiment() for _ in range(7)]
+
+        # --------------------------- asserts ---------------------------
+        assert outputs == ["I'm a return value."] * 7
+        assert tracker.cache.run_get(id(logger)) == 3
+        report = tracker.hook_registry.samplers[0].report()
+        assert report["calls"] == 7 and report["sampled"] == 3 and report["skipped"] == 4
+        assert report["policy"] == {"every": 3}
+        # !-------------------------- asserts ---------------------------
+
+    def test_concurrent_sampling(self):
+        # --------------------------- setup of the tracking ---------------------------
+        import threading
+        from pypads.bindings.sampling import make_sampler
+        sampler = make_sampler({"every": 10}, "event")
+
+        def sample():
+            for _ in range(1000):
+                sampler.sample()
+
+        threads = [threading.Thread(target=sample) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # --------------------------- asserts ---------------------------
+        assert sampler.calls == 8000 and sampler.sampled == 800
+        # !-------------------------- asserts ---------------------------
+
+    def test_rewrapped_samplers(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        logger = RanLogger()
+        tracker = PyPads(uri=TEST_FOLDER, config=config, events={"ran_logger": logger},
+                         hooks={"ran_logger": {"on": ["pypads_log"], "sampling": {"every": 3}}}, autostart=True)
+
+        def experiment():
+            return "I'm a return value."
+
+        for _ in range(5):
+            tracked = tracker.api.track(experiment, anchors=["pypads_log"])
+        tracked()
+
+        # --------------------------- asserts ---------------------------
+        assert len(tracker.hook_registry.samplers) == 1
+        assert tracker.hook_registry.samplers[0].report()["calls"] == 1
+        # !-------------------------- asserts ---------------------------
+
+    def test_shared_sampler(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        first, second = RanLogger(), RanLogger()
+        tracker = PyPads(uri=TEST_FOLDER, config=config, events={"ran_logger": [first, second]},
+                         hooks={"ran_logger": {"on": ["pypads_log"], "sampling": {"probability": 0.5}}},
+                         autostart=True)
+
+        def experiment():
+            return "I'm a return value."
+
+        experiment = tracker.api.track(experiment, anchors=["pypads_log"])
+        for _ in range(200):
+            experiment()
+
+        # --------------------------- asserts ---------------------------
+        # Both loggers are sampled on the same calls
+        assert tracker.cache.run_get(id(first)) == tracker.cache.run_get(id(second))
+        samplers = tracker.hook_registry.samplers
+        assert len(samplers) == 1
+        report = samplers[0].report()
+        assert report["calls"] == 200 and report["sampled"] == tracker.cache.run_get(id(first))
+        # !-------------------------- asserts ---------------------------
@@ -0,0 +1,178 @@
+import inspect
+
+from pypads.app.injections.injection import InjectionLogger
+from pypads.importext.mappings import SerializedMapping
+from test.base_test import TEST_FOLDER, BaseTest
+
+stream_mapping = """
+metadata:
+  author: "PyPads"
+  version: "0.0.1"
+  library:
+    name: "test_classes"
+    version: "0.1"
+
+mappings:
+    :test_classes.dummy_classes.StreamDummy.stream:
+            hooks: "pypads_log"
+"""
+
+config = {
+    "recursion_identity": False,
+    "recursion_depth": -1}
+
+
+class RollingLogger(InjectionLogger):
+    """ Logger keeping a rolling sum of the items of a stream. """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.total = 0
+        self.indices = []
+        self.statistics = []
+        self.calls = []
+
+    def __item__(self, ctx, *args, _logger_call, _pypads_item, _pypads_index, _pypads_item_time, **kwargs):
+        self.total += _pypads_item
+        self.indices.append(_pypads_index)
+
+    def __post__(self, ctx, *args, _logger_call, _pypads_result, **kwargs):
+        self.statistics.append(_pypads_result)
+        self.calls.append(_logger_call)
+
+
+class StreamingTest(BaseTest):
+
+    def _tracker(self, rolling_logger):
+        from pypads.app.base import PyPads
+        tracker = PyPads(uri=TEST_FOLDER, config={**config, "include_default_mappings": False, "wrap_plan": False},
+                         mappings=[SerializedMapping("stream", stream_mapping)],
+                         hooks={"rolling": {"on": ["pypads_log"]}}, events={"rolling": rolling_logger},
+                         autostart=False)
+        tracker.activate_tracking(reload_modules=True)
+        tracker.start_track()
+        return tracker
+
+    def test_stream(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        rolling_logger = RollingLogger()
+        self._tracker(rolling_logger)
+        from test_classes.dummy_classes import StreamDummy
+
+        stream = StreamDummy().stream(5, delay=0.01)
+        # Nothing but the creation of the stream happened yet
+        finished_before = len(rolling_logger.statistics)
+        items = list(stream)
+
+        # --------------------------- asserts ---------------------------
+        assert inspect.isgenerator(stream)
+        assert finished_before == 0
+        assert items == [0, 1, 2, 3, 4]
+        assert rolling_logger.total == 10 and rolling_logger.indices == [0, 1, 2, 3, 4]
+        statistics = rolling_logger.statistics[0]
+        assert statistics.items == 5 and statistics.finished
+        assert rolling_logger.calls[0].child_time >= 0.05
+        assert statistics.item_time.min <= statistics.item_time.max
+        # !-------------------------- asserts ---------------------------
+
+    def test_closed_stream(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        rolling_logger = RollingLogger()
+        self._tracker(rolling_logger)
+        from test_classes.dummy_classes import StreamDummy
+
+        stream = StreamDummy().stream(5)
+        first = [next(stream), next(stream)]
+        stream.close()
+
+        # --------------------------- asserts ---------------------------
+        assert first == [0, 1]
+        statistics = rolling_logger.statistics[0]
+        assert statistics.items == 2 and not statistics.finished
+        # !-------------------------- asserts ---------------------------
+
+    def test_thrown_into_stream(self):
+        # --------------------------- setup of the tracking ---------------------------
+        from pypads.app.injections.streaming import tracked_stream
+        cleaned_up = []
+        ended = []
+
+        def source():
+            try:
+                for i in range(5):
+                    try:
+                        yield i
+                    except KeyError:
+                        yield -1
+            finally:
+                cleaned_up.append(True)
+
+        def raising_source():
+            try:
+                yield 0
+                yield 1
+            finally:
+                cleaned_up.append(True)
+
+        stream = tracked_stream(source(), lambda *args: None, lambda statistics, error: ended.append(error))
+        handled = [next(stream), stream.throw(KeyError("handled")), next(stream)]
+        stream.close()
+
+        failing = tracked_stream(raising_source(), lambda *args: None, lambda statistics, error: ended.append(error))
+        next(failing)
+        with self.assertRaises(ValueError):
+            failing.throw(ValueError("not handled"))
+
+        # --------------------------- asserts ---------------------------
+        # Thrown exceptions are passed on to the stream
+        assert handled == [0, -1, 1]
+        # The streams are cleaned up immediately
+        assert cleaned_up == [True, True]
+        assert ended[0] is None and isinstance(ended[1], ValueError)
+        # !-------------------------- asserts ---------------------------
+
+    def test_unconsumed_stream(self):
+        # --------------------------- setup of the tracking ---------------------------
+        import gc
+        # Activate tracking of pypads
+        rolling_logger = RollingLogger()
+        self._tracker(rolling_logger)
+        from test_classes.dummy_classes import StreamDummy
+
+        closed = StreamDummy().stream(5)
+        closed.close()
+        dropped = StreamDummy().stream(5)
+        del dropped
+        gc.collect()
+
+        # --------------------------- asserts ---------------------------
+        # Streams which are never iterated finish the call of the logger when closed or dropped
+        assert [statistics.items for statistics in rolling_logger.statistics] == [0, 0]
+        assert not any(statistics.finished for statistics in rolling_logger.statistics)
+        # !-------------------------- asserts ---------------------------
+
+    def test_stream_budget(self):
+        # --------------------------- setup of the tracking ---------------------------
+        from pypads.app.base import PyPads
+        from pypads.app.injections.overhead import BUDGET_CACHE
+        rolling_logger = RollingLogger()
+        tracker = PyPads(uri=TEST_FOLDER, config={**config, "include_default_mappings": False, "wrap_plan": False,
+                                                  "overhead_budget": 1000.0},
+                         mappings=[SerializedMapping("stream", stream_mapping)],
+                         hooks={"rolling": {"on": ["pypads_log"]}}, events={"rolling": rolling_logger},
+                         autostart=False)
+        tracker.activate_tracking(reload_modules=True)
+        tracker.start_track()
+        from test_classes.dummy_classes import StreamDummy
+
+        for _ in range(3):
+            list(StreamDummy().stream(3, delay=0.01))
+
+        # --------------------------- asserts ---------------------------
+        # Streamed calls count against the overhead budget
+        budget = list(tracker.cache.run_get(BUDGET_CACHE).values())[0]
+        assert budget._observed == 3
+        assert budget._child >= 0.03
+        # !-------------------------- asserts ---------------------------
@@ -0,0 +1,40 @@
+from test.base_test import RanLogger, TEST_FOLDER, BaseTest
+
+config = {
+    "recursion_identity": False,
+    "recursion_depth": -1}
+
+
+class TrackingSwitchTest(BaseTest):
+
+    def test_paused(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        from pypads.app.misc.switch import tracking
+        logger = RanLogger()
+        tracker = PyPads(uri=TEST_FOLDER, config=config, hooks={"ran_logger": {"on": ["pypads_log"]}},
+                         events={"ran_logger": logger}, autostart=True)
+
+        def experiment():
+            return "I'm a return value."
+
+        experiment = tracker.api.track(experiment, anchors=["pypads_log"])
+
+        experiment()
+        with tracker.api.paused():
+            with tracker.api.paused():
+                paused_out = experiment()
+            assert not tracking.enabled
+            experiment()
+        experiment()
+
+        tracker.api.pause_tracking()
+        experiment()
+        tracker.api.resume_tracking()
+
+        # --------------------------- asserts ---------------------------
+        assert paused_out == "I'm a return value."
+        assert tracking.enabled
+        assert tracker.cache.run_get(id(logger)) == 2
+        # !-------------------------- asserts ---------------------------
@@ -0,0 +1,56 @@
+import os
+
+from test.base_test import BaseTest, TEST_FOLDER
+
+
+class WrapPlanTest(BaseTest):
+
+    def test_record_and_replay(self):
+        # --------------------------- setup of the tracking ---------------------------
+        # Activate tracking of pypads
+        from pypads.app.base import PyPads
+        import sys
+        from pypads.importext.wrap_plan import WrapPlan, module_stamp
+        from test_classes.dummy_mapping import _get_punch_dummy_mapping
+        tracker = PyPads(uri=TEST_FOLDER, folder=TEST_FOLDER, mappings=_get_punch_dummy_mapping(),
+                         config={"include_default_mappings": False})
+        tracker.wrap_manager.plan.clear()
+        tracker.activate_tracking(reload_modules=True)
+        tracker.start_track()
+        from test_classes.dummy_classes import PunchDummy
+
+        plan = tracker.wrap_manager.plan
+        plan.save()
+
+        # --------------------------- asserts ---------------------------
+        assert hasattr(PunchDummy, "_pypads_mapping_PunchDummy")
+        assert os.path.exists(plan.path)
+
+        replayed = WrapPlan(tracker)
+        stamp = module_stamp(sys.modules["test_classes.dummy_classes"])
+        members = dict(replayed.module("test_classes.dummy_classes", stamp))
+        assert {"PunchDummy", "PunchDummy2"} <= set(members.keys())
+        assert members["PunchDummy"] == getattr(PunchDummy, "_pypads_mapping_PunchDummy")
+        assert "something" in replayed.class_attributes("test_classes.dummy_classes.PunchDummy",
+                                                        members["PunchDummy"])
+
+        # An edited module is discovered again
+        path, mtime, size = stamp
+        assert replayed.module("test_classes.dummy_classes", (path, mtime + 1, size)) is None
+
+        # A changed config leads to a new plan
+        tracker.config = {**tracker.config, "recursion_depth": 3}
+        assert WrapPlan.key(tracker) != os.path.basename(plan.path).split(".")[0]
+        assert WrapPlan(tracker).module("test_classes.dummy_classes", stamp) is None
+
+        # Changes of watched packages lead to a new plan
+        import test_classes
+        tracker.config = {**tracker.config, "inheritance_watch": ["test_classes"]}
+        key = WrapPlan.key(tracker)
+        stat = os.stat(test_classes.__file__)
+        try:
+            os.utime(test_classes.__file__, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+            assert WrapPlan.key(tracker) != key
+        finally:
+            os.utime(test_classes.__file__, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        # !-------------------------- asserts ---------------------------
@@ -0,0 +1,23 @@
+from functools import partial
+
+
+def _scale(value, factor):
+    return value * factor
+
+
+class Counter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self):
+        self.count += 1
+        return self.count
+
+
+double = partial(_scale, factor=2)
+double.__module__ = __name__
+
+counter = Counter()
+
+# Values defined in the module which aren't callable
+factor = 2
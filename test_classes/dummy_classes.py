@@ -10,3 +10,33 @@ class PunchDummy2(PunchDummy):
     @property
     def value(self):
         return self._value
+
+
+class NestingDummy:
+    def outer(self, delay=0.0):
+        return self.inner(delay)
+
+    def inner(self, delay=0.0):
+        import time
+        time.sleep(delay)
+        return delay
+
+
+class AsyncDummy:
+    async def serve(self, delay=0.0):
+        import asyncio
+        await asyncio.sleep(delay)
+        return delay
+
+
+class StreamDummy:
+    def stream(self, items, delay=0.0):
+        import time
+        for i in range(items):
+            time.sleep(delay)
+            yield i
+
+
+class CheapDummy:
+    def cheap(self):
+        return 1